@@ -0,0 +1,121 @@
+"""
+Serialized attribute size per state write, full vs recorded vs compact.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.attribute_size
+
+The boards are synthesized (NS-shaped departures and disruptions with
+Spoorkaart geo), so the numbers are relative sizes, not live captures.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ret_ns_departures.binary_sensor import StationDisruptionSensor
+from custom_components.ret_ns_departures.const import (
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_OPERATOR,
+    DOMAIN,
+    STOP_TYPE_NS,
+)
+from custom_components.ret_ns_departures.sensor import NextDepartureSensor
+
+NOW = datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+
+
+def synthetic_board(departures: int, disruptions: int = 4) -> dict[str, Any]:
+    """Build an NS board with the given number of departures."""
+    return {
+        "version": 1,
+        "last_update": NOW,
+        "departures": [
+            {
+                "line": "IC",
+                "operator": "NS",
+                "destination": f"Amsterdam Centraal via Schiphol {index}",
+                "platform": str(index % 16 + 1),
+                "delay": index % 3,
+                "scheduled_time": NOW + timedelta(minutes=2 * index),
+                "actual_time": NOW + timedelta(minutes=2 * index + index % 3),
+                "cancelled": False,
+                "train_type": "Intercity",
+                "trip_number": str(2800 + index),
+            }
+            for index in range(departures)
+        ],
+        "disruptions": [
+            {
+                "id": f"70{index}",
+                "title": f"Rotterdam Centraal - Schiedam Centrum {index}",
+                "type": "DISRUPTION",
+                "impact": 3,
+                "phase": "In behandeling",
+                "cause": "seinstoring",
+                "start": NOW - timedelta(hours=1),
+                "end": NOW + timedelta(hours=2),
+                "stations": ["RTD", "SDM", "DT", "GV"],
+                "situation": "Er rijden minder treinen tussen Rotterdam en Den Haag.",
+                "description": "Reis via een andere route of houd rekening met vertraging.",
+                "geo": {
+                    "latitude": 51.92,
+                    "longitude": 4.47,
+                    "bbox": [4.3, 51.9, 4.5, 52.1],
+                    "geometry_type": "MultiLineString",
+                    "station_codes": ["RTD", "SDM"],
+                    "level": "MINDER_TREINEN",
+                },
+            }
+            for index in range(disruptions)
+        ],
+    }
+
+
+def _sizes(entity: Any) -> tuple[int, int]:
+    """Return (all attributes, attributes the recorder keeps) in bytes."""
+    attributes = entity.extra_state_attributes
+    recorded = {
+        key: value
+        for key, value in attributes.items()
+        if key not in entity._unrecorded_attributes  # pylint: disable=protected-access
+    }
+    return len(json_bytes(attributes)), len(json_bytes(recorded))
+
+
+def _entity(entity_cls: type, departures: int, *, compact: bool) -> Any:
+    """Build one entity on a synthetic board."""
+    coordinator = MagicMock()
+    coordinator.data = synthetic_board(departures)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_OPERATOR: STOP_TYPE_NS},
+        options={CONF_COMPACT_ATTRIBUTES: compact},
+    )
+    return entity_cls(coordinator, entry, "Rotterdam Centraal")
+
+
+def measure(departures: int) -> list[tuple[str, int, int, int]]:
+    """Measure both entities for one board size."""
+    rows = []
+    for entity_cls in (NextDepartureSensor, StationDisruptionSensor):
+        full, recorded = _sizes(_entity(entity_cls, departures, compact=False))
+        compact_size, _ = _sizes(_entity(entity_cls, departures, compact=True))
+        rows.append((f"{entity_cls.__name__} ({departures} dep.)", full, recorded, compact_size))
+    return rows
+
+
+def main() -> None:
+    """Print bytes per state write for default and large boards."""
+    print(f"{'entity':<44} {'before':>8} {'recorded':>9} {'compact':>8}")
+    for departures in (5, 40):
+        for name, full, recorded, compact in measure(departures):
+            print(f"{name:<44} {full:>8} {recorded:>9} {compact:>8}")
+
+
+if __name__ == "__main__":
+    main()
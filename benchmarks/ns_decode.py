@@ -0,0 +1,112 @@
+"""
+Decode + parse time for an NS departures response: stdlib json vs the fast path.
+
+Run from the repository root:
+
+    python -m benchmarks.ns_decode
+
+The 40-departure Rotterdam Centraal payload is synthesized in the NS
+Reisinformatie v2 layout (route stations, product block, messages), since
+a live capture needs an API key. Sizes are close to a real response.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import json
+import timeit
+import tracemalloc
+from typing import Any
+from unittest.mock import MagicMock
+
+from custom_components.ret_ns_departures.api_ns import NSAPIClient, project_departures
+from custom_components.ret_ns_departures.fast_json import json_loads
+
+DEPARTURES = 40
+ROUTES = [
+    ["Schiedam Centrum", "Delft", "Den Haag HS", "Leiden Centraal", "Schiphol Airport", "Amsterdam Centraal"],
+    ["Rotterdam Blaak", "Dordrecht", "Breda", "Tilburg", "Eindhoven Centraal"],
+    ["Rotterdam Alexander", "Gouda", "Utrecht Centraal"],
+    ["Schiedam Centrum", "Vlaardingen Centrum", "Maassluis", "Hoek van Holland Haven"],
+]
+
+
+def synthetic_payload() -> bytes:
+    """A departures response for Rotterdam Centraal with DEPARTURES rows."""
+    start = datetime(2026, 10, 19, 8, 0)
+    departures: list[dict[str, Any]] = []
+    for index in range(DEPARTURES):
+        route = ROUTES[index % len(ROUTES)]
+        planned = start + timedelta(minutes=3 * index)
+        actual = planned + timedelta(minutes=index % 4)
+        departures.append(
+            {
+                "direction": route[-1],
+                "name": f"NS {2800 + index}",
+                "plannedDateTime": planned.isoformat() + "+0200",
+                "plannedTimeZoneOffset": 120,
+                "actualDateTime": actual.isoformat() + "+0200",
+                "actualTimeZoneOffset": 120,
+                "plannedTrack": str(index % 16 + 1),
+                "actualTrack": str(index % 16 + 1),
+                "product": {
+                    "number": str(2800 + index),
+                    "categoryCode": "IC",
+                    "shortCategoryName": "IC",
+                    "longCategoryName": "Intercity",
+                    "operatorCode": "NS",
+                    "operatorName": "NS",
+                    "type": "TRAIN",
+                },
+                "trainCategory": "IC",
+                "cancelled": False,
+                "routeStations": [
+                    {"uicCode": str(8400000 + n), "mediumName": name}
+                    for n, name in enumerate(route)
+                ],
+                "messages": [
+                    {"message": "Stopt niet in Schiedam Nieuwland", "style": "INFO"}
+                ]
+                if index % 5 == 0
+                else [],
+                "departureStatus": "INCOMING",
+            }
+        )
+    return json.dumps(
+        {"links": {}, "payload": {"source": "PPV", "departures": departures}, "meta": {}}
+    ).encode()
+
+
+def main() -> None:
+    """Print per-call time and retained memory of both decode paths."""
+    raw = synthetic_payload()
+    text = raw.decode()
+    client = NSAPIClient(MagicMock(), "key")
+
+    def baseline() -> list[Any]:
+        return client._parse_departures(  # pylint: disable=protected-access
+            json.loads(text), DEPARTURES
+        )
+
+    def fast() -> list[Any]:
+        return client._parse_departures(  # pylint: disable=protected-access
+            project_departures(json_loads(text), DEPARTURES), DEPARTURES
+        )
+
+    assert baseline() == fast()
+    runs = 500
+    print(f"payload {len(raw)} bytes, {DEPARTURES} departures, {runs} runs")
+    for name, func, decoded in (
+        ("json.loads + parse", baseline, lambda: json.loads(text)),
+        ("fast loads + project + parse", fast, lambda: project_departures(json_loads(text), DEPARTURES)),
+    ):
+        seconds = timeit.timeit(func, number=runs) / runs
+        tracemalloc.start()
+        kept = decoded()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        print(f"{name:<30} {seconds * 1e6:8.0f} us/call, decoded tree kept {retained} bytes")
+
+
+if __name__ == "__main__":
+    main()
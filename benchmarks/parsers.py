@@ -0,0 +1,270 @@
+"""
+Ops/sec and peak allocations of the hot parsers, with a regression check.
+
+Run from the repository root:
+
+    python -m benchmarks.parsers             # print the table
+    python -m benchmarks.parsers --check     # exit 1 on an allocation regression
+    python -m benchmarks.parsers --check --timing-threshold 1.0
+    python -m benchmarks.parsers --save      # record a new baseline
+
+Inputs are the upstream payloads in tests/fixtures/upstream (the same
+files the replay tests use) at their fixture size (x1) and scaled up
+tenfold (x10) by repeating rows, articles, features and stations with
+distinct ids. The payloads are synthesized in the live layouts because
+ret.nl and the NS APIs cannot be reached from CI without credentials.
+
+Timings are divided by a fixed pure-Python reference workload measured in
+the same run, so the baseline in parsers_baseline.json roughly carries over
+between machines. The parsers lean on C extensions (orjson, the bs4 tree
+builders) whose speed against pure Python differs per CPU, so timings on
+shared CI runners are noisy. ``--check`` therefore only fails when a case's
+peak allocation, which is deterministic, grows by more than the threshold
+(default 25 %); ``--timing-threshold`` adds a check on relative cost, meant
+for a wide margin in a non-blocking job.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import copy
+from datetime import datetime
+import json
+from pathlib import Path
+import re
+import sys
+import timeit
+import tracemalloc
+from typing import Any
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+from custom_components.ret_ns_departures.api_disruptions import NSDisruptionsAPIClient
+from custom_components.ret_ns_departures.api_ns import NSAPIClient, parse_ns_stations
+from custom_components.ret_ns_departures.api_ret import RETAPIClient
+from custom_components.ret_ns_departures.api_ret_diversions import (
+    DiversionIndex,
+    match_stop_notice,
+    parse_diversion_articles,
+)
+from custom_components.ret_ns_departures.api_spoorkaart import parse_storing_payload
+from custom_components.ret_ns_departures.const import TIMEZONE
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "upstream"
+BASELINE = Path(__file__).resolve().parent / "parsers_baseline.json"
+SCALES = (1, 10)
+HALTS = ("Schiekade", "Weena", "Stadhuis", "Maashaven", "Beurs")
+# Inside every omleidingen period in the fixture
+DIVERSIONS_NOW = datetime(2026, 6, 1, 12, 0, tzinfo=ZoneInfo(TIMEZONE))
+
+_TIMETABLE_RE = re.compile(r'(<div class="timetable">)(.*?)(\n    </div>)', re.DOTALL)
+_ARTICLE_RE = re.compile(r"  <article .*?</article>\n", re.DOTALL)
+
+
+def _text(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _json(name: str) -> Any:
+    return json.loads(_text(name))
+
+
+def ret_halt_page(scale: int) -> str:
+    """Halt page with the timetable rows repeated ``scale`` times."""
+    html = _text("ret_halt_schiekade.html")
+    return _TIMETABLE_RE.sub(
+        lambda match: match.group(1) + match.group(2) * scale + match.group(3), html
+    )
+
+
+def ret_omleidingen_page(scale: int) -> str:
+    """Omleidingen page with ``scale`` renamed copies of every article."""
+    html = _text("ret_omleidingen.html")
+    articles = _ARTICLE_RE.findall(html)
+    copies = [
+        article.replace("werkzaamheden ", f"werkzaamheden {n}-")
+        for n in range(scale)
+        for article in articles
+    ]
+    start = html.index(articles[0])
+    end = html.index(articles[-1]) + len(articles[-1])
+    return html[:start] + "".join(copies) + html[end:]
+
+
+def ns_departures(scale: int) -> dict[str, Any]:
+    """Departures response with ``scale`` times the rows."""
+    data = _json("ns_departures_rtd.json")
+    rows = data["payload"]["departures"]
+    data["payload"]["departures"] = [
+        {**row, "name": f"NS {n}-{row['name']}"} for n in range(scale) for row in rows
+    ]
+    return data
+
+
+def ns_disruptions(scale: int) -> list[dict[str, Any]]:
+    """Disruptions list with ``scale`` copies under distinct ids."""
+    items = _json("ns_disruptions.json")
+    return [{**item, "id": f"{item['id']}-{n}"} for n in range(scale) for item in items]
+
+
+def spoorkaart_storing(scale: int) -> dict[str, Any]:
+    """getStoring FeatureCollection with ``scale`` times the features."""
+    data = _json("spoorkaart_storing.json")
+    data["payload"]["features"] = data["payload"]["features"] * scale
+    return data
+
+
+def ns_stations(scale: int) -> dict[str, Any]:
+    """getNearestStations response with ``scale`` times the stations."""
+    data = _json("ns_stations_nearest.json")
+    data["payload"] = [
+        copy.deepcopy(item) for _ in range(scale) for item in data["payload"]
+    ]
+    return data
+
+
+def cases(scale: int) -> dict[str, Callable[[], Any]]:
+    """Parser calls to measure for one input scale."""
+    loop = asyncio.new_event_loop()
+    ret_client = RETAPIClient(MagicMock())
+    ns_client = NSAPIClient(MagicMock(), "key")
+    halt = ret_halt_page(scale)
+    omleidingen = ret_omleidingen_page(scale)
+    # Built once per omleidingen refresh in RETAPIClient, not per lookup
+    index = DiversionIndex(parse_diversion_articles(omleidingen))
+    departures = ns_departures(scale)
+    disruptions = ns_disruptions(scale)
+    warm_client = NSDisruptionsAPIClient(MagicMock(), "key")
+    warm_client._parse_disruptions(disruptions)  # pylint: disable=protected-access
+    storing = spoorkaart_storing(scale)
+    stations = ns_stations(scale)
+
+    def match_halts() -> list[Any]:
+        return [
+            match_stop_notice(
+                index,
+                stop_name=name,
+                stop_slug=name.lower(),
+                lines=["8"],
+                now=DIVERSIONS_NOW,
+            )
+            for name in HALTS
+        ]
+
+    # pylint: disable=protected-access
+    return {
+        "ret_parse_departures": lambda: loop.run_until_complete(
+            ret_client._parse_departures(halt, 1000)
+        ),
+        "parse_diversion_articles": lambda: parse_diversion_articles(omleidingen),
+        "match_stop_notice": match_halts,
+        "ns_parse_departures": lambda: ns_client._parse_departures(departures, 1000),
+        "ns_parse_disruptions": lambda: NSDisruptionsAPIClient(
+            MagicMock(), "key"
+        )._parse_disruptions(disruptions),
+        "ns_parse_disruptions_warm": lambda: warm_client._parse_disruptions(disruptions),
+        "parse_storing_payload": lambda: parse_storing_payload(storing),
+        "parse_ns_stations": lambda: parse_ns_stations(stations),
+    }
+
+
+def _reference() -> int:
+    """Fixed pure-Python workload that timings are expressed against."""
+    rows = [{"id": n, "name": f"halte {n}", "times": list(range(n % 7))} for n in range(400)]
+    decoded = json.loads(json.dumps(rows))
+    return sum(len(row["name"]) + sum(row["times"]) for row in sorted(decoded, key=str))
+
+
+def _per_call(func: Callable[[], Any]) -> float:
+    """Best per-call seconds over five repeats of about 0.1 s each."""
+    number, _ = timeit.Timer(func).autorange()
+    number = max(1, number // 2)
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def _peak_bytes(func: Callable[[], Any]) -> int:
+    """Peak traced allocation of one call, result included."""
+    func()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure() -> dict[str, dict[str, float]]:
+    """Ops/sec, relative cost and peak bytes for every case and scale."""
+    reference = _per_call(_reference)
+    results: dict[str, dict[str, float]] = {}
+    for scale in SCALES:
+        for name, func in cases(scale).items():
+            seconds = _per_call(func)
+            results[f"{name}[x{scale}]"] = {
+                "ops_per_sec": round(1 / seconds, 1),
+                "relative": round(seconds / reference, 4),
+                "peak_bytes": _peak_bytes(func),
+            }
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    thresholds: dict[str, float],
+) -> list[str]:
+    """Cases whose metrics grew beyond their entry in ``thresholds``."""
+    found: list[str] = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, threshold in thresholds.items():
+            if result[metric] > base[metric] * (1 + threshold):
+                found.append(
+                    f"{name}: {metric} {result[metric]} vs baseline {base[metric]}"
+                )
+    return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the table; optionally save a baseline or check against it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument("--save", action="store_true", help="write a new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed peak allocation growth"
+    )
+    parser.add_argument(
+        "--timing-threshold",
+        type=float,
+        help="also fail when relative cost grows by more than this",
+    )
+    args = parser.parse_args(argv)
+
+    results = measure()
+    print(f"{'case':<34} {'ops/sec':>10} {'relative':>9} {'peak KiB':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<34} {result['ops_per_sec']:>10.1f} "
+            f"{result['relative']:>9.3f} {result['peak_bytes'] / 1024:>9.1f}"
+        )
+
+    if args.save:
+        BASELINE.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {BASELINE}")
+    if args.check:
+        baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+        thresholds = {"peak_bytes": args.threshold}
+        if args.timing_threshold is not None:
+            thresholds["relative"] = args.timing_threshold
+        found = regressions(results, baseline, thresholds)
+        for line in found:
+            print(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
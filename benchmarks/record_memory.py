@@ -0,0 +1,102 @@
+"""
+Memory held by 100 boards of departures: plain dicts vs slotted records.
+
+Run from the repository root:
+
+    python -m benchmarks.record_memory
+
+Each board is synthesized in the shape the NS client produces. The
+"rendered" columns add one attribute copy per departure, as the sensor
+used to build with dicts and now builds with DepartureAttributes views.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import tracemalloc
+from typing import Any
+
+from custom_components.ret_ns_departures.models import Departure, DepartureAttributes
+
+BOARDS = 100
+NOW = datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+
+
+def _fields(board: int, index: int) -> dict[str, Any]:
+    scheduled = NOW + timedelta(minutes=2 * index)
+    return {
+        "line": "IC",
+        "operator": "NS",
+        "destination": "Amsterdam Centraal",
+        "platform": str(index % 16 + 1),
+        "delay": index % 3,
+        "scheduled_time": scheduled,
+        "actual_time": scheduled + timedelta(minutes=index % 3),
+        "train_type": "IC",
+        "trip_number": str(2800 + board * 100 + index),
+        "cancelled": False,
+        "departure_status": "INCOMING",
+    }
+
+
+def _old_rendered(dep: dict[str, Any]) -> dict[str, Any]:
+    """The dict copy the sensor built per departure before records."""
+    return {
+        "line": dep["line"],
+        "operator": dep["operator"],
+        "destination": dep["destination"],
+        "platform": dep["platform"],
+        "delay": dep["delay"],
+        "scheduled_time": dep["scheduled_time"].isoformat(),
+        "actual_time": dep["actual_time"].isoformat(),
+        "train_type": dep["train_type"],
+        "trip_number": dep["trip_number"],
+        "cancelled": dep["cancelled"],
+    }
+
+
+def _measure(build: Any) -> int:
+    """Bytes still allocated by what ``build`` returns."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def measure(per_board: int) -> dict[str, int]:
+    """Bytes for BOARDS boards of ``per_board`` departures, per variant."""
+    rows = [[_fields(board, i) for i in range(per_board)] for board in range(BOARDS)]
+    return {
+        "dict": _measure(lambda: [[dict(row) for row in board] for board in rows]),
+        "record": _measure(lambda: [[Departure(**row) for row in board] for board in rows]),
+        "dict rendered": _measure(
+            lambda: [
+                [(dep, _old_rendered(dep)) for dep in (dict(row) for row in board)]
+                for board in rows
+            ]
+        ),
+        "record rendered": _measure(
+            lambda: [
+                [(dep, DepartureAttributes(dep)) for dep in (Departure(**row) for row in board)]
+                for board in rows
+            ]
+        ),
+    }
+
+
+def main() -> None:
+    """Print total and per-departure bytes."""
+    print(f"{BOARDS} boards; bytes total (bytes per departure)")
+    for per_board in (5, 40):
+        results = measure(per_board)
+        count = BOARDS * per_board
+        line = ", ".join(
+            f"{name} {size} ({size // count})" for name, size in results.items()
+        )
+        print(f"{per_board:>2} per board: {line}")
+
+
+if __name__ == "__main__":
+    main()
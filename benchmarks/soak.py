@@ -0,0 +1,157 @@
+"""
+Soak test: many boards on one event loop against the local upstream stand-in.
+
+Run from the repository root (needs the test requirements):
+
+    python -m benchmarks.soak --entries 200 --duration 300
+    python -m benchmarks.soak --latency 0.2 --error-rate 0.05 --rate-limit-every 50 --drift
+
+Starts tests/upstream_server.py on 127.0.0.1, points the integration at it
+through RET_NS_DEPARTURES_RET_ORIGIN / RET_NS_DEPARTURES_NS_ORIGIN, and
+sets up half RET and half NS boards (with disruption monitoring) through
+their coordinators and the shared hubs, on one real aiohttp session. A
+sampler task records event loop lag while the hubs poll. The report lists
+loop lag percentiles, upstream requests and status codes, and how many
+boards hold data at the end.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import ClientSession
+
+from tests.upstream_server import UpstreamBehaviour, UpstreamServer
+
+RET_HALTS = ("schiekade", "beurs", "blaak", "stadhuis", "weena", "meent", "eendrachtsplein")
+NS_STATIONS = ("RTD", "RTB", "RTN", "RTA", "RTZ", "SDM", "VL", "GD", "DT", "UT")
+LAG_INTERVAL = 0.05
+
+
+async def _sample_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Record how late a short sleep wakes up, in seconds."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - started - LAG_INTERVAL))
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+async def soak(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the soak and return the report."""
+    behaviour = UpstreamBehaviour(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_every=args.rate_limit_every,
+        drift=args.drift,
+    )
+    async with UpstreamServer(behaviour) as upstream:
+        os.environ["RET_NS_DEPARTURES_RET_ORIGIN"] = upstream.origin
+        os.environ["RET_NS_DEPARTURES_NS_ORIGIN"] = upstream.origin
+        # The integration reads the origins at import, so import it now
+        # pylint: disable=import-outside-toplevel
+        from pytest_homeassistant_custom_component.common import (
+            MockConfigEntry,
+            async_test_home_assistant,
+        )
+
+        from custom_components.ret_ns_departures.const import (
+            CONF_MONITOR_DISRUPTIONS,
+            CONF_NS_API_KEY,
+            CONF_OPERATOR,
+            CONF_STATION_CODE,
+            CONF_STOP_ID,
+            DOMAIN,
+            STOP_TYPE_NS,
+            STOP_TYPE_RET,
+        )
+        from custom_components.ret_ns_departures.coordinator import DeparturesCoordinator
+
+        # A plain session: Home Assistant's shared one needs zeroconf/network
+        async with (
+            async_test_home_assistant() as hass,
+            ClientSession() as session,
+        ):
+            samples: list[float] = []
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(_sample_lag(samples, stop))
+            coordinators: list[DeparturesCoordinator] = []
+            unsubs = []
+            setup_started = time.perf_counter()
+            for index in range(args.entries):
+                if index % 2:
+                    data = {
+                        CONF_OPERATOR: STOP_TYPE_NS,
+                        CONF_STATION_CODE: NS_STATIONS[index % len(NS_STATIONS)],
+                        CONF_NS_API_KEY: "soak",
+                        CONF_MONITOR_DISRUPTIONS: True,
+                    }
+                else:
+                    data = {
+                        CONF_OPERATOR: STOP_TYPE_RET,
+                        CONF_STOP_ID: f"{RET_HALTS[index % len(RET_HALTS)]}-{index}",
+                    }
+                entry = MockConfigEntry(domain=DOMAIN, data=data)
+                entry.add_to_hass(hass)
+                with patch(
+                    "custom_components.ret_ns_departures.coordinator.async_get_clientsession",
+                    return_value=session,
+                ):
+                    coordinator = DeparturesCoordinator(hass, entry)
+                await coordinator.async_refresh()
+                unsubs.append(coordinator.async_start())
+                coordinators.append(coordinator)
+            setup_seconds = time.perf_counter() - setup_started
+
+            await asyncio.sleep(args.duration)
+            stop.set()
+            await sampler
+            for unsub in unsubs:
+                unsub()
+            boards = sum(1 for coordinator in coordinators if coordinator.data)
+            await hass.async_stop(force=True)
+
+    return {
+        "entries": args.entries,
+        "setup_seconds": round(setup_seconds, 2),
+        "duration_seconds": args.duration,
+        "boards_with_data": boards,
+        "loop_lag_ms": {
+            "p50": round(_percentile(samples, 0.50) * 1000, 2),
+            "p99": round(_percentile(samples, 0.99) * 1000, 2),
+            "max": round(max(samples, default=0.0) * 1000, 2),
+            "mean": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+        },
+        "upstream_requests": dict(upstream.requests),
+        "upstream_statuses": dict(upstream.statuses),
+    }
+
+
+def main() -> None:
+    """Parse options, run the soak and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds to keep polling")
+    parser.add_argument("--latency", type=float, default=0.05, help="upstream latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="extra random latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--drift", action="store_true")
+    report = asyncio.run(soak(parser.parse_args()))
+    width = max(len(key) for key in report)
+    for key, value in report.items():
+        print(f"{key:<{width}}  {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,28 @@ from __future__ import annotations
 
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
+from .const import DOMAIN
 from .coordinator import DeparturesCoordinator, RETNSConfigEntry
+from .services import async_setup_services
+from .views import DeparturesBoardView, DeparturesDisplayView, DeparturesMetricsView
+from .websocket_api import async_setup_websocket
+
+DATA_BOARD_VIEW = "board_view"
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.IMAGE]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)  # pylint: disable=invalid-name
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # pylint: disable=unused-argument
+    """Register the integration's services and websocket commands once."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: RETNSConfigEntry) -> bool:
     """Set up RET & NS Departures from a config entry."""
@@ -18,6 +35,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: RETNSConfigEntry) -> boo
 
     entry.runtime_data = coordinator
 
+    # Poll on the shared operator hub schedule from now on
+    entry.async_on_unload(coordinator.async_start())
+
+    # One board endpoint for all entries (used by compact attributes), one
+    # small display endpoint, and one metrics endpoint for Prometheus
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_BOARD_VIEW not in domain_data:
+        domain_data[DATA_BOARD_VIEW] = DeparturesBoardView()
+        hass.http.register_view(domain_data[DATA_BOARD_VIEW])
+        hass.http.register_view(DeparturesDisplayView())
+        hass.http.register_view(DeparturesMetricsView())
+
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -2,18 +2,22 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+from copy import copy
 import logging
 from typing import Any
-from zoneinfo import ZoneInfo
+from urllib.parse import urlsplit
 
 from aiohttp import ClientError, ClientResponseError, ClientSession
 
 from .const import (
     NS_DISRUPTIONS_API_BASE_URL,
     NS_DISRUPTIONS_BASE_URL,
-    TIMEZONE,
+    STAGE_PARSE,
 )
+from .fast_json import json_fingerprint, project
+from .models import Disruption, DisruptionDelta
+from .stats import UpstreamStats
+from .time_parse import parse_ns_time
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,19 +30,26 @@ class NSDisruptionsAPIClient:
         self._session = session
         self._api_key = api_key
         self._base_url = NS_DISRUPTIONS_BASE_URL
-        self._tz = ZoneInfo(TIMEZONE)
+        # Parsed disruptions by id with the fingerprint of their raw JSON, and
+        # per scope (one board) the fingerprints seen on its last poll.
+        self._parsed: dict[str, tuple[int, Disruption | None]] = {}
+        self._fingerprints: dict[str, dict[str, int]] = {}
+        self._deltas: dict[str, DisruptionDelta] = {}
+        self.stats = UpstreamStats(urlsplit(NS_DISRUPTIONS_API_BASE_URL).netloc)
 
     async def async_get_disruptions(
         self,
         station_code: str | None = None,
         is_active: bool = True,
-    ) -> list[dict[str, Any]]:
+        scope: str | None = None,
+    ) -> list[Disruption]:
         """
         Fetch disruptions.
 
         Args:
             station_code: Optional station code to filter disruptions
             is_active: Filter for active disruptions only
+            scope: Key for disruption_delta(); defaults to the station code
 
         Returns:
             List of disruption dictionaries
@@ -52,7 +63,9 @@ class NSDisruptionsAPIClient:
         _LOGGER.debug("Fetching disruptions from %s", NS_DISRUPTIONS_API_BASE_URL)
 
         try:
-            data = await self._async_get_json(NS_DISRUPTIONS_API_BASE_URL, params)
+            data = await self._async_get_json(
+                "disruptions_v3", NS_DISRUPTIONS_API_BASE_URL, params
+            )
         except ClientResponseError as err:
             if err.status == 401:
                 raise
@@ -61,162 +74,253 @@ class NSDisruptionsAPIClient:
                 err.status,
             )
             data = await self._async_get_json(
-                f"{self._base_url}/disruptions", params
+                "disruptions", f"{self._base_url}/disruptions", params
             )
         except (asyncio.TimeoutError, ClientError) as err:
             _LOGGER.info("Disruptions API v3 error, falling back: %s", err)
             data = await self._async_get_json(
-                f"{self._base_url}/disruptions", params
+                "disruptions", f"{self._base_url}/disruptions", params
             )
 
         items = _disruption_items(data)
         if items is None:
             _LOGGER.warning("Unexpected disruption response format: %s", type(data))
             return []
-        return self._parse_disruptions(items)
+        with self.stats.measure(STAGE_PARSE):
+            return self._parse_disruptions(
+                [project_disruption(item) for item in items],
+                scope=(station_code or "") if scope is None else scope,
+            )
 
     def _parse_disruptions(
         self,
         data: list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
-        """Parse NS Disruptions API response into disruption list."""
-        disruptions = []
+        scope: str = "",
+    ) -> list[Disruption]:
+        """
+        Parse NS Disruptions API response into disruption list.
+
+        Objects whose raw JSON is unchanged since the last poll reuse the
+        earlier parse. ``scope`` (one per board) keys the added / removed /
+        changed ids reported by disruption_delta().
+        """
+        disruptions: list[Disruption] = []
+        previous = self._fingerprints.get(scope, {})
+        current: dict[str, int] = {}
+        added: set[str] = set()
+        changed: set[str] = set()
 
         for disruption_data in data:
-            # Skip if not a disruption or calamity
-            disruption_type = disruption_data.get("type")
-            if not disruption_type:
+            disruption_id = (
+                str(disruption_data.get("id") or "")
+                if isinstance(disruption_data, dict)
+                else ""
+            )
+            fingerprint = json_fingerprint(disruption_data)
+            cached_fingerprint, parsed = self._parsed.get(disruption_id, (None, None))
+            if cached_fingerprint != fingerprint or not disruption_id:
+                parsed = self._parse_disruption(disruption_data)
+                if disruption_id:
+                    self._parsed[disruption_id] = (fingerprint, parsed)
+            if parsed is None:
                 continue
-
-            # Extract basic information
-            disruption_id = disruption_data.get("id", "")
-            is_active = disruption_data.get("isActive", False)
-            title = disruption_data.get("title", "Unknown disruption")
-
-            # Parse timestamps
-            start_time = disruption_data.get("start")
-            end_time = disruption_data.get("end")
-
-            try:
-                if start_time:
-                    start_dt = datetime.fromisoformat(
-                        start_time.replace("Z", "+00:00")
-                    )
-                    start_dt = start_dt.astimezone(self._tz)
-                else:
-                    start_dt = None
-
-                if end_time:
-                    end_dt = datetime.fromisoformat(
-                        end_time.replace("Z", "+00:00")
-                    )
-                    end_dt = end_dt.astimezone(self._tz)
-                else:
-                    end_dt = None
-
-            except (ValueError, AttributeError) as err:
-                _LOGGER.debug("Error parsing disruption time: %s", err)
-                start_dt = None
-                end_dt = None
-
-            # Extract phase and impact
-            phase = disruption_data.get("phase", {})
-            phase_label = phase.get("label", "") if isinstance(phase, dict) else ""
-
-            impact = disruption_data.get("impact", {})
-            impact_value = impact.get("value", 0) if isinstance(impact, dict) else 0
-
-            # Extract affected stations from publication sections
-            stations = []
-            publication_sections = disruption_data.get("publicationSections", [])
-            for section in publication_sections:
-                section_data = section.get("section", {})
-                section_stations = section_data.get("stations", [])
-                for station in section_stations:
-                    station_name = station.get("name", "")
-                    if station_name and station_name not in stations:
-                        stations.append(station_name)
-
-            # Extract cause / situation / extra travel time from the first timespan
-            cause = ""
-            situation = ""
-            extra_travel_time = ""
-            timespans = disruption_data.get("timespans", [])
-            if timespans:
-                first_timespan = timespans[0]
-                cause_data = first_timespan.get("cause", {})
-                if isinstance(cause_data, dict):
-                    cause = cause_data.get("label", "")
-                situation_data = first_timespan.get("situation", {})
-                if isinstance(situation_data, dict):
-                    situation = situation_data.get("label", "")
-                extra = first_timespan.get("additionalTravelTime")
-                if isinstance(extra, dict):
-                    extra_travel_time = extra.get("label") or extra.get("description") or ""
-
-            if not extra_travel_time:
-                summary = disruption_data.get("summaryAdditionalTravelTime")
-                if isinstance(summary, dict):
-                    extra_travel_time = (
-                        summary.get("label") or summary.get("description") or ""
-                    )
-
-            # Build disruption dictionary
-            disruption = {
-                "id": disruption_id,
-                "type": disruption_type,
-                "title": title,
-                "is_active": is_active,
-                "start": start_dt,
-                "end": end_dt,
-                "phase": phase_label,
-                "impact": impact_value,
-                "stations": stations,
-                "cause": cause,
-                "situation": situation,
-                "additional_travel_time": extra_travel_time,
-                "description": disruption_data.get("description") or "",
-                "period": disruption_data.get("period", ""),
-            }
-
-            # Add expected duration if available
-            expected_duration = disruption_data.get("expectedDuration", {})
-            if isinstance(expected_duration, dict):
-                disruption["expected_duration"] = expected_duration.get("description", "")
-
+            # Copy so per-board additions (Spoorkaart geo) stay off the cache
+            disruption = copy(parsed)
             disruptions.append(disruption)
-
+            if not disruption_id:
+                continue
+            current[disruption_id] = fingerprint
+            if disruption_id not in previous:
+                added.add(disruption_id)
+            elif previous[disruption_id] != fingerprint:
+                changed.add(disruption_id)
+
+        self._fingerprints[scope] = current
+        self._deltas[scope] = DisruptionDelta(
+            added=frozenset(added),
+            removed=frozenset(previous.keys() - current.keys()),
+            changed=frozenset(changed),
+        )
+        self._prune_parsed()
         return disruptions
 
+    def disruption_delta(self, scope: str = "") -> DisruptionDelta:
+        """Ids added, removed and changed by the last parse for ``scope``."""
+        return self._deltas.get(scope, DisruptionDelta())
+
+    def forget_scope(self, scope: str) -> None:
+        """Drop a board's poll history once it unloads."""
+        self._fingerprints.pop(scope, None)
+        self._deltas.pop(scope, None)
+        self._prune_parsed()
+
+    def _prune_parsed(self) -> None:
+        """Forget parses no board reports any more."""
+        live = set().union(*self._fingerprints.values())
+        for stale_id in self._parsed.keys() - live:
+            del self._parsed[stale_id]
+
+    def _parse_disruption(self, disruption_data: dict[str, Any]) -> Disruption | None:
+        """Parse one disruption object; None when it has no type."""
+        # Skip if not a disruption or calamity
+        disruption_type = disruption_data.get("type")
+        if not disruption_type:
+            return None
+
+        # Extract basic information
+        disruption_id = disruption_data.get("id", "")
+        is_active = disruption_data.get("isActive", False)
+        title = disruption_data.get("title", "Unknown disruption")
+
+        # Parse timestamps
+        start_time = disruption_data.get("start")
+        end_time = disruption_data.get("end")
+
+        try:
+            start_dt = parse_ns_time(start_time) if start_time else None
+            end_dt = parse_ns_time(end_time) if end_time else None
+
+        except (ValueError, AttributeError) as err:
+            _LOGGER.debug("Error parsing disruption time: %s", err)
+            start_dt = None
+            end_dt = None
+
+        # Extract phase and impact
+        phase = disruption_data.get("phase", {})
+        phase_label = phase.get("label", "") if isinstance(phase, dict) else ""
+
+        impact = disruption_data.get("impact", {})
+        impact_value = impact.get("value", 0) if isinstance(impact, dict) else 0
+
+        # Extract affected stations from publication sections
+        stations = []
+        publication_sections = disruption_data.get("publicationSections", [])
+        for section in publication_sections:
+            section_data = section.get("section", {})
+            section_stations = section_data.get("stations", [])
+            for station in section_stations:
+                station_name = station.get("name", "")
+                if station_name and station_name not in stations:
+                    stations.append(station_name)
+
+        # Extract cause / situation / extra travel time from the first timespan
+        cause = ""
+        situation = ""
+        extra_travel_time = ""
+        timespans = disruption_data.get("timespans", [])
+        if timespans:
+            first_timespan = timespans[0]
+            cause_data = first_timespan.get("cause", {})
+            if isinstance(cause_data, dict):
+                cause = cause_data.get("label", "")
+            situation_data = first_timespan.get("situation", {})
+            if isinstance(situation_data, dict):
+                situation = situation_data.get("label", "")
+            extra = first_timespan.get("additionalTravelTime")
+            if isinstance(extra, dict):
+                extra_travel_time = extra.get("label") or extra.get("description") or ""
+
+        if not extra_travel_time:
+            summary = disruption_data.get("summaryAdditionalTravelTime")
+            if isinstance(summary, dict):
+                extra_travel_time = (
+                    summary.get("label") or summary.get("description") or ""
+                )
+
+        # Build disruption dictionary
+        disruption = Disruption(
+            id=disruption_id,
+            type=disruption_type,
+            title=title,
+            is_active=is_active,
+            start=start_dt,
+            end=end_dt,
+            phase=phase_label,
+            impact=impact_value,
+            stations=stations,
+            cause=cause,
+            situation=situation,
+            additional_travel_time=extra_travel_time,
+            description=disruption_data.get("description") or "",
+            period=disruption_data.get("period", ""),
+        )
+
+        # Add expected duration if available
+        expected_duration = disruption_data.get("expectedDuration", {})
+        if isinstance(expected_duration, dict):
+            disruption["expected_duration"] = expected_duration.get("description", "")
+
+        return disruption
+
     async def async_get_station_disruptions(
         self,
         station_code: str,
-    ) -> list[dict[str, Any]]:
+        scope: str | None = None,
+    ) -> list[Disruption]:
         """
         Fetch disruptions for a specific station.
 
         Args:
             station_code: The station code
+            scope: Key for disruption_delta(); defaults to the station code
 
         Returns:
             List of disruption dictionaries
         """
-        return await self.async_get_disruptions(station_code=station_code)
+        return await self.async_get_disruptions(station_code=station_code, scope=scope)
 
     def _headers(self) -> dict[str, str]:
         """Return subscription-key headers for NS APIs."""
         return {"Ocp-Apim-Subscription-Key": self._api_key}
 
     async def _async_get_json(
-        self, url: str, params: dict[str, Any] | None = None
+        self, endpoint: str, url: str, params: dict[str, Any] | None = None
     ) -> Any:
-        """GET JSON from an NS disruptions endpoint."""
+        """GET JSON from an NS disruptions endpoint; ``endpoint`` labels the request stats."""
         async with asyncio.timeout(10):
-            async with self._session.get(
-                url, params=params, headers=self._headers()
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+            with self.stats.request(endpoint) as call:
+                async with self._session.get(
+                    url, params=params, headers=self._headers()
+                ) as response:
+                    call.status = response.status
+                    response.raise_for_status()
+                    return await response.json(loads=self.stats.loads(endpoint))
+
+
+# Fields _parse_disruptions reads. Only the first timespan is used.
+_LABEL: dict[str, Any] = {"label": None}
+_LABEL_OR_DESCRIPTION: dict[str, Any] = {"label": None, "description": None}
+_DISRUPTION_SHAPE: dict[str, Any] = {
+    "type": None,
+    "id": None,
+    "isActive": None,
+    "title": None,
+    "start": None,
+    "end": None,
+    "phase": _LABEL,
+    "impact": {"value": None},
+    "publicationSections": [{"section": {"stations": [{"name": None}]}}],
+    "summaryAdditionalTravelTime": _LABEL_OR_DESCRIPTION,
+    "description": None,
+    "period": None,
+    "expectedDuration": {"description": None},
+}
+_TIMESPAN_SHAPE: dict[str, Any] = {
+    "cause": _LABEL,
+    "situation": _LABEL,
+    "additionalTravelTime": _LABEL_OR_DESCRIPTION,
+}
+
+
+def project_disruption(item: Any) -> Any:
+    """Reduce one disruption object to what _parse_disruptions reads."""
+    if not isinstance(item, dict):
+        return item
+    disruption = project(item, _DISRUPTION_SHAPE)
+    timespans = item.get("timespans")
+    if isinstance(timespans, list) and timespans:
+        disruption["timespans"] = [project(timespans[0], _TIMESPAN_SHAPE)]
+    return disruption
 
 
 def _disruption_items(data: Any) -> list[Any] | None:
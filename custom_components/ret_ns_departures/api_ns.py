@@ -2,11 +2,10 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
 import logging
 from math import asin, cos, radians, sin, sqrt
 from typing import Any
-from zoneinfo import ZoneInfo
+from urllib.parse import urlsplit
 
 from aiohttp import ClientError, ClientResponseError, ClientSession
 
@@ -16,8 +15,12 @@ from .const import (
     NS_API_BASE_URL,
     NS_STATIONS_API_BASE_URL,
     OPERATOR_NS,
-    TIMEZONE,
+    STAGE_PARSE,
 )
+from .fast_json import project
+from .models import Departure
+from .stats import UpstreamStats
+from .time_parse import parse_ns_time
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,13 +35,13 @@ class NSAPIClient:
         self._session = session
         self._api_key = api_key
         self._base_url = NS_API_BASE_URL
-        self._tz = ZoneInfo(TIMEZONE)
+        self.stats = UpstreamStats(urlsplit(NS_API_BASE_URL).netloc)
 
     async def async_get_departures(
         self,
         station_code: str,
         max_results: int = 5,
-    ) -> list[dict[str, Any]]:
+    ) -> list[Departure]:
         """
         Fetch train departures for an NS station.
 
@@ -63,15 +66,18 @@ class NSAPIClient:
 
         try:
             async with asyncio.timeout(10):
-                async with self._session.get(
-                    url, params=params, headers=headers
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-            _LOGGER.debug("Received NS data: %s", str(data)[:200])
-
-            return self._parse_departures(data, max_results)
+                with self.stats.request("departures") as call:
+                    async with self._session.get(
+                        url, params=params, headers=headers
+                    ) as response:
+                        call.status = response.status
+                        response.raise_for_status()
+                        data = await response.json(loads=self.stats.loads("departures"))
+
+            with self.stats.measure(STAGE_PARSE):
+                return self._parse_departures(
+                    project_departures(data, max_results), max_results
+                )
 
         except asyncio.TimeoutError:
             _LOGGER.warning("Timeout fetching NS departures for station %s", station_code)
@@ -89,7 +95,7 @@ class NSAPIClient:
         self,
         data: dict[str, Any],
         max_results: int,
-    ) -> list[dict[str, Any]]:
+    ) -> list[Departure]:
         """Parse NS API response into departure list."""
         departures = []
 
@@ -106,16 +112,10 @@ class NSAPIClient:
 
             try:
                 # Parse times (NS API uses ISO format)
-                scheduled_dt = datetime.fromisoformat(
-                    planned_datetime_str.replace("Z", "+00:00")
-                )
-                scheduled_dt = scheduled_dt.astimezone(self._tz)
+                scheduled_dt = parse_ns_time(planned_datetime_str)
 
                 if actual_datetime_str:
-                    actual_dt = datetime.fromisoformat(
-                        actual_datetime_str.replace("Z", "+00:00")
-                    )
-                    actual_dt = actual_dt.astimezone(self._tz)
+                    actual_dt = parse_ns_time(actual_datetime_str)
                     delay_minutes = int((actual_dt - scheduled_dt).total_seconds() / 60)
                 else:
                     actual_dt = scheduled_dt
@@ -139,19 +139,19 @@ class NSAPIClient:
             # Check for cancellation
             cancelled = departure_data.get("cancelled", False)
 
-            departure = {
-                "line": departure_data.get("trainCategory", ""),
-                "operator": departure_data.get("product", {}).get("operatorName", OPERATOR_NS),
-                "destination": destination,
-                "platform": departure_data.get("actualTrack") or departure_data.get("plannedTrack", ""),
-                "delay": delay_minutes if not cancelled else None,
-                "scheduled_time": scheduled_dt,
-                "actual_time": actual_dt if not cancelled else None,
-                "train_type": departure_data.get("trainCategory", ""),
-                "trip_number": departure_data.get("product", {}).get("number", ""),
-                "cancelled": cancelled,
-                "departure_status": departure_data.get("departureStatus", ""),
-            }
+            departure = Departure(
+                line=departure_data.get("trainCategory", ""),
+                operator=departure_data.get("product", {}).get("operatorName", OPERATOR_NS),
+                destination=destination,
+                platform=departure_data.get("actualTrack") or departure_data.get("plannedTrack", ""),
+                delay=delay_minutes if not cancelled else None,
+                scheduled_time=scheduled_dt,
+                actual_time=actual_dt if not cancelled else None,
+                train_type=departure_data.get("trainCategory", ""),
+                trip_number=departure_data.get("product", {}).get("number", ""),
+                cancelled=cancelled,
+                departure_status=departure_data.get("departureStatus", ""),
+            )
 
             departures.append(departure)
 
@@ -185,15 +185,17 @@ class NSAPIClient:
         return {"Ocp-Apim-Subscription-Key": self._api_key}
 
     async def _async_get_json(
-        self, url: str, params: dict[str, Any] | None = None
+        self, endpoint: str, url: str, params: dict[str, Any] | None = None
     ) -> Any:
-        """GET JSON from an NS API endpoint."""
+        """GET JSON from an NS API endpoint; ``endpoint`` labels the request stats."""
         async with asyncio.timeout(10):
-            async with self._session.get(
-                url, params=params, headers=self._headers()
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+            with self.stats.request(endpoint) as call:
+                async with self._session.get(
+                    url, params=params, headers=self._headers()
+                ) as response:
+                    call.status = response.status
+                    response.raise_for_status()
+                    return await response.json(loads=self.stats.loads(endpoint))
 
     async def async_validate_api_key(self) -> bool | None:
         """
@@ -205,11 +207,13 @@ class NSAPIClient:
         url = f"{self._base_url}/stations"
         try:
             async with asyncio.timeout(10):
-                async with self._session.get(url, headers=self._headers()) as response:
-                    if response.status in (401, 403):
-                        return False
-                    response.raise_for_status()
-                    return True
+                with self.stats.request("stations") as call:
+                    async with self._session.get(url, headers=self._headers()) as response:
+                        call.status = response.status
+                        if response.status in (401, 403):
+                            return False
+                        response.raise_for_status()
+                        return True
         except (asyncio.TimeoutError, ClientError) as err:
             _LOGGER.debug("Could not validate NS API key: %s", err)
             return None
@@ -241,7 +245,7 @@ class NSAPIClient:
             "limit": limit,
         }
         _LOGGER.debug("Fetching nearest NS stations from %s", url)
-        data = await self._async_get_json(url, params)
+        data = await self._async_get_json("nearest", url, params)
         return parse_ns_stations(data)
 
     async def async_search_stations(
@@ -265,7 +269,7 @@ class NSAPIClient:
             "limit": limit,
         }
         _LOGGER.debug("Searching NS stations at %s for %s", url, query)
-        data = await self._async_get_json(url, params)
+        data = await self._async_get_json("search", url, params)
         return parse_ns_stations(data)
 
     async def async_find_stations(
@@ -329,13 +333,49 @@ class NSAPIClient:
         url = f"{self._base_url}/stations"
 
         try:
-            data = await self._async_get_json(url)
+            data = await self._async_get_json("stations", url)
             return parse_ns_stations(data)
         except Exception as err:  # pylint: disable=broad-except
             _LOGGER.warning("Error fetching NS stations: %s", err)
             return []
 
 
+# Fields _parse_departures reads; the rest of each departure (routeStations,
+# messages, ...) is dropped right after decoding.
+_DEPARTURE_FIELDS = (
+    "plannedDateTime",
+    "actualDateTime",
+    "direction",
+    "cancelled",
+    "trainCategory",
+    "actualTrack",
+    "plannedTrack",
+    "departureStatus",
+)
+_PRODUCT_SHAPE: dict[str, Any] = {"operatorName": None, "number": None}
+
+
+def project_departures(data: Any, max_results: int) -> Any:
+    """Reduce a departures response to what _parse_departures reads."""
+    payload = data.get("payload") if isinstance(data, dict) else None
+    items = payload.get("departures") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return data
+    departures = []
+    for item in items[:max_results]:
+        if not isinstance(item, dict):
+            continue
+        departure = {key: item[key] for key in _DEPARTURE_FIELDS if key in item}
+        if "product" in item:
+            departure["product"] = project(item["product"], _PRODUCT_SHAPE)
+        route_stations = item.get("routeStations")
+        if not item.get("direction") and route_stations and isinstance(route_stations, list):
+            # Only the final stop is used, as a fallback destination
+            departure["routeStations"] = [project(route_stations[-1], {"mediumName": None})]
+        departures.append(departure)
+    return {"payload": {"departures": departures}}
+
+
 def parse_ns_stations(data: Any) -> list[dict[str, Any]]:
     """Normalize NS station payloads (v2, v3, and Reisinformatie shapes)."""
     stations: list[dict[str, Any]] = []
@@ -7,18 +7,19 @@ from datetime import datetime, timedelta
 import logging
 import re
 from typing import Any
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
 from zoneinfo import ZoneInfo
 
-from aiohttp import ClientError, ClientSession
+from aiohttp import ClientError, ClientResponse, ClientSession, StreamReader
 from bs4 import BeautifulSoup
 
 from .api_ret_diversions import (
+    DiversionArticleParser,
+    DiversionIndex,
     extract_dienstregeling_urls,
     extract_halt_lines,
     extract_halt_name,
     match_stop_notice,
-    parse_diversion_articles,
 )
 from .const import (
     OPERATOR_RET,
@@ -29,8 +30,11 @@ from .const import (
     RET_SEARCH_TYPE,
     RET_SITE_URL,
     RET_STOP_ALIASES,
+    STAGE_PARSE,
     TIMEZONE,
 )
+from .models import Departure
+from .stats import UpstreamStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +42,47 @@ _HALTE_SLUG_RE = re.compile(
     r"/home/reizen/halte/([a-z0-9-]+)\.html", re.IGNORECASE
 )
 _INACTIVE_NOTICE = "niet gereden"
+# Everything read from a halt page (title, line links, timetable) comes
+# before the site footer; it and the trailing scripts are most of the bytes.
+# Cards and articles can carry their own <footer>, so only the site one ends
+# the read, and only once departure rows or a timetable notice were seen.
+_HALT_PAGE_END = re.compile(rb'<footer\b[^>]*\bclass="footer(?:\s[^"]*)?"')
+_HALT_PAGE_CONTENT = (b"modal__toggle--generated", b"timetable__notice")
+_HALT_PAGE_TAG_SPAN = 512
+_HALT_PAGE_CHUNK = 16 * 1024
+
+
+async def _read_halt_page(response: ClientResponse) -> str:
+    """
+    Read a halt page up to its site footer.
+
+    The rest of the body is drained without decoding so the keep-alive
+    connection can be reused. Pages without a site footer, or without a
+    timetable before it, are read in full.
+    """
+    content = response.content
+    if not isinstance(content, StreamReader):
+        return await response.text()
+    buffer = bytearray()
+    truncate = True
+    async for chunk in content.iter_chunked(_HALT_PAGE_CHUNK):
+        start = max(0, len(buffer) - _HALT_PAGE_TAG_SPAN)
+        buffer += chunk
+        if not truncate:
+            continue
+        match = _HALT_PAGE_END.search(buffer, start)
+        if match is None:
+            continue
+        end = match.start()
+        if not any(buffer.find(marker, 0, end) != -1 for marker in _HALT_PAGE_CONTENT):
+            # Unexpected layout: let the parser see the whole page
+            truncate = False
+            continue
+        del buffer[end:]
+        async for _ in content.iter_chunked(_HALT_PAGE_CHUNK):
+            pass
+        break
+    return buffer.decode(response.charset or "utf-8", errors="replace")
 
 
 def _normalize_stop_id(stop_id: str) -> str:
@@ -69,7 +114,7 @@ class _LastHalt:
     line_urls: dict[str, str] = field(default_factory=dict)
 
 
-class RETAPIClient:
+class RETAPIClient:  # pylint: disable=too-many-instance-attributes
     """Client for interacting with RET website for departures."""
 
     def __init__(self, session: ClientSession) -> None:
@@ -78,8 +123,13 @@ class RETAPIClient:
         self._base_url = RET_BASE_URL
         self._tz = ZoneInfo(TIMEZONE)
         self._resolved_slugs: dict[str, str] = {}
-        self._last_halt = _LastHalt()
-        self._diversions_cache: tuple[float, list[dict[str, Any]]] | None = None
+        self._last_halt: dict[str, _LastHalt] = {}
+        # (fetched_at timestamp, expires_at timestamp, notices)
+        self._diversions_cache: tuple[float, float, list[dict[str, Any]]] | None = None
+        self._diversions_lock = asyncio.Lock()
+        self._diversion_parser = DiversionArticleParser()
+        self._diversion_index = DiversionIndex([])
+        self.stats = UpstreamStats(urlsplit(RET_BASE_URL).netloc)
 
     def resolved_stop_id(self, stop_id: str) -> str | None:
         """Return the live halt slug last resolved for ``stop_id``, if any."""
@@ -90,7 +140,7 @@ class RETAPIClient:
         stop_id: str,
         max_results: int = 5,
         line_filter: list[str] | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> list[Departure]:
         """
         Fetch departures for a RET stop by scraping the website.
 
@@ -110,9 +160,10 @@ class RETAPIClient:
 
             slug, html_content = loaded
             _LOGGER.debug("Received RET HTML page for %s, parsing departures", slug)
-            return await self._parse_departures(
-                html_content, max_results, line_filter
-            )
+            with self.stats.measure(STAGE_PARSE):
+                return await self._parse_departures(
+                    html_content, max_results, line_filter
+                )
 
         except asyncio.TimeoutError:
             _LOGGER.warning("Timeout fetching RET departures for stop %s", stop_id)
@@ -131,7 +182,7 @@ class RETAPIClient:
             slug = self._resolved_slugs[requested]
             html = await self._async_fetch_halt_html(slug)
             if html is not None and not _is_inactive_halt(html):
-                self._remember_halt(html)
+                self._remember_halt(requested, html)
                 return slug, html
             self._resolved_slugs.pop(requested, None)
 
@@ -144,7 +195,7 @@ class RETAPIClient:
                     _LOGGER.debug("RET halt %s is marked out of service", slug)
                 continue
             self._resolved_slugs[requested] = slug
-            self._remember_halt(html)
+            self._remember_halt(requested, html)
             if slug != requested:
                 _LOGGER.info("RET halt %s resolved to %s", requested, slug)
             return slug, html
@@ -160,19 +211,20 @@ class RETAPIClient:
             if not departures:
                 continue
             self._resolved_slugs[requested] = found
-            self._remember_halt(html)
+            self._remember_halt(requested, html)
             _LOGGER.info("RET halt %s resolved to %s via search", requested, found)
             return found, html
 
         return None
 
-    def _remember_halt(self, html: str) -> None:
+    def _remember_halt(self, requested: str, html: str) -> None:
         """Keep halt title and serving lines from the last successful page."""
-        self._last_halt = _LastHalt(
-            name=extract_halt_name(html),
-            lines=extract_halt_lines(html),
-            line_urls=extract_dienstregeling_urls(html),
-        )
+        with self.stats.measure(STAGE_PARSE):
+            self._last_halt[requested] = _LastHalt(
+                name=extract_halt_name(html),
+                lines=extract_halt_lines(html),
+                line_urls=extract_dienstregeling_urls(html),
+            )
 
     async def async_get_service_notice(
         self,
@@ -182,34 +234,74 @@ class RETAPIClient:
     ) -> dict[str, Any] | None:
         """Return a RET omleiding that explains why this halt has no times."""
         slug = self.resolved_stop_id(stop_id) or _normalize_stop_id(stop_id)
-        halt_name = stop_name or self._last_halt.name or slug.replace("-", " ")
-        lines = line_filter or self._last_halt.lines
-        notices = await self.async_get_diversions()
+        last_halt = self._last_halt.get(_normalize_stop_id(stop_id), _LastHalt())
+        halt_name = stop_name or last_halt.name or slug.replace("-", " ")
+        lines = line_filter or last_halt.lines
+        await self.async_get_diversions()
         return match_stop_notice(
-            notices,
+            self._diversion_index,
             stop_name=halt_name,
             stop_slug=slug,
             lines=lines,
-            line_urls=self._last_halt.line_urls,
+            line_urls=last_halt.line_urls,
+            now=datetime.now(self._tz),
         )
 
     async def async_get_diversions(self) -> list[dict[str, Any]]:
         """Fetch and cache RET omleidingen / verstoringen articles."""
-        now = datetime.now(self._tz).timestamp()
+        # Boards sharing this client wait for one fetch instead of each
+        # downloading the omleidingen page when the cache expires.
+        async with self._diversions_lock:
+            return await self._async_get_diversions_locked()
+
+    async def _async_get_diversions_locked(self) -> list[dict[str, Any]]:
+        """Return cached notices or fetch the omleidingen page once."""
+        now = datetime.now(self._tz)
         if self._diversions_cache is not None:
-            cached_at, notices = self._diversions_cache
-            if now - cached_at < RET_DIVERSIONS_CACHE_SECONDS:
+            _, expires_at, notices = self._diversions_cache
+            if now.timestamp() < expires_at:
+                self.stats.cache_lookup(hit=True)
                 return notices
 
+        self.stats.cache_lookup(hit=False)
         _LOGGER.debug("Fetching RET diversions from %s", RET_DIVERSIONS_URL)
         async with asyncio.timeout(10):
-            async with self._session.get(RET_DIVERSIONS_URL) as response:
-                response.raise_for_status()
-                html = await response.text()
-        notices = parse_diversion_articles(html)
-        self._diversions_cache = (now, notices)
+            with self.stats.request("omleidingen") as call:
+                async with self._session.get(RET_DIVERSIONS_URL) as response:
+                    call.status = response.status
+                    response.raise_for_status()
+                    html = await response.text()
+        self.stats.observe_size("omleidingen", len(html))
+        with self.stats.measure(STAGE_PARSE):
+            notices = self._diversion_parser.parse(html)
+            if notices is not self._diversion_index.notices:
+                self._diversion_index = DiversionIndex(notices)
+        # Refetch when a notice starts or ends, so the page's own update for
+        # that moment is picked up, but at least every cache period.
+        expires_at = now.timestamp() + RET_DIVERSIONS_CACHE_SECONDS
+        boundary = self._diversion_index.next_boundary(now)
+        if boundary is not None:
+            expires_at = min(expires_at, boundary.timestamp())
+        self._diversions_cache = (now.timestamp(), expires_at, notices)
         return notices
 
+    def cache_info(self) -> dict[str, Any]:
+        """Resolved halt slugs and omleidingen cache state for diagnostics."""
+        diversions: dict[str, Any] = {"cached": False, **self.stats.cache_info()}
+        if self._diversions_cache is not None:
+            fetched_at, expires_at, notices = self._diversions_cache
+            now = datetime.now(self._tz).timestamp()
+            diversions.update(
+                cached=True,
+                age_seconds=round(now - fetched_at, 1),
+                expires_in_seconds=round(expires_at - now, 1),
+                notices=len(notices),
+            )
+        return {
+            "resolved_slugs": dict(self._resolved_slugs),
+            "diversions_cache": diversions,
+        }
+
     def _candidate_slugs(self, slug: str) -> list[str]:
         """Requested slug plus known replacements from the dienstregeling."""
         candidates = [slug]
@@ -223,11 +315,15 @@ class RETAPIClient:
         url = f"{self._base_url}/{slug}.html"
         _LOGGER.debug("Fetching RET departures from %s", url)
         async with asyncio.timeout(10):
-            async with self._session.get(url) as response:
-                if response.status == 404:
-                    return None
-                response.raise_for_status()
-                return await response.text()
+            with self.stats.request("halte") as call:
+                async with self._session.get(url) as response:
+                    call.status = response.status
+                    if response.status == 404:
+                        return None
+                    response.raise_for_status()
+                    html = await _read_halt_page(response)
+        self.stats.observe_size("halte", len(html))
+        return html
 
     async def _async_search_halt_slugs(self, stop_id: str) -> list[str]:
         """Look up halt slugs on ret.nl (same search as the website)."""
@@ -252,9 +348,13 @@ class RETAPIClient:
             url = f"{RET_SITE_URL}?{params}"
             try:
                 async with asyncio.timeout(10):
-                    async with self._session.get(url) as response:
-                        response.raise_for_status()
-                        payload = await response.json(content_type=None)
+                    with self.stats.request("search") as call:
+                        async with self._session.get(url) as response:
+                            call.status = response.status
+                            response.raise_for_status()
+                            payload = await response.json(
+                                content_type=None, loads=self.stats.loads("search")
+                            )
             except (asyncio.TimeoutError, ClientError, TypeError, ValueError) as err:
                 _LOGGER.debug("RET halt search for %r failed: %s", query, err)
                 continue
@@ -276,7 +376,7 @@ class RETAPIClient:
         html_content: str,
         max_results: int,
         line_filter: list[str] | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> list[Departure]:
         """Parse HTML content and extract departure information."""
         departures = []
 
@@ -368,17 +468,17 @@ class RETAPIClient:
                 elif "Metro" in line_text:
                     transport_type = "metro"
 
-                departure = {
-                    "line": line_number,
-                    "operator": OPERATOR_RET,
-                    "destination": destination,
-                    "platform": "",
-                    "delay": delay_minutes,
-                    "scheduled_time": scheduled_dt,
-                    "actual_time": actual_dt,
-                    "transport_type": transport_type,
-                    "trip_number": "",
-                }
+                departure = Departure(
+                    line=line_number,
+                    operator=OPERATOR_RET,
+                    destination=destination,
+                    platform="",
+                    delay=delay_minutes,
+                    scheduled_time=scheduled_dt,
+                    actual_time=actual_dt,
+                    transport_type=transport_type,
+                    trip_number="",
+                )
 
                 departures.append(departure)
 
@@ -1,12 +1,15 @@
 """Parse RET omleidingen / dienstregeling notices for a halt."""
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+import hashlib
 import re
 from typing import Any
+from zoneinfo import ZoneInfo
 
 from bs4 import BeautifulSoup
 
-from .const import RET_DIENSTREGELING_BASE_URL, RET_DIVERSIONS_URL
+from .const import RET_DIENSTREGELING_BASE_URL, RET_DIVERSIONS_URL, RET_ORIGIN, TIMEZONE
 
 _LINE_LIST_RE = re.compile(
     r"(?:nachtbus|tram|bus|metro)(?:lijnen?)?\s+"
@@ -28,43 +31,214 @@ _REPLACEMENT_HEADER_RE = re.compile(
 _STOP_ITEM_RE = re.compile(r"^[-•]\s+(.+)")
 _WORKS_RE = re.compile(r"werkzaamheden\s+(\S+)", re.IGNORECASE)
 _TOKEN_RE = re.compile(r"[a-z0-9]+")
+_DUTCH_DATE_RE = re.compile(
+    r"(\d{1,2})\s+([a-z]+)\.?\s+(\d{4})(?:\s+(?:om\s+)?(\d{1,2})[:.](\d{2}))?",
+    re.IGNORECASE,
+)
+_DUTCH_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "maa": 3,
+    "mrt": 3,
+    "apr": 4,
+    "mei": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "okt": 10,
+    "nov": 11,
+    "dec": 12,
+}
+_TZ = ZoneInfo(TIMEZONE)
+_ARTICLE_RE = re.compile(
+    r"<article\b[^>]*\bclass=[\"'][^\"']*\barticle--modal(?=[\s\"'])[^>]*>.*?</article>",
+    re.IGNORECASE | re.DOTALL,
+)
 
 
 def parse_diversion_articles(html: str) -> list[dict[str, Any]]:
     """Turn RET omleidingen articles into structured notices."""
-    soup = BeautifulSoup(html, "html.parser")
-    notices: list[dict[str, Any]] = []
-    for index, article in enumerate(soup.select("article.article--modal")):
-        notice = _parse_article(article, index)
-        if notice:
+    return DiversionArticleParser().parse(html)
+
+
+class DiversionArticleParser:
+    """
+    Parse the omleidingen page, reusing notices of unchanged articles.
+
+    Articles rarely change within a day. Each article's markup is cut from
+    the page and fingerprinted, and only new or edited articles go through
+    BeautifulSoup and the stop list parsing again. An identical page
+    returns the previous notices as they are.
+    """
+
+    def __init__(self) -> None:
+        """Start with empty caches."""
+        self._page_fingerprint: int | None = None
+        self._page_notices: list[dict[str, Any]] = []
+        self._articles: dict[int, dict[str, Any] | None] = {}
+        self.reused = 0
+        self.parsed = 0
+
+    def parse(self, html: str) -> list[dict[str, Any]]:
+        """Return the notices on ``html``."""
+        page_fingerprint = hash(html)
+        if page_fingerprint == self._page_fingerprint:
+            self.reused += len(self._articles)
+            return self._page_notices
+
+        articles: dict[int, dict[str, Any] | None] = {}
+        notices: list[dict[str, Any]] = []
+        occurrences: dict[str, int] = {}
+        for markup in _article_markup(html):
+            fingerprint = hash(markup)
+            if fingerprint in articles:
+                continue
+            if fingerprint in self._articles:
+                notice = self._articles[fingerprint]
+                self.reused += 1
+            else:
+                article = BeautifulSoup(markup, "html.parser").select_one(
+                    "article.article--modal"
+                )
+                notice = _parse_article(article) if article else None
+                self.parsed += 1
+            articles[fingerprint] = notice
+            if notice is None:
+                continue
+            # Same title and period twice (e.g. one per direction): number
+            # the repeats, so other articles coming and going keep ids stable
+            count = occurrences[notice["id"]] = occurrences.get(notice["id"], 0) + 1
+            if count > 1:
+                notice = {**notice, "id": f"{notice['id']}-{count}"}
             notices.append(notice)
-    return notices
 
+        self._articles = articles
+        self._page_fingerprint = page_fingerprint
+        self._page_notices = notices
+        return notices
 
-def match_stop_notice(
-    notices: list[dict[str, Any]],
+
+def _article_markup(html: str) -> list[str]:
+    """Markup of each modal article, without parsing the rest of the page."""
+    found = _ARTICLE_RE.findall(html)
+    if found:
+        return found
+    # Unexpected markup: fall back to letting BeautifulSoup find them
+    soup = BeautifulSoup(html, "html.parser")
+    return [str(article) for article in soup.select("article.article--modal")]
+
+
+class DiversionIndex:
+    """
+    Lookup tables over parsed notices, built once per omleidingen refresh.
+
+    Cancelled stops are indexed by their normalised name and notices by
+    line, so matching a halt compares it with each distinct cancelled stop
+    once instead of with every stop of every notice. Results are memoised
+    per halt until the next rebuild.
+    """
+
+    def __init__(self, notices: list[dict[str, Any]]) -> None:
+        """Index ``notices``; their order decides which match wins."""
+        self.notices = notices
+        self._by_stop: dict[str, set[int]] = {}
+        self._by_line: dict[str, list[int]] = {}
+        self._cancelled: dict[tuple[str, str], tuple[int, ...]] = {}
+        # Active positions, valid from _active_at until _active_until
+        self._active: frozenset[int] = frozenset()
+        self._active_at: datetime | None = None
+        self._active_until: datetime | None = None
+        for position, notice in enumerate(notices):
+            for line in notice.get("lines") or []:
+                self._by_line.setdefault(str(line), []).append(position)
+            for stops in (notice.get("cancelled_by_line") or {}).values():
+                for stop in stops:
+                    if key := _norm(stop):
+                        self._by_stop.setdefault(key, set()).add(position)
+
+    def cancelled_at(self, stop_name: str, stop_slug: str) -> tuple[int, ...]:
+        """Positions of notices that list this halt as vervallen."""
+        key = (stop_name, stop_slug)
+        hits = self._cancelled.get(key)
+        if hits is None:
+            # Same substring test as _halt_is_cancelled, so abbreviations
+            # like "Kruispl." still match; _norm is idempotent on the keys.
+            positions: set[int] = set()
+            for stop, owners in self._by_stop.items():
+                if _names_match(stop_name, stop_slug, stop):
+                    positions.update(owners)
+            hits = tuple(sorted(positions))
+            self._cancelled[key] = hits
+        return hits
+
+    def active(self, now: datetime) -> frozenset[int]:
+        """Positions of notices whose Van/Tot period includes ``now``."""
+        if self._active_at is not None and self._active_at <= now and (
+            self._active_until is None or now < self._active_until
+        ):
+            return self._active
+        active: set[int] = set()
+        until: datetime | None = None
+        for position, notice in enumerate(self.notices):
+            start, end = notice.get("start"), notice.get("end")
+            if start is not None and now < start:
+                boundary = start
+            elif end is not None and now >= end:
+                continue
+            else:
+                active.add(position)
+                if end is None:
+                    continue
+                boundary = end
+            if until is None or boundary < until:
+                until = boundary
+        self._active = frozenset(active)
+        self._active_at = now
+        self._active_until = until
+        return self._active
+
+    def next_boundary(self, now: datetime) -> datetime | None:
+        """When a notice next starts or ends after ``now``, if ever."""
+        self.active(now)
+        return self._active_until
+
+    def serving(self, lines: set[str]) -> set[int]:
+        """Positions of notices about any of ``lines``."""
+        positions: set[int] = set()
+        for line in lines:
+            positions.update(self._by_line.get(line, ()))
+        return positions
+
+
+def match_stop_notice(  # pylint: disable=too-many-arguments
+    notices: list[dict[str, Any]] | DiversionIndex,
     *,
     stop_name: str,
     stop_slug: str,
     lines: list[str] | None = None,
     line_urls: dict[str, str] | None = None,
+    now: datetime | None = None,
 ) -> dict[str, Any] | None:
-    """Pick the diversion that explains an empty or cancelled halt."""
-    wanted_lines = {str(line).strip() for line in (lines or []) if str(line).strip()}
-    cancelled_hits: list[dict[str, Any]] = []
-    line_hits: list[dict[str, Any]] = []
+    """
+    Pick the diversion that explains an empty or cancelled halt.
 
-    for notice in notices:
-        if _halt_is_cancelled(notice, stop_name, stop_slug):
-            cancelled_hits.append(notice)
-        elif wanted_lines and wanted_lines.intersection(notice.get("lines") or []):
-            line_hits.append(notice)
+    With ``now`` only notices whose Van/Tot period includes it count.
+    """
+    index = notices if isinstance(notices, DiversionIndex) else DiversionIndex(notices)
+    wanted_lines = {str(line).strip() for line in (lines or []) if str(line).strip()}
+    cancelled_hits = list(index.cancelled_at(stop_name, stop_slug))
+    line_hits = sorted(index.serving(wanted_lines).difference(cancelled_hits))
+    if now is not None:
+        active = index.active(now)
+        cancelled_hits = [position for position in cancelled_hits if position in active]
+        line_hits = [position for position in line_hits if position in active]
 
     if cancelled_hits and wanted_lines:
         lined = [
-            notice
-            for notice in cancelled_hits
-            if wanted_lines.intersection(notice.get("lines") or [])
+            position
+            for position in cancelled_hits
+            if wanted_lines.intersection(index.notices[position].get("lines") or [])
         ]
         if lined:
             cancelled_hits = lined
@@ -73,7 +247,7 @@ def match_stop_notice(
     if not chosen:
         return None
     return format_stop_notice(
-        chosen[0],
+        index.notices[chosen[0]],
         stop_name=stop_name,
         stop_slug=stop_slug,
         lines=sorted(wanted_lines),
@@ -158,7 +332,7 @@ def extract_dienstregeling_urls(html: str) -> dict[str, str]:
     return urls
 
 
-def _parse_article(article: Any, index: int) -> dict[str, Any] | None:
+def _parse_article(article: Any) -> dict[str, Any] | None:
     heading = article.select_one("h2")
     title_full = heading.get_text(" ", strip=True) if heading else ""
     if not title_full:
@@ -196,19 +370,50 @@ def _parse_article(article: Any, index: int) -> dict[str, Any] | None:
         period = f"{start_text} – {end_text}"
 
     return {
-        "id": f"ret-diversion-{index}",
+        "id": _notice_id(title_full, date_text),
         "title": title,
         "cause": cause,
         "summary": summary,
         "period": period,
         "start_text": start_text,
         "end_text": end_text,
+        "start": parse_dutch_datetime(start_text),
+        "end": parse_dutch_datetime(end_text, end_of_day=True),
         "lines": lines,
         "cancelled_by_line": cancelled_by_line,
         "replacements_by_line": replacements_by_line,
     }
 
 
+def parse_dutch_datetime(text: str, *, end_of_day: bool = False) -> datetime | None:
+    """
+    Parse a RET date like ``18 juli 2026 05:00`` (Europe/Amsterdam).
+
+    Without a time the date means the whole day, so ``end_of_day`` moves
+    it to midnight after. Returns None when no date is recognised.
+    """
+    match = _DUTCH_DATE_RE.search(text or "")
+    if not match:
+        return None
+    day, month_name, year, hour, minute = match.groups()
+    month = _DUTCH_MONTHS.get(month_name[:3].casefold())
+    if month is None:
+        return None
+    try:
+        parsed = datetime(int(year), month, int(day), tzinfo=_TZ)
+        if hour is not None:
+            return parsed.replace(hour=int(hour), minute=int(minute))
+    except ValueError:
+        return None
+    return parsed + timedelta(days=1) if end_of_day else parsed
+
+
+def _notice_id(title: str, date_text: str) -> str:
+    """Id that stays the same while the article's title and period do."""
+    digest = hashlib.sha1(f"{title}|{date_text}".encode(), usedforsecurity=False)
+    return f"ret-diversion-{digest.hexdigest()[:12]}"
+
+
 def _parse_stop_lists(text: str) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
     cancelled: dict[str, list[str]] = {}
     replacements: dict[str, list[str]] = {}
@@ -316,7 +521,7 @@ def _source_url(lines: list[str], line_urls: dict[str, str] | None) -> str:
             continue
         if href.startswith("http"):
             return href
-        return f"https://www.ret.nl{href}"
+        return f"{RET_ORIGIN}{href}"
     if len(lines) == 1 and lines[0].isalpha():
         return f"{RET_DIENSTREGELING_BASE_URL}/metro-{lines[0].lower()}.html"
     return RET_DIVERSIONS_URL
@@ -4,10 +4,13 @@ from __future__ import annotations
 import asyncio
 import logging
 from typing import Any
+from urllib.parse import urlsplit
 
 from aiohttp import ClientError, ClientResponseError, ClientSession
 
-from .const import NS_SPOORKAART_API_BASE_URL
+from .const import NS_SPOORKAART_API_BASE_URL, STAGE_PARSE
+from .models import StoringGeo
+from .stats import UpstreamStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +23,10 @@ class NSSpoorkaartClient:
         self._session = session
         self._api_key = api_key
         self.disabled = False
-        self._cache: dict[str, dict[str, Any] | None] = {}
+        self._cache: dict[str, StoringGeo | None] = {}
+        self._live_ids: dict[str, set[str]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.stats = UpstreamStats(urlsplit(NS_SPOORKAART_API_BASE_URL).netloc)
 
     def _headers(self) -> dict[str, str]:
         """Return subscription-key headers."""
@@ -29,13 +35,23 @@ class NSSpoorkaartClient:
             "Accept": "application/json",
         }
 
-    def prune_cache(self, live_ids: set[str]) -> None:
-        """Drop cached getStoring results that are no longer active."""
+    def prune_cache(self, live_ids: set[str], scope: str = "") -> None:
+        """
+        Drop cached getStoring results that are no longer active.
+
+        ``scope`` identifies the station reporting ``live_ids``; an id stays
+        cached while any station sharing this client still reports it.
+        """
+        self._live_ids[scope] = set(live_ids)
+        keep = set().union(*self._live_ids.values())
         for stale_id in list(self._cache):
-            if stale_id not in live_ids:
+            if stale_id not in keep:
                 del self._cache[stale_id]
+        for stale_id in list(self._locks):
+            if stale_id not in keep and not self._locks[stale_id].locked():
+                del self._locks[stale_id]
 
-    async def async_get_storing(self, disruption_id: str) -> dict[str, Any] | None:
+    async def async_get_storing(self, disruption_id: str) -> StoringGeo | None:
         """
         Fetch GeoJSON for one disruption via getStoring.
 
@@ -50,19 +66,42 @@ class NSSpoorkaartClient:
         if not storing_id:
             return None
         if storing_id in self._cache:
+            self.stats.cache_lookup(hit=True)
             return self._cache[storing_id]
 
+        # Stations sharing a disruption wait for one request per id.
+        async with self._locks.setdefault(storing_id, asyncio.Lock()):
+            if self.disabled:
+                return None
+            hit = storing_id in self._cache
+            self.stats.cache_lookup(hit)
+            if hit:
+                return self._cache[storing_id]
+            return await self._async_fetch_storing(storing_id)
+
+    def cache_info(self) -> dict[str, Any]:
+        """Cache size and hit ratio for diagnostics."""
+        return {
+            "size": len(self._cache),
+            "disabled": self.disabled,
+            **self.stats.cache_info(),
+        }
+
+    async def _async_fetch_storing(self, storing_id: str) -> StoringGeo | None:
+        """Request getStoring for one id and cache the parsed result."""
         url = f"{NS_SPOORKAART_API_BASE_URL}/storingen/{storing_id}"
         _LOGGER.debug("Fetching Spoorkaart getStoring %s", storing_id)
 
         try:
             async with asyncio.timeout(10):
-                async with self._session.get(url, headers=self._headers()) as response:
-                    if response.status in (400, 404):
-                        self._cache[storing_id] = None
-                        return None
-                    response.raise_for_status()
-                    data = await response.json()
+                with self.stats.request("storingen") as call:
+                    async with self._session.get(url, headers=self._headers()) as response:
+                        call.status = response.status
+                        if response.status in (400, 404):
+                            self._cache[storing_id] = None
+                            return None
+                        response.raise_for_status()
+                        data = await response.json(loads=self.stats.loads("storingen"))
         except ClientResponseError as err:
             if err.status in (401, 403):
                 self.disabled = True
@@ -76,12 +115,13 @@ class NSSpoorkaartClient:
             _LOGGER.debug("Spoorkaart getStoring error for %s: %s", storing_id, err)
             raise
 
-        parsed = parse_storing_payload(data)
+        with self.stats.measure(STAGE_PARSE):
+            parsed = parse_storing_payload(data)
         self._cache[storing_id] = parsed
         return parsed
 
 
-def parse_storing_payload(data: Any) -> dict[str, Any] | None:
+def parse_storing_payload(data: Any) -> StoringGeo | None:
     """Turn a getStoring FeatureCollection into a compact map summary."""
     features = _storing_features(data)
     if not features:
@@ -113,30 +153,30 @@ def parse_storing_payload(data: Any) -> dict[str, Any] | None:
         points.extend(_geometry_points(geometry))
 
     if not points:
-        return {
-            "id": feature_id,
-            "station_codes": station_codes,
-            "level": niveau,
-            "map_type": map_type,
-            "geometry_type": geometry_type,
-            "feature_count": len(features),
-        }
+        return StoringGeo(
+            id=feature_id,
+            station_codes=station_codes,
+            level=niveau,
+            map_type=map_type,
+            geometry_type=geometry_type,
+            feature_count=len(features),
+        )
 
     lngs = [point[0] for point in points]
     lats = [point[1] for point in points]
     min_lng, max_lng = min(lngs), max(lngs)
     min_lat, max_lat = min(lats), max(lats)
-    return {
-        "id": feature_id,
-        "latitude": (min_lat + max_lat) / 2,
-        "longitude": (min_lng + max_lng) / 2,
-        "bbox": [min_lng, min_lat, max_lng, max_lat],
-        "station_codes": station_codes,
-        "level": niveau,
-        "map_type": map_type,
-        "geometry_type": geometry_type,
-        "feature_count": len(features),
-    }
+    return StoringGeo(
+        id=feature_id,
+        latitude=(min_lat + max_lat) / 2,
+        longitude=(min_lng + max_lng) / 2,
+        bbox=[min_lng, min_lat, max_lng, max_lat],
+        station_codes=station_codes,
+        level=niveau,
+        map_type=map_type,
+        geometry_type=geometry_type,
+        feature_count=len(features),
+    )
 
 
 def _storing_features(data: Any) -> list[dict[str, Any]]:
@@ -4,10 +4,12 @@ from __future__ import annotations
 import asyncio
 import logging
 from typing import Any
+from urllib.parse import urlsplit
 
 from aiohttp import ClientError, ClientResponseError, ClientSession
 
-from .const import NS_VIRTUAL_TRAIN_API_BASE_URL
+from .const import NS_VIRTUAL_TRAIN_API_BASE_URL, STAGE_PARSE
+from .stats import UpstreamStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +21,9 @@ class NSVirtualTrainClient:
         """Initialize the Virtual Train client."""
         self._session = session
         self._api_key = api_key
+        self.stats = UpstreamStats(urlsplit(NS_VIRTUAL_TRAIN_API_BASE_URL).netloc)
+        # Last HTTP status (or "error") per getImage route, for diagnostics
+        self.endpoint_state: dict[str, int | str] = {}
 
     def _headers(self) -> dict[str, str]:
         """Return subscription-key headers."""
@@ -42,57 +47,63 @@ class NSVirtualTrainClient:
 
         params = _clean_params({"station": station, "date": date})
         candidates = [
-            (f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/image/{rit}", params),
+            ("trein/image/{rit}", f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/image/{rit}", params),
             (
+                "trein/image",
                 f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/image",
                 _clean_params(
                     {"ritNummer": rit, "treinNummer": rit, "station": station, "date": date}
                 ),
             ),
-            (f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/{rit}/image", params),
+            ("trein/{rit}/image", f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/{rit}/image", params),
         ]
 
-        for url, query in candidates:
-            result = await self._async_try_image_url(url, query)
+        for route, url, query in candidates:
+            result = await self._async_try_image_url(route, url, query)
             if result:
                 return result
 
         if station:
             details_url = f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/{rit}/{station}"
-            result = await self._async_try_image_url(details_url, params)
+            result = await self._async_try_image_url(
+                "trein/{rit}/{station}", details_url, params
+            )
             if result:
                 return result
 
         return None
 
     async def _async_try_image_url(
-        self, url: str, params: dict[str, Any]
+        self, route: str, url: str, params: dict[str, Any]
     ) -> dict[str, Any] | None:
         """GET a virtual-train URL and parse an image or image URL."""
+        self.endpoint_state[route] = "error"
         try:
             async with asyncio.timeout(10):
-                async with self._session.get(
-                    url, params=params or None, headers=self._headers()
-                ) as response:
-                    if response.status in (404, 400):
-                        return None
-                    response.raise_for_status()
-                    content_type = (response.content_type or "").lower()
-                    if content_type.startswith("image/") or "svg" in content_type:
-                        return {
-                            "bytes": await response.read(),
-                            "content_type": content_type,
-                        }
-                    if "json" in content_type or content_type.endswith("+json"):
-                        data = await response.json()
-                        parsed = image_from_virtual_train_payload(data)
-                        if parsed and parsed.get("url") and not parsed.get("bytes"):
-                            downloaded = await self._async_download_public_image(
-                                parsed["url"]
-                            )
-                            if downloaded:
-                                parsed.update(downloaded)
-                        return parsed
+                with self.stats.request(route) as call:
+                    async with self._session.get(
+                        url, params=params or None, headers=self._headers()
+                    ) as response:
+                        call.status = self.endpoint_state[route] = response.status
+                        if response.status in (404, 400):
+                            return None
+                        response.raise_for_status()
+                        content_type = (response.content_type or "").lower()
+                        if content_type.startswith("image/") or "svg" in content_type:
+                            body = await response.read()
+                            self.stats.observe_size(route, len(body))
+                            return {"bytes": body, "content_type": content_type}
+                        if "json" in content_type or content_type.endswith("+json"):
+                            data = await response.json(loads=self.stats.loads(route))
+                        else:
+                            return None
+            with self.stats.measure(STAGE_PARSE):
+                parsed = image_from_virtual_train_payload(data)
+            if parsed and parsed.get("url") and not parsed.get("bytes"):
+                downloaded = await self._async_download_public_image(parsed["url"])
+                if downloaded:
+                    parsed.update(downloaded)
+            return parsed
         except ClientResponseError as err:
             if err.status in (401, 403):
                 _LOGGER.debug("Virtual Train API not available: %s", err.status)
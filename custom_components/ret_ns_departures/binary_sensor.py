@@ -10,9 +10,10 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .board_diff import SLICE_DISRUPTIONS
 from .const import (
+    ATTR_BOARD_URL,
     ATTR_DISRUPTION_BBOX,
     ATTR_DISRUPTION_CAUSE,
     ATTR_DISRUPTION_END,
@@ -31,16 +32,20 @@ from .const import (
     ATTR_GEOJSON,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
+    BOARD_VIEW_URL,
+    CONF_COMPACT_ATTRIBUTES,
     CONF_MONITOR_DISRUPTIONS,
     CONF_OPERATOR,
     CONF_STATION_NAME,
     CONF_STOP_NAME,
+    DEFAULT_COMPACT_ATTRIBUTES,
     DOMAIN,
     STOP_TYPE_NS,
     STOP_TYPE_RET,
 )
 from .coordinator import DeparturesCoordinator, RETNSConfigEntry
 from .disruption_info import disruption_name, primary_display_attributes
+from .entity import DeparturesEntity
 
 
 async def async_setup_entry(
@@ -70,14 +75,14 @@ async def async_setup_entry(
         )
 
 
-class StationDisruptionSensor(
-    CoordinatorEntity[DeparturesCoordinator], BinarySensorEntity
-):
+class StationDisruptionSensor(DeparturesEntity, BinarySensorEntity):
     """Binary sensor for station disruptions."""
 
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
     _attr_has_entity_name = True
     _attr_translation_key = "disruptions"
+    _board_slices = frozenset({SLICE_DISRUPTIONS})
+    _unrecorded_attributes = frozenset({ATTR_DISRUPTIONS, ATTR_GEOJSON})
 
     def __init__(
         self,
@@ -117,58 +122,30 @@ class StationDisruptionSensor(
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return more-info attributes, with what's wrong first."""
-        disruptions = self._get_disruptions()
-
-        formatted_disruptions = []
-        for disruption in disruptions:
-            formatted_disruption = {
-                ATTR_DISRUPTION_ID: disruption.get("id", ""),
-                ATTR_DISRUPTION_TITLE: disruption.get("title", ""),
-                ATTR_DISRUPTION_TYPE: disruption.get("type", ""),
-                ATTR_DISRUPTION_IMPACT: disruption.get("impact", 0),
-                ATTR_DISRUPTION_PHASE: disruption.get("phase", ""),
-                ATTR_DISRUPTION_CAUSE: disruption.get("cause", ""),
-            }
-
-            start_time = disruption.get("start")
-            if start_time:
-                formatted_disruption[ATTR_DISRUPTION_START] = start_time.isoformat()
-
-            end_time = disruption.get("end")
-            if end_time:
-                formatted_disruption[ATTR_DISRUPTION_END] = end_time.isoformat()
+        return self._cached_attributes()
 
-            formatted_disruption[ATTR_DISRUPTION_STATIONS] = disruption.get(
-                "stations", []
-            )
-
-            if "period" in disruption:
-                formatted_disruption["period"] = disruption["period"]
-            if "expected_duration" in disruption:
-                formatted_disruption["expected_duration"] = disruption[
-                    "expected_duration"
-                ]
-            if disruption.get("situation"):
-                formatted_disruption["situation"] = disruption["situation"]
-            if disruption.get("additional_travel_time"):
-                formatted_disruption["additional_travel_time"] = disruption[
-                    "additional_travel_time"
-                ]
-            if disruption.get("description"):
-                formatted_disruption["description"] = disruption["description"]
-
-            formatted_disruptions.append(
-                _with_storing_geo(formatted_disruption, disruption.get("geo"))
-            )
+    def _render_attributes(self) -> dict[str, Any]:
+        """Format every disruption and the map GeoJSON for this board."""
+        disruptions = self._get_disruptions()
+        formatted_disruptions = [
+            format_disruption(disruption) for disruption in disruptions
+        ]
 
         attributes: dict[str, Any] = {}
         attributes.update(primary_display_attributes(disruptions))
         attributes["count"] = len(formatted_disruptions)
         attributes["station_name"] = self._location_name
         attributes.update(_primary_storing_location(formatted_disruptions))
+        if self._config_entry.options.get(
+            CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+        ):
+            attributes[ATTR_BOARD_URL] = BOARD_VIEW_URL.format(
+                entry_id=self._config_entry.entry_id
+            )
+            return attributes
         if formatted_disruptions:
             attributes[ATTR_DISRUPTIONS] = formatted_disruptions
-        geojson = _storing_geojson(formatted_disruptions)
+        geojson = storing_geojson(formatted_disruptions)
         if geojson is not None:
             attributes[ATTR_GEOJSON] = geojson
         return attributes
@@ -180,6 +157,43 @@ class StationDisruptionSensor(
         return self.coordinator.data.get("disruptions", [])
 
 
+def format_disruption(disruption: dict[str, Any]) -> dict[str, Any]:
+    """Flatten one disruption for attributes and the board endpoint."""
+    formatted_disruption = {
+        ATTR_DISRUPTION_ID: disruption.get("id", ""),
+        ATTR_DISRUPTION_TITLE: disruption.get("title", ""),
+        ATTR_DISRUPTION_TYPE: disruption.get("type", ""),
+        ATTR_DISRUPTION_IMPACT: disruption.get("impact", 0),
+        ATTR_DISRUPTION_PHASE: disruption.get("phase", ""),
+        ATTR_DISRUPTION_CAUSE: disruption.get("cause", ""),
+    }
+
+    start_time = disruption.get("start")
+    if start_time:
+        formatted_disruption[ATTR_DISRUPTION_START] = start_time.isoformat()
+
+    end_time = disruption.get("end")
+    if end_time:
+        formatted_disruption[ATTR_DISRUPTION_END] = end_time.isoformat()
+
+    formatted_disruption[ATTR_DISRUPTION_STATIONS] = disruption.get("stations", [])
+
+    if "period" in disruption:
+        formatted_disruption["period"] = disruption["period"]
+    if "expected_duration" in disruption:
+        formatted_disruption["expected_duration"] = disruption["expected_duration"]
+    if disruption.get("situation"):
+        formatted_disruption["situation"] = disruption["situation"]
+    if disruption.get("additional_travel_time"):
+        formatted_disruption["additional_travel_time"] = disruption[
+            "additional_travel_time"
+        ]
+    if disruption.get("description"):
+        formatted_disruption["description"] = disruption["description"]
+
+    return _with_storing_geo(formatted_disruption, disruption.get("geo"))
+
+
 def _with_storing_geo(
     formatted: dict[str, Any], geo: dict[str, Any] | None
 ) -> dict[str, Any]:
@@ -213,7 +227,7 @@ def _primary_storing_location(disruptions: list[dict[str, Any]]) -> dict[str, An
     return {}
 
 
-def _storing_geojson(disruptions: list[dict[str, Any]]) -> dict[str, Any] | None:
+def storing_geojson(disruptions: list[dict[str, Any]]) -> dict[str, Any] | None:
     """Build a Point FeatureCollection from disruption centroids."""
     features: list[dict[str, Any]] = []
     for disruption in disruptions:
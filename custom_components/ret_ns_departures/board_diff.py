@@ -0,0 +1,126 @@
+"""Structural diff between two coordinator boards."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+SLICE_DEPARTURES = "departures"
+SLICE_NEXT_DEPARTURE = "next_departure"
+SLICE_DISRUPTIONS = "disruptions"
+SLICE_TRAIN_IMAGE = "train_image"
+SLICE_FRESHNESS = "freshness"
+
+ALL_SLICES: frozenset[str] = frozenset(
+    {
+        SLICE_DEPARTURES,
+        SLICE_NEXT_DEPARTURE,
+        SLICE_DISRUPTIONS,
+        SLICE_TRAIN_IMAGE,
+        SLICE_FRESHNESS,
+    }
+)
+
+_TRAIN_IMAGE_KEYS = (
+    "train_image_url",
+    "train_image_updated",
+    "train_image_content_type",
+    "train_composition",
+)
+
+DepartureKey = tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class BoardChanges:
+    """Which parts of the board changed since the previous update."""
+
+    slices: frozenset[str] = ALL_SLICES
+    added: tuple[DepartureKey, ...] = ()
+    removed: tuple[DepartureKey, ...] = ()
+    changed: tuple[DepartureKey, ...] = ()
+
+    def touches(self, slices: frozenset[str]) -> bool:
+        """Return True when any of ``slices`` changed."""
+        return not self.slices.isdisjoint(slices)
+
+    @property
+    def empty(self) -> bool:
+        """Return True when nothing on the board changed."""
+        return not self.slices
+
+
+def departure_key(departure: dict[str, Any]) -> DepartureKey:
+    """Identify one service across refreshes."""
+    return (
+        departure.get("trip_number") or departure.get("line") or "",
+        departure.get("destination") or "",
+        departure.get("scheduled_time"),
+    )
+
+
+def diff_boards(
+    previous: dict[str, Any] | None, current: dict[str, Any]
+) -> BoardChanges:
+    """Compare two boards; a missing previous board counts as all changed."""
+    if not previous:
+        keys = tuple(departure_key(dep) for dep in current.get("departures") or [])
+        return BoardChanges(added=keys)
+
+    slices: set[str] = set()
+    old = {departure_key(dep): dep for dep in previous.get("departures") or []}
+    new = {departure_key(dep): dep for dep in current.get("departures") or []}
+    added = tuple(key for key in new if key not in old)
+    removed = tuple(key for key in old if key not in new)
+    changed = tuple(
+        key
+        for key, dep in new.items()
+        if key in old and _departure_fingerprint(old[key]) != _departure_fingerprint(dep)
+    )
+    if added or removed or changed or list(old) != list(new):
+        slices.add(SLICE_DEPARTURES)
+
+    old_next = _next_departure(previous.get("departures") or [])
+    new_next = _next_departure(current.get("departures") or [])
+    if _departure_fingerprint(old_next) != _departure_fingerprint(new_next):
+        slices.add(SLICE_NEXT_DEPARTURE)
+
+    if (previous.get("disruptions") or []) != (current.get("disruptions") or []):
+        slices.add(SLICE_DISRUPTIONS)
+
+    if any(previous.get(key) != current.get(key) for key in _TRAIN_IMAGE_KEYS):
+        slices.add(SLICE_TRAIN_IMAGE)
+
+    # A stale board's data_age grows on every update, so keep writing it.
+    if previous.get("stale") or current.get("stale"):
+        slices.add(SLICE_FRESHNESS)
+
+    return BoardChanges(frozenset(slices), added, removed, changed)
+
+
+def _next_departure(departures: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """First departure that will actually run, as the sensors pick it."""
+    for dep in departures:
+        if not dep.get("cancelled") and dep.get("actual_time") is not None:
+            return dep
+    return None
+
+
+def _departure_fingerprint(departure: dict[str, Any] | None) -> tuple[Any, ...] | None:
+    """
+    Fields that matter for display, with times rounded to the minute.
+
+    RET only publishes whole minutes until departure, so its actual times
+    drift by seconds between refreshes without anything having changed.
+    """
+    if departure is None:
+        return None
+    return tuple(
+        (key, _to_minute(value) if isinstance(value, datetime) else value)
+        for key, value in sorted(departure.items())
+    )
+
+
+def _to_minute(value: datetime) -> datetime:
+    """Drop seconds and microseconds."""
+    return value.replace(second=0, microsecond=0)
@@ -22,19 +22,23 @@ from homeassistant.helpers.selector import (
 from .api_ns import NSAPIClient
 from .api_ret import RETAPIClient
 from .const import (
+    CONF_COMPACT_ATTRIBUTES,
     CONF_LINE_FILTER,
     CONF_LOCATION,
     CONF_MAX_DEPARTURES,
     CONF_MONITOR_DISRUPTIONS,
     CONF_NS_API_KEY,
     CONF_OPERATOR,
+    CONF_STALE_LIMIT,
     CONF_STATION,
     CONF_STATION_CODE,
     CONF_STATION_NAME,
     CONF_STATION_QUERY,
     CONF_STOP_ID,
     CONF_STOP_NAME,
+    DEFAULT_COMPACT_ATTRIBUTES,
     DEFAULT_MAX_DEPARTURES,
+    DEFAULT_STALE_LIMIT,
     DOMAIN,
     STOP_TYPE_NS,
     STOP_TYPE_RET,
@@ -343,6 +347,18 @@ class RETNSOptionsFlow(config_entries.OptionsFlow):
                     CONF_MAX_DEPARTURES, DEFAULT_MAX_DEPARTURES
                 ),
             ): cv.positive_int,
+            vol.Optional(
+                CONF_STALE_LIMIT,
+                default=self.config_entry.options.get(
+                    CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_COMPACT_ATTRIBUTES,
+                default=self.config_entry.options.get(
+                    CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+                ),
+            ): bool,
         }
 
         # Add RET-specific options
@@ -1,5 +1,6 @@
 """Constants for the RET & NS Departures integration."""
 from datetime import timedelta
+import os
 from typing import Final
 
 # Integration domain
@@ -18,6 +19,8 @@ CONF_STATION: Final = "station"
 CONF_MAX_DEPARTURES: Final = "max_departures"
 CONF_OPERATOR: Final = "operator"
 CONF_MONITOR_DISRUPTIONS: Final = "monitor_disruptions"
+CONF_STALE_LIMIT: Final = "stale_limit"
+CONF_COMPACT_ATTRIBUTES: Final = "compact_attributes"
 
 # Stop types
 STOP_TYPE_RET: Final = "ret"
@@ -29,13 +32,61 @@ OPERATOR_NS: Final = "NS"
 
 # Default values
 DEFAULT_SCAN_INTERVAL: Final = timedelta(seconds=30)
+# Refresh stages. Departures refresh on every hub tick; the others keep
+# their last output until their own cadence or trigger comes round.
+STAGE_DEPARTURES: Final = "departures"
+STAGE_DISRUPTIONS: Final = "disruptions"
+STAGE_DIVERSIONS: Final = "diversions"
+STAGE_GEO: Final = "geo"
+STAGE_IMAGE: Final = "image"
+# Timed-only stages (no cadence of their own)
+STAGE_REFRESH: Final = "refresh"
+STAGE_DIFF: Final = "diff"
+STAGE_RENDER: Final = "render"
+STAGE_DECODE: Final = "decode"
+STAGE_PARSE: Final = "parse"
+DISRUPTIONS_REFRESH_INTERVAL: Final = timedelta(seconds=120)
+# Departure-aligned refreshes: one extra poll shortly before the next
+# departure, or when a delayed train's expected time arrives. While one is
+# pending, the regular cadence relaxes to RELAXED_SCAN_INTERVAL.
+ALIGNED_REFRESH_LEAD: Final = timedelta(minutes=2)
+ALIGNED_REFRESH_MIN_GAP: Final = timedelta(seconds=20)
+RELAXED_SCAN_INTERVAL: Final = timedelta(seconds=60)
+# On-demand refreshes (refresh service, update_entity, get_departures) join
+# one in flight and are skipped within this gap after the last refresh.
+ON_DEMAND_REFRESH_MIN_GAP: Final = timedelta(seconds=15)
+# Boards refreshed at once on a shared hub tick (bounds open upstream requests).
+HUB_MAX_CONCURRENT_REFRESHES: Final = 8
 DEFAULT_MAX_DEPARTURES: Final = 5
 DEFAULT_STATION_RESULTS: Final = 20
+# Minutes to keep serving the last good board when the source is down.
+# 0 keeps the old behaviour: entities go unavailable on the first failure.
+DEFAULT_STALE_LIMIT: Final = 0
+# Compact attributes leave the departure list and disruption payloads out of
+# entity state; the full board is served by BOARD_VIEW_URL instead.
+DEFAULT_COMPACT_ATTRIBUTES: Final = False
+BOARD_VIEW_URL: Final = "/api/ret_ns_departures/board/{entry_id}"
+# Prometheus text exposition of request, cache and refresh statistics
+METRICS_VIEW_URL: Final = "/api/ret_ns_departures/metrics"
+# Small pre-rendered board (JSON or plain text) for e-ink displays, with
+# ETag revalidation; at most this many departures and cached renderings.
+DISPLAY_VIEW_URL: Final = "/api/ret_ns_departures/display/{entry_id}"
+DISPLAY_MAX_DEPARTURES: Final = 20
+DISPLAY_CACHE_SIZE: Final = 64
+# Websocket command streaming a board snapshot, then only what changed
+WS_SUBSCRIBE_BOARD: Final = "ret_ns_departures/subscribe_board"
 MIN_STATION_QUERY_LENGTH: Final = 2
 
-# API endpoints
-RET_BASE_URL: Final = "https://www.ret.nl/home/reizen/halte"
-RET_SITE_URL: Final = "https://www.ret.nl/"
+# API endpoints. The origins can be pointed at a local stand-in (see
+# tests/upstream_server.py) through the environment, for load and soak tests.
+RET_ORIGIN: Final = os.environ.get(
+    "RET_NS_DEPARTURES_RET_ORIGIN", "https://www.ret.nl"
+).rstrip("/")
+NS_ORIGIN: Final = os.environ.get(
+    "RET_NS_DEPARTURES_NS_ORIGIN", "https://gateway.apiportal.ns.nl"
+).rstrip("/")
+RET_BASE_URL: Final = f"{RET_ORIGIN}/home/reizen/halte"
+RET_SITE_URL: Final = f"{RET_ORIGIN}/"
 RET_SEARCH_TYPE: Final = "56895"
 RET_SEARCH_CATEGORY_HALTES: Final = "Haltes"
 
@@ -44,19 +95,15 @@ RET_SEARCH_CATEGORY_HALTES: Final = "Haltes"
 RET_STOP_ALIASES: Final = {
     "centraal-station": ("rotterdam-centraal",),
 }
-RET_DIVERSIONS_URL: Final = "https://www.ret.nl/home/reizen/omleidingen-verstoringen.html"
-RET_DIENSTREGELING_BASE_URL: Final = "https://www.ret.nl/home/reizen/dienstregeling"
+RET_DIVERSIONS_URL: Final = f"{RET_ORIGIN}/home/reizen/omleidingen-verstoringen.html"
+RET_DIENSTREGELING_BASE_URL: Final = f"{RET_ORIGIN}/home/reizen/dienstregeling"
 RET_DIVERSIONS_CACHE_SECONDS: Final = 900
-NS_API_BASE_URL: Final = "https://gateway.apiportal.ns.nl/reisinformatie-api/api/v2"
-NS_DISRUPTIONS_BASE_URL: Final = "https://gateway.apiportal.ns.nl/reisinformatie-api/api/v3"
-NS_DISRUPTIONS_API_BASE_URL: Final = "https://gateway.apiportal.ns.nl/disruptions/v3"
-NS_STATIONS_API_BASE_URL: Final = "https://gateway.apiportal.ns.nl/nsapp-stations/v2"
-NS_VIRTUAL_TRAIN_API_BASE_URL: Final = (
-    "https://gateway.apiportal.ns.nl/virtual-train-api/api/v1"
-)
-NS_SPOORKAART_API_BASE_URL: Final = (
-    "https://gateway.apiportal.ns.nl/Spoorkaart-API/api/v1"
-)
+NS_API_BASE_URL: Final = f"{NS_ORIGIN}/reisinformatie-api/api/v2"
+NS_DISRUPTIONS_BASE_URL: Final = f"{NS_ORIGIN}/reisinformatie-api/api/v3"
+NS_DISRUPTIONS_API_BASE_URL: Final = f"{NS_ORIGIN}/disruptions/v3"
+NS_STATIONS_API_BASE_URL: Final = f"{NS_ORIGIN}/nsapp-stations/v2"
+NS_VIRTUAL_TRAIN_API_BASE_URL: Final = f"{NS_ORIGIN}/virtual-train-api/api/v1"
+NS_SPOORKAART_API_BASE_URL: Final = f"{NS_ORIGIN}/Spoorkaart-API/api/v1"
 
 # Attribute keys
 ATTR_DEPARTURES: Final = "departures"
@@ -71,6 +118,9 @@ ATTR_STOP_NAME: Final = "stop_name"
 ATTR_TRAIN_TYPE: Final = "train_type"
 ATTR_TRIP_NUMBER: Final = "trip_number"
 ATTR_DESCRIPTION: Final = "description"
+ATTR_STALE: Final = "stale"
+ATTR_DATA_AGE: Final = "data_age"
+ATTR_BOARD_URL: Final = "board_url"
 
 # Disruption attributes
 ATTR_DISRUPTIONS: Final = "disruptions"
@@ -100,3 +150,24 @@ ATTR_OTHER_DISRUPTIONS: Final = "other_disruptions"
 
 # Timezone
 TIMEZONE: Final = "Europe/Amsterdam"
+# Distinct NS timestamps kept parsed (shared by departures and disruptions)
+TIME_PARSE_CACHE_SIZE: Final = 2048
+
+# Refresh instrumentation: synchronous sections at least this long are
+# flagged as blocking the event loop, and each histogram keeps this many
+# recent samples for percentiles in diagnostics.
+BLOCKING_THRESHOLD_MS: Final = 25.0
+STATS_RECENT_SAMPLES: Final = 50
+STATS_SLOW_SECTIONS: Final = 20
+
+# Services
+SERVICE_PROFILE_REFRESH: Final = "profile_refresh"
+SERVICE_GET_DEPARTURES: Final = "get_departures"
+SERVICE_REFRESH: Final = "refresh"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_WITHIN_MINUTES: Final = "within_minutes"
+ATTR_MAX_RESULTS: Final = "max_results"
+# get_departures refreshes first when the board is older than this (seconds)
+ATTR_MAX_AGE: Final = "max_age"
+# Functions listed in a profile_refresh summary
+PROFILE_TOP_FUNCTIONS: Final = 15
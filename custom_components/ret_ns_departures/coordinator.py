@@ -2,176 +2,401 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .api_disruptions import NSDisruptionsAPIClient
-from .api_ns import NSAPIClient
-from .api_ret import RETAPIClient
-from .api_spoorkaart import NSSpoorkaartClient
-from .api_virtual_train import NSVirtualTrainClient
+from .board_diff import BoardChanges, diff_boards
 from .const import (
+    ALIGNED_REFRESH_LEAD,
+    ALIGNED_REFRESH_MIN_GAP,
     CONF_LINE_FILTER,
     CONF_MAX_DEPARTURES,
     CONF_MONITOR_DISRUPTIONS,
     CONF_NS_API_KEY,
     CONF_OPERATOR,
+    CONF_STALE_LIMIT,
     CONF_STATION_CODE,
     CONF_STOP_ID,
     CONF_STOP_NAME,
     DEFAULT_MAX_DEPARTURES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_LIMIT,
+    DISRUPTIONS_REFRESH_INTERVAL,
     DOMAIN,
+    ON_DEMAND_REFRESH_MIN_GAP,
+    RELAXED_SCAN_INTERVAL,
+    STAGE_DEPARTURES,
+    STAGE_DIFF,
+    STAGE_DISRUPTIONS,
+    STAGE_DIVERSIONS,
+    STAGE_GEO,
+    STAGE_IMAGE,
+    STAGE_REFRESH,
     STOP_TYPE_NS,
     STOP_TYPE_RET,
 )
+from .hub import async_get_hub
+from .models import DisruptionDelta
+from .stats import StageStats
 
 _LOGGER = logging.getLogger(__name__)
 
+# Hub ticks land a little after the wall-clock second; don't let that push
+# a stage past its cadence by a whole tick.
+_STAGE_SLACK = timedelta(seconds=2)
 
-class DeparturesCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+
+class DeparturesCoordinator(DataUpdateCoordinator[dict[str, Any]]):  # pylint: disable=too-many-instance-attributes
     """Coordinator to manage fetching departure data."""
 
     def __init__(
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
-        update_interval: timedelta | None = None,
     ) -> None:
         """Initialize the coordinator."""
         config: dict[str, Any] = {**entry.data, **entry.options}
         self.config = config
         self.operator = config.get(CONF_OPERATOR)
 
-        # Initialize API clients
-        session = async_get_clientsession(hass)
+        # API clients come from the hub shared by every entry of this
+        # operator / API key; the hub also owns the poll schedule.
+        api_key = config.get(CONF_NS_API_KEY, "")
+        self.hub = async_get_hub(
+            hass, self.operator, api_key, async_get_clientsession(hass)
+        )
+        self.api_client = self.hub.api_client
 
         self.disruptions_client = None
         self.spoorkaart_client = None
         self.virtual_train_client = None
 
         if self.operator == STOP_TYPE_RET:
-            self.api_client = RETAPIClient(session)
             self.location_id = config.get(CONF_STOP_ID)
-        elif self.operator == STOP_TYPE_NS:
-            api_key = config.get(CONF_NS_API_KEY, "")
-            self.api_client = NSAPIClient(session, api_key)
-            self.location_id = config.get(CONF_STATION_CODE)
-            self.virtual_train_client = NSVirtualTrainClient(session, api_key)
-            # Initialize disruptions client if monitoring is enabled
-            monitor_disruptions = config.get(CONF_MONITOR_DISRUPTIONS, False)
-            if monitor_disruptions:
-                self.disruptions_client = NSDisruptionsAPIClient(session, api_key)
-                self.spoorkaart_client = NSSpoorkaartClient(session, api_key)
         else:
-            raise ValueError(f"Unknown operator: {self.operator}")
+            self.location_id = config.get(CONF_STATION_CODE)
+            self.virtual_train_client = self.hub.virtual_train_client
+            # Only use the disruptions clients if monitoring is enabled
+            if config.get(CONF_MONITOR_DISRUPTIONS, False):
+                self.disruptions_client = self.hub.disruptions_client
+                self.spoorkaart_client = self.hub.spoorkaart_client
 
         super().__init__(
             hass,
             _LOGGER,
             config_entry=entry,
             name=f"{DOMAIN}_{self.operator}_{self.location_id}",
-            update_interval=update_interval or DEFAULT_SCAN_INTERVAL,
+            # Scheduled refreshes come from the hub tick, not a per-entry timer.
+            update_interval=None,
         )
 
+        # Last successful run of each refresh stage, and the outputs that
+        # are carried over between runs of the slower stages.
+        self.stage_updated: dict[str, datetime] = {}
+        self._disruptions: list[dict[str, Any]] | None = None
+        # Ids added/removed/changed by the last disruptions poll
+        self.disruption_delta = DisruptionDelta()
+        self._image_key: tuple[str, str | None] | None = None
+        self._image: dict[str, Any] = {}
+
+        # Hub scheduling and departure-aligned one-off refreshes
+        self._started = False
+        self._last_refresh: datetime | None = None
+        self._refresh_requested_at: datetime | None = None
+        self._unsub_aligned: CALLBACK_TYPE | None = None
+        self.aligned_refresh_at: datetime | None = None
+        self._on_demand_refresh: asyncio.Task[None] | None = None
+
+        # What changed in the last update, so entities can skip no-op writes,
+        # and a counter stamped on every board so they can cache rendering.
+        self.changes = BoardChanges()
+        self._version = 0
+
+        # Per-stage durations and event loop blocking sections (diagnostics)
+        self.stats = StageStats(f"{self.operator} {self.location_id}")
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Join the hub's shared schedule; returns the callback that leaves it."""
+        unsub_hub = self.hub.async_subscribe(self)
+        self._started = True
+
+        @callback
+        def _stop() -> None:
+            self._started = False
+            self._cancel_aligned_refresh()
+            if self.disruptions_client is not None:
+                # The client is shared by the hub and outlives this board
+                self.disruptions_client.forget_scope(self.config_entry.entry_id)
+            unsub_hub()
+
+        return _stop
+
+    @property
+    def refresh_interval(self) -> timedelta:
+        """Regular cadence; relaxed while a departure-aligned refresh is pending."""
+        if self._unsub_aligned is not None:
+            return RELAXED_SCAN_INTERVAL
+        return DEFAULT_SCAN_INTERVAL
+
+    def refresh_due(self, now: datetime) -> bool:
+        """Return True when the hub tick at ``now`` should refresh this board."""
+        if self._last_refresh is None:
+            return True
+        return now - self._last_refresh >= self.refresh_interval - _STAGE_SLACK
+
+    @callback
+    def refresh_requested(self, at: datetime) -> None:
+        """Count the next refresh from ``at`` (a hub tick) rather than when it runs."""
+        self._refresh_requested_at = at
+
+    async def async_refresh_on_demand(
+        self, min_gap: timedelta = ON_DEMAND_REFRESH_MIN_GAP
+    ) -> bool:
+        """
+        Refresh for a caller outside the schedule; False when skipped.
+
+        Concurrent callers share one refresh, and a refresh that started
+        less than ``min_gap`` ago (scheduled or not) is reused instead of
+        polling again.
+        """
+        if self._on_demand_refresh is None:
+            if (
+                self._last_refresh is not None
+                and dt_util.utcnow() - self._last_refresh < min_gap
+            ):
+                return False
+            self._on_demand_refresh = self.hass.async_create_task(
+                self._async_run_on_demand_refresh()
+            )
+        # A cancelled caller must not cancel the refresh others are waiting on
+        await asyncio.shield(self._on_demand_refresh)
+        return True
+
+    async def _async_run_on_demand_refresh(self) -> None:
+        """Run the shared on-demand refresh and clear it when done."""
+        try:
+            await self.async_refresh()
+        finally:
+            self._on_demand_refresh = None
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API."""
         try:
-            max_departures = self.config.get(CONF_MAX_DEPARTURES, DEFAULT_MAX_DEPARTURES)
+            with self.stats.measure(STAGE_REFRESH, blocking=False):
+                result = await self._async_fetch_board()
+        except Exception as err:
+            stale = self._stale_board(err)
+            if stale is not None:
+                self.changes = diff_boards(self.data, stale)
+                return self._stamp_version(stale)
+            self.changes = BoardChanges(frozenset())
+            raise UpdateFailed(f"Error fetching departures: {err}") from err
+
+        with self.stats.measure(STAGE_DIFF):
+            self.changes = diff_boards(self.data, result)
+        self._schedule_aligned_refresh(result["departures"], result["last_update"])
+        return self._stamp_version(result)
+
+    def _stamp_version(self, board: dict[str, Any]) -> dict[str, Any]:
+        """Give each published board a new version number."""
+        self._version += 1
+        board["version"] = self._version
+        return board
+
+    @callback
+    def _schedule_aligned_refresh(
+        self, departures: list[dict[str, Any]], now: datetime
+    ) -> None:
+        """Schedule one extra refresh for the next moment the board should change."""
+        self._cancel_aligned_refresh()
+        if not self._started:
+            return
+        when = next_aligned_refresh(departures, now)
+        if when is None:
+            return
+        _LOGGER.debug("Aligned refresh for %s %s at %s", self.operator, self.location_id, when)
+        self.aligned_refresh_at = when
+        self._unsub_aligned = async_track_point_in_utc_time(
+            self.hass, self._async_handle_aligned_refresh, when
+        )
+
+    async def _async_handle_aligned_refresh(self, now: datetime) -> None:
+        """Run the departure-aligned refresh in a hub slot like a tick would."""
+        self._unsub_aligned = None
+        self.aligned_refresh_at = None
+        await self.hub.async_refresh(self, now)
 
-            if self.operator == STOP_TYPE_RET:
-                line_filter = self.config.get(CONF_LINE_FILTER)
-                # Convert comma-separated string to list if needed
-                if isinstance(line_filter, str) and line_filter:
-                    line_filter = [l.strip() for l in line_filter.split(",")]
-                elif not line_filter:
-                    line_filter = None
+    @callback
+    def _cancel_aligned_refresh(self) -> None:
+        """Drop a pending departure-aligned refresh."""
+        if self._unsub_aligned is not None:
+            self._unsub_aligned()
+            self._unsub_aligned = None
+        self.aligned_refresh_at = None
 
+    async def _async_fetch_board(self) -> dict[str, Any]:
+        """Fetch departures and enrichments for one refresh."""
+        now = dt_util.utcnow()
+        self._last_refresh = self._refresh_requested_at or now
+        self._refresh_requested_at = None
+        max_departures = self.config.get(CONF_MAX_DEPARTURES, DEFAULT_MAX_DEPARTURES)
+
+        if self.operator == STOP_TYPE_RET:
+            line_filter = self.config.get(CONF_LINE_FILTER)
+            # Convert comma-separated string to list if needed
+            if isinstance(line_filter, str) and line_filter:
+                line_filter = [l.strip() for l in line_filter.split(",")]
+            elif not line_filter:
+                line_filter = None
+
+            with self.stats.measure(STAGE_DEPARTURES, blocking=False):
                 departures = await self.api_client.async_get_departures(
                     self.location_id,
                     max_results=max_departures,
                     line_filter=line_filter,
                 )
-            elif self.operator == STOP_TYPE_NS:
+        elif self.operator == STOP_TYPE_NS:
+            with self.stats.measure(STAGE_DEPARTURES, blocking=False):
                 departures = await self.api_client.async_get_departures(
                     self.location_id,
                     max_results=max_departures,
                 )
-            else:
-                raise UpdateFailed(f"Unknown operator: {self.operator}")
-
-            _LOGGER.debug(
-                "Fetched %d departures for %s %s",
-                len(departures),
-                self.operator,
-                self.location_id,
-            )
+        else:
+            raise UpdateFailed(f"Unknown operator: {self.operator}")
 
-            result = {
-                "departures": departures,
-                "last_update": dt_util.utcnow(),
-            }
+        _LOGGER.debug(
+            "Fetched %d departures for %s %s",
+            len(departures),
+            self.operator,
+            self.location_id,
+        )
 
-            if self.operator == STOP_TYPE_RET and not departures:
-                await self._async_attach_ret_notice(result, line_filter)
+        self.stage_updated[STAGE_DEPARTURES] = now
+        result: dict[str, Any] = {
+            "departures": departures,
+            "last_update": now,
+        }
 
-            # Fetch disruptions if monitoring is enabled for NS
-            if self.disruptions_client and self.operator == STOP_TYPE_NS:
-                try:
-                    disruptions = await self.disruptions_client.async_get_station_disruptions(
-                        self.location_id
-                    )
-                    result["disruptions"] = disruptions
-                    _LOGGER.debug(
-                        "Fetched %d disruptions for %s %s",
-                        len(disruptions),
-                        self.operator,
-                        self.location_id,
-                    )
-                except Exception as err:
-                    _LOGGER.warning("Error fetching disruptions: %s", err)
-                    # Don't fail the entire update if disruptions fail
-                    result["disruptions"] = []
-                else:
-                    await self._async_attach_storing_geo(result["disruptions"])
+        if self.operator == STOP_TYPE_RET and not departures:
+            await self._async_attach_ret_notice(result, line_filter, now)
+
+        # Disruptions run on their own cadence when monitoring is enabled
+        if self.disruptions_client and self.operator == STOP_TYPE_NS:
+            await self._async_refresh_disruptions(now)
+            result["disruptions"] = self._disruptions or []
+
+        if self.virtual_train_client and self.operator == STOP_TYPE_NS:
+            await self._async_attach_train_image(result, departures, now)
 
-            if self.virtual_train_client and self.operator == STOP_TYPE_NS:
-                await self._async_attach_train_image(result, departures)
+        result["stage_updated"] = dict(self.stage_updated)
+        return result
 
-            return result
+    def _stage_due(self, stage: str, interval: timedelta, now: datetime) -> bool:
+        """Return True when a stage has never run or its cadence has passed."""
+        last = self.stage_updated.get(stage)
+        return last is None or now - last >= interval - _STAGE_SLACK
 
+    async def _async_refresh_disruptions(self, now: datetime) -> None:
+        """Refresh station disruptions every DISRUPTIONS_REFRESH_INTERVAL."""
+        if self._disruptions is not None and not self._stage_due(
+            STAGE_DISRUPTIONS, DISRUPTIONS_REFRESH_INTERVAL, now
+        ):
+            return
+        try:
+            with self.stats.measure(STAGE_DISRUPTIONS, blocking=False):
+                disruptions = await self.disruptions_client.async_get_station_disruptions(
+                    self.location_id, scope=self.config_entry.entry_id
+                )
         except Exception as err:
-            raise UpdateFailed(f"Error fetching departures: {err}") from err
+            _LOGGER.warning("Error fetching disruptions: %s", err)
+            # Don't fail the entire update; keep the last list and retry next tick
+            if self._disruptions is None:
+                self._disruptions = []
+            return
+
+        self.disruption_delta = self.disruptions_client.disruption_delta(
+            self.config_entry.entry_id
+        )
+        _LOGGER.debug(
+            "Fetched %d disruptions for %s %s (added %s, removed %s, changed %s)",
+            len(disruptions),
+            self.operator,
+            self.location_id,
+            sorted(self.disruption_delta.added),
+            sorted(self.disruption_delta.removed),
+            sorted(self.disruption_delta.changed),
+        )
+        self._disruptions = disruptions
+        self.stage_updated[STAGE_DISRUPTIONS] = now
+        # getStoring is cached per id, so only new disruption ids hit the API
+        with self.stats.measure(STAGE_GEO, blocking=False):
+            attached = await self._async_attach_storing_geo(disruptions)
+        if attached:
+            self.stage_updated[STAGE_GEO] = now
+
+    def _stale_board(self, err: Exception) -> dict[str, Any] | None:
+        """Keep serving the last good board while the source is briefly down."""
+        limit = self.config.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT)
+        previous = self.data
+        if not limit or not previous:
+            return None
+
+        now = dt_util.utcnow()
+        last_update = previous.get("last_update")
+        if last_update is None or now - last_update > timedelta(minutes=limit):
+            return None
+
+        log = _LOGGER.debug if previous.get("stale") else _LOGGER.warning
+        log(
+            "Error fetching departures for %s %s, keeping the board from %s: %s",
+            self.operator,
+            self.location_id,
+            last_update,
+            err,
+        )
+        return {
+            **previous,
+            "departures": prune_departed(previous.get("departures") or [], now),
+            "stale": True,
+        }
 
     async def _async_attach_ret_notice(
         self,
         result: dict[str, Any],
         line_filter: list[str] | None,
+        now: datetime,
     ) -> None:
         """Attach RET omleidingen text when a halt has no departures."""
         try:
-            notice = await self.api_client.async_get_service_notice(
-                self.location_id,
-                stop_name=self.config.get(CONF_STOP_NAME),
-                line_filter=line_filter,
-            )
+            with self.stats.measure(STAGE_DIVERSIONS, blocking=False):
+                notice = await self.api_client.async_get_service_notice(
+                    self.location_id,
+                    stop_name=self.config.get(CONF_STOP_NAME),
+                    line_filter=line_filter,
+                )
         except Exception as err:  # pylint: disable=broad-except
             _LOGGER.debug("RET service notice unavailable: %s", err)
             return
+        self.stage_updated[STAGE_DIVERSIONS] = now
         if notice:
             result["disruptions"] = [notice]
 
     async def _async_attach_train_image(
-        self, result: dict[str, Any], departures: list[dict[str, Any]]
+        self,
+        result: dict[str, Any],
+        departures: list[dict[str, Any]],
+        now: datetime,
     ) -> None:
-        """Attach a Virtual Train getImage result for the next service."""
+        """Attach a Virtual Train getImage result; refetch only on trip change."""
         next_departure = next(
             (
                 departure
@@ -185,39 +410,39 @@ class DeparturesCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         scheduled = next_departure.get("scheduled_time")
         date = scheduled.date().isoformat() if scheduled is not None else None
-        try:
-            image = await self.virtual_train_client.async_get_image(
-                str(next_departure["trip_number"]),
-                station=self.location_id,
-                date=date,
-            )
-        except Exception as err:  # pylint: disable=broad-except
-            _LOGGER.debug("Virtual train image unavailable: %s", err)
-            return
-        if not image:
-            return
+        key = (str(next_departure["trip_number"]), date)
+        if key != self._image_key:
+            try:
+                with self.stats.measure(STAGE_IMAGE, blocking=False):
+                    image = await self.virtual_train_client.async_get_image(
+                        key[0],
+                        station=self.location_id,
+                        date=date,
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Virtual train image unavailable: %s", err)
+                return
+            # Remember the trip even without an image so it isn't re-requested
+            self._image_key = key
+            self._image = _train_image_fields(image, now) if image else {}
+            self.stage_updated[STAGE_IMAGE] = now
 
-        result["train_image"] = image.get("bytes")
-        result["train_image_content_type"] = image.get("content_type")
-        result["train_image_url"] = image.get("url")
-        result["train_image_updated"] = dt_util.utcnow()
-        if image.get("composition"):
-            result["train_composition"] = image["composition"]
+        result.update(self._image)
 
     async def _async_attach_storing_geo(
         self, disruptions: list[dict[str, Any]]
-    ) -> None:
-        """Attach Spoorkaart getStoring map data to each disruption."""
+    ) -> bool:
+        """Attach Spoorkaart getStoring map data; False when the API is off."""
         client = self.spoorkaart_client
         if not client or client.disabled:
-            return
+            return False
 
         live_ids = {
             str(disruption["id"])
             for disruption in disruptions
             if disruption.get("id")
         }
-        client.prune_cache(live_ids)
+        client.prune_cache(live_ids, scope=str(self.location_id))
 
         async def _fetch(storing_id: str) -> tuple[str, dict[str, Any] | None]:
             try:
@@ -233,6 +458,58 @@ class DeparturesCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             geo = geo_by_id.get(storing_id)
             if geo:
                 disruption["geo"] = geo
+        return True
+
+
+def _train_image_fields(image: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """Coordinator data keys for one Virtual Train getImage result."""
+    fields: dict[str, Any] = {
+        "train_image": image.get("bytes"),
+        "train_image_content_type": image.get("content_type"),
+        "train_image_url": image.get("url"),
+        "train_image_updated": now,
+    }
+    if image.get("composition"):
+        fields["train_composition"] = image["composition"]
+    return fields
+
+
+def next_aligned_refresh(
+    departures: list[dict[str, Any]], now: datetime
+) -> datetime | None:
+    """
+    Pick the next moment a refresh is most useful.
+
+    That is ALIGNED_REFRESH_LEAD before the next departure that runs, or
+    the expected time of a delayed departure, whichever comes first and is
+    at least ALIGNED_REFRESH_MIN_GAP away.
+    """
+    earliest = now + ALIGNED_REFRESH_MIN_GAP
+    candidates: list[datetime] = []
+    lead_taken = False
+    for departure in departures:
+        actual = departure.get("actual_time")
+        if departure.get("cancelled") or actual is None:
+            continue
+        if not lead_taken:
+            lead_taken = True
+            candidates.append(actual - ALIGNED_REFRESH_LEAD)
+        if (departure.get("delay") or 0) > 0:
+            candidates.append(actual)
+    upcoming = [when for when in candidates if when >= earliest]
+    return min(upcoming, default=None)
+
+
+def prune_departed(
+    departures: list[dict[str, Any]], now: datetime
+) -> list[dict[str, Any]]:
+    """Drop departures whose (actual or scheduled) time has passed."""
+    remaining: list[dict[str, Any]] = []
+    for departure in departures:
+        when = departure.get("actual_time") or departure.get("scheduled_time")
+        if when is None or when >= now:
+            remaining.append(departure)
+    return remaining
 
 
 RETNSConfigEntry = ConfigEntry[DeparturesCoordinator]
@@ -0,0 +1,64 @@
+"""Diagnostics support for RET & NS Departures."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+
+from .api_ret import RETAPIClient
+from .const import CONF_NS_API_KEY
+from .coordinator import DeparturesCoordinator, RETNSConfigEntry
+from .time_parse import time_parse_cache_info
+
+TO_REDACT = {CONF_NS_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # pylint: disable=unused-argument
+    entry: RETNSConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    data = coordinator.data or {}
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "board": {
+            "version": data.get("version"),
+            "last_update": data.get("last_update"),
+            "stale": bool(data.get("stale")),
+            "departures": len(data.get("departures") or []),
+            "disruptions": len(data.get("disruptions") or []),
+            "stage_updated": data.get("stage_updated") or {},
+        },
+        "timings": coordinator.stats.as_dict(),
+        "upstream": _upstream(coordinator),
+        "time_parse_cache": time_parse_cache_info(),
+    }
+
+
+def _upstream(coordinator: DeparturesCoordinator) -> dict[str, Any]:
+    """Request, cache and timing stats of the API clients this board uses."""
+    clients = {
+        "departures": coordinator.api_client,
+        "disruptions": coordinator.disruptions_client,
+        "spoorkaart": coordinator.spoorkaart_client,
+        "virtual_train": coordinator.virtual_train_client,
+    }
+    upstream = {
+        role: client.stats.as_dict()
+        for role, client in clients.items()
+        if client is not None
+    }
+    if isinstance(coordinator.api_client, RETAPIClient):
+        upstream["departures"].update(coordinator.api_client.cache_info())
+    if coordinator.spoorkaart_client is not None:
+        upstream["spoorkaart"]["cache"] = coordinator.spoorkaart_client.cache_info()
+    if coordinator.virtual_train_client is not None:
+        upstream["virtual_train"]["endpoint_state"] = dict(
+            coordinator.virtual_train_client.endpoint_state
+        )
+    return upstream
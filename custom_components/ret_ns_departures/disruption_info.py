@@ -1,6 +1,7 @@
 """Human-readable presentation for NS disruptions."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from .const import (
@@ -123,7 +124,7 @@ def primary_display_attributes(disruptions: list[dict[str, Any]]) -> dict[str, A
     if dtype:
         attributes[ATTR_DISRUPTION_TYPE] = dtype
 
-    geo = primary.get("geo") if isinstance(primary.get("geo"), dict) else {}
+    geo = primary.get("geo") if isinstance(primary.get("geo"), Mapping) else {}
     level = _clean_text(geo.get("level") or primary.get("level"))
     if level:
         attributes[ATTR_DISRUPTION_LEVEL] = level
@@ -164,7 +165,7 @@ def _disruption_sort_key(disruption: dict[str, Any]) -> tuple[int, int]:
 
 
 def _level_label(disruption: dict[str, Any]) -> str:
-    geo = disruption.get("geo") if isinstance(disruption.get("geo"), dict) else {}
+    geo = disruption.get("geo") if isinstance(disruption.get("geo"), Mapping) else {}
     raw = _clean_text(geo.get("level") or disruption.get("level"))
     if not raw:
         return ""
@@ -0,0 +1,57 @@
+"""Base entity for RET & NS Departures."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .board_diff import ALL_SLICES
+from .const import STAGE_RENDER
+from .coordinator import DeparturesCoordinator
+
+
+class DeparturesEntity(CoordinatorEntity[DeparturesCoordinator]):
+    """Coordinator entity that only writes state when its part of the board changed."""
+
+    # Board slices (see board_diff) this entity's state and attributes read
+    _board_slices: frozenset[str] = ALL_SLICES
+    _written_available: bool | None = None
+    _rendered_version: int | None = None
+    _rendered_attributes: dict[str, Any] | None = None
+
+    async def async_update(self) -> None:
+        """Refresh through the coalescing path, so update_entity on several entities polls once."""
+        if not self.enabled:
+            return
+        await self.coordinator.async_refresh_on_demand()
+
+    def _board_changed(self) -> bool:
+        """Return True when the last update touched this entity's slices."""
+        return self.coordinator.changes.touches(self._board_slices)
+
+    def _render_attributes(self) -> dict[str, Any]:
+        """Build the attributes that only depend on the coordinator board."""
+        return {}
+
+    def _cached_attributes(self) -> dict[str, Any]:
+        """Render attributes once per board version; callers must not mutate them."""
+        version = (self.coordinator.data or {}).get("version")
+        if (
+            version is None
+            or version != self._rendered_version
+            or self._rendered_attributes is None
+        ):
+            with self.coordinator.stats.measure(STAGE_RENDER):
+                self._rendered_attributes = self._render_attributes()
+            self._rendered_version = version
+        return self._rendered_attributes
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write when nothing this entity shows has changed."""
+        available = self.available
+        if available == self._written_available and not self._board_changed():
+            return
+        self._written_available = available
+        super()._handle_coordinator_update()
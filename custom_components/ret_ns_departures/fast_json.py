@@ -0,0 +1,49 @@
+"""JSON decoding for the NS API clients, using orjson when it is installed."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - Home Assistant ships orjson
+    orjson = None
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Decode a JSON document (aiohttp ``loads`` callback)."""
+    if orjson is not None:
+        return orjson.loads(data)  # pylint: disable=no-member
+    return json.loads(data)
+
+
+def json_fingerprint(value: Any) -> int:
+    """Hash of a decoded JSON value, independent of key order."""
+    if orjson is not None:
+        # pylint: disable-next=no-member
+        return hash(orjson.dumps(value, option=orjson.OPT_SORT_KEYS))
+    return hash(json.dumps(value, sort_keys=True, default=str))
+
+
+def project(value: Any, shape: Any) -> Any:
+    """
+    Keep only the parts of ``value`` described by ``shape``.
+
+    ``shape`` is a dict of field name to sub-shape (``None`` keeps the
+    value as is), or a one-item list whose item is the shape of every
+    element. Values that do not match the shape are returned unchanged so
+    the parsers' own type checks still apply.
+    """
+    if shape is None:
+        return value
+    if isinstance(shape, list):
+        if not isinstance(value, list):
+            return value
+        return [project(item, shape[0]) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: project(value[key], sub_shape)
+        for key, sub_shape in shape.items()
+        if key in value
+    }
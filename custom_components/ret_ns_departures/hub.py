@@ -0,0 +1,189 @@
+"""Shared API clients and poll schedule for every entry of one operator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from hashlib import sha256
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_time_interval,
+    async_track_utc_time_change,
+)
+
+from .api_disruptions import NSDisruptionsAPIClient
+from .api_ns import NSAPIClient
+from .api_ret import RETAPIClient
+from .api_spoorkaart import NSSpoorkaartClient
+from .api_virtual_train import NSVirtualTrainClient
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    HUB_MAX_CONCURRENT_REFRESHES,
+    STOP_TYPE_NS,
+    STOP_TYPE_RET,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import DeparturesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HUBS = "hubs"
+
+
+class DeparturesHub:  # pylint: disable=too-many-instance-attributes
+    """
+    One set of upstream clients and one timer per operator / API key.
+
+    Coordinators subscribe instead of polling on their own, so all boards
+    refresh on the same aligned tick and share the clients' caches (RET
+    omleidingen, Spoorkaart getStoring) and in-flight requests.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        operator: str,
+        session: ClientSession,
+        api_key: str = "",
+    ) -> None:
+        """Initialize the hub and its clients."""
+        self.hass = hass
+        self.key = key
+        self.operator = operator
+        self.interval: timedelta = DEFAULT_SCAN_INTERVAL
+
+        self.disruptions_client: NSDisruptionsAPIClient | None = None
+        self.spoorkaart_client: NSSpoorkaartClient | None = None
+        self.virtual_train_client: NSVirtualTrainClient | None = None
+
+        if operator == STOP_TYPE_RET:
+            self.api_client: RETAPIClient | NSAPIClient = RETAPIClient(session)
+        elif operator == STOP_TYPE_NS:
+            self.api_client = NSAPIClient(session, api_key)
+            self.virtual_train_client = NSVirtualTrainClient(session, api_key)
+            self.disruptions_client = NSDisruptionsAPIClient(session, api_key)
+            self.spoorkaart_client = NSSpoorkaartClient(session, api_key)
+        else:
+            raise ValueError(f"Unknown operator: {operator}")
+
+        self._subscribers: list[DeparturesCoordinator] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._tick_running = False
+        self._semaphore = asyncio.Semaphore(HUB_MAX_CONCURRENT_REFRESHES)
+
+    @property
+    def subscribers(self) -> list[DeparturesCoordinator]:
+        """Coordinators currently polled by this hub."""
+        return list(self._subscribers)
+
+    @callback
+    def async_subscribe(self, coordinator: DeparturesCoordinator) -> CALLBACK_TYPE:
+        """Add a coordinator to the shared schedule; returns an unsubscribe."""
+        self._subscribers.append(coordinator)
+        if self._unsub_timer is None:
+            self._unsub_timer = self._async_track_ticks(self._async_handle_tick)
+
+        @callback
+        def _unsubscribe() -> None:
+            if coordinator in self._subscribers:
+                self._subscribers.remove(coordinator)
+            if not self._subscribers:
+                self._async_shutdown()
+
+        return _unsubscribe
+
+    @callback
+    def _async_track_ticks(
+        self, action: Callable[[datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Fire on wall-clock multiples of the interval when it divides a minute."""
+        seconds = int(self.interval.total_seconds())
+        if 0 < seconds <= 60 and 60 % seconds == 0:
+            return async_track_utc_time_change(
+                self.hass, action, second=list(range(0, 60, seconds))
+            )
+        return async_track_time_interval(self.hass, action, self.interval)
+
+    @callback
+    def _async_handle_tick(self, now: datetime) -> None:
+        """Start one batched refresh unless the previous one is still running."""
+        if self._tick_running:
+            _LOGGER.debug("Hub %s still refreshing, skipping tick at %s", self.key, now)
+            return
+        self._tick_running = True
+        self.hass.async_create_background_task(
+            self._async_refresh_all(now), f"{DOMAIN} hub {self.key} refresh"
+        )
+
+    async def _async_refresh_all(self, now: datetime) -> None:
+        """Refresh every subscribed board that is due, a few at a time."""
+        try:
+            await asyncio.gather(
+                *(
+                    self.async_refresh(coordinator, now)
+                    for coordinator in self.subscribers
+                    if coordinator.refresh_due(now)
+                )
+            )
+        finally:
+            self._tick_running = False
+
+    async def async_refresh(
+        self, coordinator: DeparturesCoordinator, requested_at: datetime
+    ) -> None:
+        """
+        Refresh one coordinator under the hub's concurrency limit.
+
+        The board's cadence counts from ``requested_at``, so time spent
+        waiting for a slot doesn't make it miss the next tick.
+        """
+        coordinator.refresh_requested(requested_at)
+        async with self._semaphore:
+            await coordinator.async_refresh()
+
+    @callback
+    def _async_shutdown(self) -> None:
+        """Stop the timer and forget this hub once no entry uses it."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        hubs: dict[str, DeparturesHub] = self.hass.data.get(DOMAIN, {}).get(
+            DATA_HUBS, {}
+        )
+        if hubs.get(self.key) is self:
+            del hubs[self.key]
+
+
+def hub_key(operator: str, api_key: str | None) -> str:
+    """Key hubs by operator, and for NS by a digest of the API key."""
+    if operator == STOP_TYPE_NS:
+        digest = sha256((api_key or "").encode()).hexdigest()[:12]
+        return f"{operator}_{digest}"
+    return str(operator)
+
+
+@callback
+def async_get_hub(
+    hass: HomeAssistant,
+    operator: str,
+    api_key: str | None,
+    session: ClientSession,
+) -> DeparturesHub:
+    """Return the shared hub for this operator / API key, creating it once."""
+    hubs: dict[str, DeparturesHub] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_HUBS, {}
+    )
+    key = hub_key(operator, api_key)
+    hub = hubs.get(key)
+    if hub is None:
+        hub = DeparturesHub(hass, key, operator, session, api_key or "")
+        hubs[key] = hub
+    return hub
@@ -8,10 +8,11 @@ from homeassistant.components.image import ImageEntity
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .board_diff import SLICE_TRAIN_IMAGE
 from .const import CONF_OPERATOR, CONF_STATION_NAME, DOMAIN, STOP_TYPE_NS
 from .coordinator import DeparturesCoordinator, RETNSConfigEntry
+from .entity import DeparturesEntity
 
 
 async def async_setup_entry(
@@ -30,13 +31,12 @@ async def async_setup_entry(
     )
 
 
-class NextTrainImageEntity(
-    CoordinatorEntity[DeparturesCoordinator], ImageEntity
-):
+class NextTrainImageEntity(DeparturesEntity, ImageEntity):
     """Image of the next departing train from the Virtual Train API."""
 
     _attr_has_entity_name = True
     _attr_translation_key = "next_train_image"
+    _board_slices = frozenset({SLICE_TRAIN_IMAGE})
 
     def __init__(
         self,
@@ -46,7 +46,7 @@ class NextTrainImageEntity(
         location_name: str,
     ) -> None:
         """Initialize the next-train image."""
-        CoordinatorEntity.__init__(self, coordinator)
+        DeparturesEntity.__init__(self, coordinator)
         ImageEntity.__init__(self, hass)
         self._config_entry = config_entry
         self._location_name = location_name
@@ -0,0 +1,130 @@
+"""Prometheus text exposition of the request, cache and refresh statistics."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from .stats import Histogram, StageStats, UpstreamStats
+from .time_parse import time_parse_cache_info
+
+if TYPE_CHECKING:
+    from .hub import DeparturesHub
+
+PREFIX = "ret_ns_departures"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_HELP = {
+    "upstream_requests_total": ("counter", "Upstream responses by endpoint and status code"),
+    "upstream_latency_seconds": ("histogram", "Upstream request latency"),
+    "upstream_payload_bytes": ("histogram", "Upstream response body size"),
+    "client_stage_seconds": ("histogram", "Decode and parse time per API client"),
+    "cache_lookups_total": ("counter", "Cache lookups by cache and result"),
+    "refresh_stage_seconds": ("histogram", "Refresh stage duration per board"),
+}
+
+
+# Client result caches, by client role
+_CACHES = {"departures": "omleidingen", "spoorkaart": "getstoring"}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class _Exposition:
+    """Samples grouped by metric family, rendered with one HELP/TYPE header each."""
+
+    def __init__(self) -> None:
+        self._samples: dict[str, list[str]] = {name: [] for name in _HELP}
+
+    def sample(self, family: str, labels: dict[str, str], value: float, suffix: str = "") -> None:
+        self._samples[family].append(
+            f"{PREFIX}_{family}{suffix}{{{_labels(labels)}}} {_number(value)}"
+        )
+
+    def histogram(
+        self, family: str, labels: dict[str, str], histogram: Histogram, scale: float = 1.0
+    ) -> None:
+        """Add a histogram; ``scale`` converts recorded units (ms) to exported ones."""
+        for bound, count in histogram.cumulative():
+            self.sample(family, {**labels, "le": _number(bound * scale)}, count, "_bucket")
+        self.sample(family, labels, histogram.total * scale, "_sum")
+        self.sample(family, labels, histogram.count, "_count")
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family, samples in self._samples.items():
+            if not samples:
+                continue
+            kind, description = _HELP[family]
+            lines.append(f"# HELP {PREFIX}_{family} {description}")
+            lines.append(f"# TYPE {PREFIX}_{family} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _add_client(out: _Exposition, hub: str, client: str, stats: UpstreamStats) -> None:
+    base = {"hub": hub, "client": client, "host": stats.name}
+    for (endpoint, status), count in sorted(stats.responses.items()):
+        out.sample("upstream_requests_total", {**base, "endpoint": endpoint, "status": status}, count)
+    for endpoint, histogram in stats.latency.items():
+        out.histogram("upstream_latency_seconds", {**base, "endpoint": endpoint}, histogram, 0.001)
+    for endpoint, histogram in stats.payload_bytes.items():
+        out.histogram("upstream_payload_bytes", {**base, "endpoint": endpoint}, histogram)
+    for stage, histogram in stats.stages.items():
+        out.histogram("client_stage_seconds", {**base, "stage": stage}, histogram, 0.001)
+    for result, count in sorted(stats.cache_lookups.items()):
+        out.sample(
+            "cache_lookups_total",
+            {"hub": hub, "cache": _CACHES.get(client, client), "result": result},
+            count,
+        )
+
+
+def _add_board(out: _Exposition, hub: str, board: str, stats: StageStats) -> None:
+    for stage, histogram in stats.stages.items():
+        out.histogram(
+            "refresh_stage_seconds",
+            {"hub": hub, "board": board, "stage": stage},
+            histogram,
+            0.001,
+        )
+
+
+def render_metrics(hubs: Iterable[DeparturesHub]) -> str:
+    """Exposition text for every hub, its API clients and its boards."""
+    out = _Exposition()
+    for hub in hubs:
+        clients = {
+            "departures": hub.api_client,
+            "disruptions": hub.disruptions_client,
+            "spoorkaart": hub.spoorkaart_client,
+            "virtual_train": hub.virtual_train_client,
+        }
+        for role, client in clients.items():
+            if client is not None:
+                _add_client(out, hub.key, role, client.stats)
+        for coordinator in hub.subscribers:
+            _add_board(
+                out, hub.key, f"{coordinator.operator} {coordinator.location_id}", coordinator.stats
+            )
+    time_parse = time_parse_cache_info()
+    for result, key in (("hit", "hits"), ("miss", "misses")):
+        out.sample(
+            "cache_lookups_total",
+            {"hub": "", "cache": "time_parse", "result": result},
+            time_parse[key],
+        )
+    return out.render()
@@ -0,0 +1,222 @@
+"""Slotted records for departures and disruptions shared by all API clients."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar
+
+from .const import (
+    ATTR_ACTUAL_TIME,
+    ATTR_DELAY,
+    ATTR_DESTINATION,
+    ATTR_LINE,
+    ATTR_OPERATOR,
+    ATTR_PLATFORM,
+    ATTR_SCHEDULED_TIME,
+    ATTR_TRAIN_TYPE,
+    ATTR_TRIP_NUMBER,
+)
+
+
+class _Unset:
+    """Marker for optional fields a source did not provide."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNSET"
+
+
+UNSET: Any = _Unset()
+
+
+class Record(Mapping[str, Any]):
+    """
+    Read-mostly mapping over a slotted dataclass.
+
+    Records behave like the dicts the clients used to return (``get``,
+    ``in``, ``[]`` and equality with plain dicts), so callers need no
+    changes. Fields left at UNSET are absent from the mapping, and only
+    known fields can be assigned.
+    """
+
+    __slots__ = ()
+    _names: ClassVar[tuple[str, ...]] = ()
+    _keys: ClassVar[frozenset[str]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._names = tuple(cls.__annotations__)
+        cls._keys = frozenset(cls._names)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._keys:
+            value = getattr(self, key)
+            if value is not UNSET:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._names:
+            if getattr(self, name) is not UNSET:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field value, or ``default`` when it is unknown or unset."""
+        if key not in self._keys:
+            return default
+        value = getattr(self, key)
+        return default if value is UNSET else value
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Plain dict copy, without the UNSET fields.
+
+        Home Assistant's JSON encoder never calls this: orjson serialises
+        the slotted dataclass itself and fails on UNSET. Records must go
+        through a ``format_*`` helper or ``as_dict()`` before they reach
+        state attributes, service responses or the websocket.
+        """
+        return dict(self.items())
+
+
+@dataclass(slots=True, eq=False)
+class Departure(Record):  # pylint: disable=too-many-instance-attributes
+    """One departure row from ret.nl or the NS departures API."""
+
+    line: str
+    operator: str
+    destination: str
+    platform: str
+    delay: int | None
+    scheduled_time: datetime
+    actual_time: datetime | None
+    train_type: str = UNSET
+    trip_number: str = UNSET
+    cancelled: bool = UNSET
+    departure_status: str = UNSET
+    transport_type: str = UNSET
+
+
+@dataclass(slots=True, eq=False)
+class StoringGeo(Record):  # pylint: disable=too-many-instance-attributes
+    """Compact Spoorkaart getStoring geometry for one disruption."""
+
+    id: str
+    station_codes: list[str]
+    level: str
+    map_type: str
+    geometry_type: str
+    feature_count: int
+    latitude: float = UNSET
+    longitude: float = UNSET
+    bbox: list[float] = UNSET
+
+
+@dataclass(slots=True, eq=False)
+class Disruption(Record):  # pylint: disable=too-many-instance-attributes
+    """One NS disruption or maintenance item."""
+
+    id: str
+    type: str
+    title: str
+    is_active: bool
+    start: datetime | None
+    end: datetime | None
+    phase: str
+    impact: int
+    stations: list[str]
+    cause: str
+    situation: str
+    additional_travel_time: str
+    description: str
+    period: str
+    expected_duration: str = UNSET
+    geo: StoringGeo = UNSET
+
+
+@dataclass(frozen=True, slots=True)
+class DisruptionDelta:
+    """Disruption ids added, removed and changed since the previous poll."""
+
+    added: frozenset[str] = frozenset()
+    removed: frozenset[str] = frozenset()
+    changed: frozenset[str] = frozenset()
+
+    @property
+    def empty(self) -> bool:
+        """True when the poll returned the same disruptions as before."""
+        return not (self.added or self.removed or self.changed)
+
+
+class DepartureAttributes(Mapping[str, Any]):
+    """
+    Attribute view of a Departure, without copying it into a new dict.
+
+    Times are rendered as ISO strings when read. The NS-only keys are
+    present only when the source set them.
+    """
+
+    __slots__ = ("_departure",)
+
+    _FIELDS: ClassVar[dict[str, str]] = {
+        ATTR_LINE: "line",
+        ATTR_OPERATOR: "operator",
+        ATTR_DESTINATION: "destination",
+        ATTR_PLATFORM: "platform",
+        ATTR_DELAY: "delay",
+        ATTR_SCHEDULED_TIME: "scheduled_time",
+        ATTR_ACTUAL_TIME: "actual_time",
+    }
+    _OPTIONAL: ClassVar[dict[str, str]] = {
+        ATTR_TRAIN_TYPE: "train_type",
+        ATTR_TRIP_NUMBER: "trip_number",
+        "cancelled": "cancelled",
+    }
+    _DEFAULTS: ClassVar[dict[str, Any]] = {
+        ATTR_LINE: "",
+        ATTR_OPERATOR: "",
+        ATTR_DESTINATION: "",
+        ATTR_PLATFORM: "",
+        ATTR_DELAY: 0,
+        ATTR_TRAIN_TYPE: "",
+        ATTR_TRIP_NUMBER: "",
+        "cancelled": False,
+    }
+
+    def __init__(self, departure: Mapping[str, Any]) -> None:
+        """Wrap a departure record (or a departure dict)."""
+        self._departure = departure
+
+    def __getitem__(self, key: str) -> Any:
+        source = self._FIELDS.get(key)
+        if source is None:
+            source = self._OPTIONAL.get(key)
+            if source is None or source not in self._departure:
+                raise KeyError(key)
+        value = self._departure.get(source, self._DEFAULTS.get(key))
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._FIELDS
+        for key, source in self._OPTIONAL.items():
+            if source in self._departure:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Plain dict copy, also used by Home Assistant's JSON encoder."""
+        return dict(self.items())
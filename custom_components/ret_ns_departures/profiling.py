@@ -0,0 +1,119 @@
+"""cProfile captures of one board's blocking sections, summarised by module."""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import cProfile
+from pathlib import PurePath
+import pstats
+from typing import Any
+
+from .const import PROFILE_TOP_FUNCTIONS
+
+_PACKAGE = PurePath(__file__).parent.name
+
+# The capture follows the refresh task (and tasks it starts) rather than
+# the event loop, so other boards and Home Assistant itself stay out of it.
+_CAPTURE: ContextVar[cProfile.Profile | None] = ContextVar(
+    f"{_PACKAGE}_profile_capture", default=None
+)
+
+
+@contextmanager
+def capture_sections(profiler: cProfile.Profile) -> Iterator[None]:
+    """Profile the blocking sections that run in this context until exit."""
+    token = _CAPTURE.set(profiler)
+    try:
+        yield
+    finally:
+        _CAPTURE.reset(token)
+
+
+@contextmanager
+def profile_section() -> Iterator[None]:
+    """
+    Run the block under the current capture, if there is one.
+
+    Only wraps sections that do not await, so nothing else the event loop
+    runs ends up in the profile. Nested sections share the outer one.
+    """
+    profiler = _CAPTURE.get()
+    if profiler is None:
+        yield
+        return
+    token = _CAPTURE.set(None)
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler took over since the capture started; skip this one
+        _CAPTURE.reset(token)
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _CAPTURE.reset(token)
+
+
+def module_group(filename: str) -> str:
+    """
+    Group a profiled file under a module or package name.
+
+    This integration's modules keep their own name (``api_ret``), installed
+    packages go under their top-level name (``bs4``, ``aiohttp``).
+    """
+    if filename == "~" or filename.startswith("<"):
+        return "builtins"
+    path = PurePath(filename)
+    if _PACKAGE in path.parts:
+        return path.stem
+    for marker in ("site-packages", "dist-packages"):
+        if marker in path.parts:
+            rest = path.parts[path.parts.index(marker) + 1 :]
+            return PurePath(rest[0]).stem if rest else "other"
+    for name in ("homeassistant", "asyncio"):
+        if name in path.parts:
+            return name
+    return "other"
+
+
+def profile_summary(stats: pstats.Stats) -> dict[str, Any]:
+    """
+    Own time per module group and the slowest functions.
+
+    ``own_ms`` is time spent in the group's functions themselves (cProfile
+    ``tottime``), so the groups add up to the profiled total.
+    """
+    groups: dict[str, dict[str, float]] = defaultdict(lambda: {"own_ms": 0.0, "calls": 0})
+    functions: list[tuple[float, float, int, str]] = []
+    total = 0.0
+    # pstats keeps (file, line, name) -> (primitive calls, calls, tottime, cumtime, callers)
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():  # type: ignore[attr-defined]
+        group = groups[module_group(filename)]
+        group["own_ms"] += own * 1000
+        group["calls"] += calls
+        total += own
+        functions.append((own, cumulative, calls, f"{module_group(filename)}:{name}:{line}"))
+
+    functions.sort(reverse=True)
+    return {
+        "total_ms": round(total * 1000, 2),
+        "modules": {
+            name: {"own_ms": round(group["own_ms"], 2), "calls": int(group["calls"])}
+            for name, group in sorted(
+                groups.items(), key=lambda item: item[1]["own_ms"], reverse=True
+            )
+        },
+        "functions": [
+            {
+                "function": label,
+                "own_ms": round(own * 1000, 2),
+                "cumulative_ms": round(cumulative * 1000, 2),
+                "calls": calls,
+            }
+            for own, cumulative, calls, label in functions[:PROFILE_TOP_FUNCTIONS]
+        ],
+    }
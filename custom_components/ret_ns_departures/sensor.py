@@ -1,6 +1,7 @@
 """Sensor platform for RET & NS Departures."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Any
 
@@ -10,30 +11,31 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 import homeassistant.util.dt as dt_util
 
+from .board_diff import (
+    SLICE_DISRUPTIONS,
+    SLICE_FRESHNESS,
+    SLICE_NEXT_DEPARTURE,
+)
 from .const import (
-    ATTR_ACTUAL_TIME,
-    ATTR_DELAY,
+    ATTR_BOARD_URL,
+    ATTR_DATA_AGE,
     ATTR_DEPARTURES,
     ATTR_DESCRIPTION,
     ATTR_DISRUPTIONS,
-    ATTR_DESTINATION,
-    ATTR_LINE,
     ATTR_MESSAGE,
-    ATTR_OPERATOR,
-    ATTR_PLATFORM,
-    ATTR_SCHEDULED_TIME,
+    ATTR_STALE,
     ATTR_STOP_NAME,
-    ATTR_TRAIN_TYPE,
-    ATTR_TRIP_NUMBER,
+    BOARD_VIEW_URL,
+    CONF_COMPACT_ATTRIBUTES,
     CONF_OPERATOR,
     CONF_STATION_NAME,
     CONF_STOP_NAME,
+    DEFAULT_COMPACT_ATTRIBUTES,
     DOMAIN,
     STOP_TYPE_NS,
     STOP_TYPE_RET,
@@ -45,6 +47,8 @@ from .disruption_info import (
     primary_disruption,
     sort_disruptions,
 )
+from .entity import DeparturesEntity
+from .models import DepartureAttributes
 
 
 async def async_setup_entry(
@@ -72,33 +76,12 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-def _format_departure(dep: dict[str, Any]) -> dict[str, Any]:
-    """Format a departure dict for entity attributes."""
-    actual_time = dep.get("actual_time")
-    scheduled_time = dep.get("scheduled_time")
-
-    formatted = {
-        ATTR_LINE: dep.get("line", ""),
-        ATTR_OPERATOR: dep.get("operator", ""),
-        ATTR_DESTINATION: dep.get("destination", ""),
-        ATTR_PLATFORM: dep.get("platform", ""),
-        ATTR_DELAY: dep.get("delay", 0),
-        ATTR_SCHEDULED_TIME: scheduled_time.isoformat() if scheduled_time else None,
-        ATTR_ACTUAL_TIME: actual_time.isoformat() if actual_time else None,
-    }
-
-    # Add NS-specific attributes
-    if "train_type" in dep:
-        formatted[ATTR_TRAIN_TYPE] = dep.get("train_type", "")
-    if "trip_number" in dep:
-        formatted[ATTR_TRIP_NUMBER] = dep.get("trip_number", "")
-    if "cancelled" in dep:
-        formatted["cancelled"] = dep.get("cancelled", False)
-
-    return formatted
+def format_departure(dep: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Attribute view of a departure (times as ISO strings, NS fields when set)."""
+    return DepartureAttributes(dep)
 
 
-class DepartureSensorBase(CoordinatorEntity[DeparturesCoordinator], SensorEntity):
+class DepartureSensorBase(DeparturesEntity, SensorEntity):
     """Base class for departure sensors."""
 
     _attr_has_entity_name = True
@@ -140,6 +123,13 @@ class DepartureSensorBase(CoordinatorEntity[DeparturesCoordinator], SensorEntity
                 return dep
         return None
 
+    @property
+    def _compact(self) -> bool:
+        """Return True when the full board is left to the board endpoint."""
+        return self._config_entry.options.get(
+            CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+        )
+
     @property
     def _is_dutch(self) -> bool:
         """Return True when Home Assistant is set to Dutch."""
@@ -156,6 +146,19 @@ class DepartureSensorBase(CoordinatorEntity[DeparturesCoordinator], SensorEntity
             return []
         return self.coordinator.data.get("disruptions") or []
 
+    def _freshness_attributes(self) -> dict[str, Any]:
+        """Flag a board kept from before an upstream outage."""
+        data = self.coordinator.data or {}
+        if not data.get("stale"):
+            return {ATTR_STALE: False}
+        attributes: dict[str, Any] = {ATTR_STALE: True}
+        last_update = data.get("last_update")
+        if last_update is not None:
+            attributes[ATTR_DATA_AGE] = int(
+                (dt_util.utcnow() - last_update).total_seconds()
+            )
+        return attributes
+
     @property
     def _next_departure_description(self) -> str | None:
         """Human-readable next service, e.g. 'IC 2834 to Utrecht'."""
@@ -175,6 +178,8 @@ class NextDepartureSensor(DepartureSensorBase):
     _sensor_type = "next_departure"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_translation_key = "next_departure"
+    # The full list is still in state attributes, just not in the recorder.
+    _unrecorded_attributes = frozenset({ATTR_DEPARTURES})
 
     @property
     def name(self) -> str | None:
@@ -202,6 +207,10 @@ class NextDepartureSensor(DepartureSensorBase):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
+        return {**self._cached_attributes(), **self._freshness_attributes()}
+
+    def _render_attributes(self) -> dict[str, Any]:
+        """Departure list, next service and disruption summary for this board."""
         departures = self._departures
         next_departure = self._next_departure
 
@@ -217,11 +226,16 @@ class NextDepartureSensor(DepartureSensorBase):
             ]
             attributes["disruption_count"] = len(disruptions)
 
-        attributes[ATTR_DEPARTURES] = [_format_departure(dep) for dep in departures]
+        if self._compact:
+            attributes[ATTR_BOARD_URL] = BOARD_VIEW_URL.format(
+                entry_id=self._config_entry.entry_id
+            )
+        else:
+            attributes[ATTR_DEPARTURES] = [format_departure(dep) for dep in departures]
         attributes[ATTR_STOP_NAME] = self._location_name
 
         if next_departure is not None:
-            attributes.update(_format_departure(next_departure))
+            attributes.update(format_departure(next_departure))
             description = self._next_departure_description
             if description:
                 attributes[ATTR_DESCRIPTION] = description
@@ -244,7 +258,6 @@ class NextDepartureSensor(DepartureSensorBase):
                 attributes["train_length"] = composition["lengte"]
         if image_url:
             attributes["train_image"] = image_url
-
         return attributes
 
     @property
@@ -272,6 +285,18 @@ class TimeToNextDepartureSensor(DepartureSensorBase):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
     _attr_translation_key = "time_to_next_departure"
+    _board_slices = frozenset({SLICE_NEXT_DEPARTURE, SLICE_DISRUPTIONS, SLICE_FRESHNESS})
+    _written_value: int | None = None
+
+    def _board_changed(self) -> bool:
+        """Also write when the minute count ticks over on an unchanged board."""
+        return super()._board_changed() or self.native_value != self._written_value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Remember the minute count that was written."""
+        super()._handle_coordinator_update()
+        self._written_value = self.native_value
 
     @property
     def native_value(self) -> int | None:
@@ -289,12 +314,16 @@ class TimeToNextDepartureSensor(DepartureSensorBase):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
+        return {**self._cached_attributes(), **self._freshness_attributes()}
+
+    def _render_attributes(self) -> dict[str, Any]:
+        """Next service, or the notice explaining why there is none."""
         next_departure = self._next_departure
 
         attributes: dict[str, Any] = {ATTR_STOP_NAME: self._location_name}
 
         if next_departure is not None:
-            attributes.update(_format_departure(next_departure))
+            attributes.update(format_departure(next_departure))
             description = self._next_departure_description
             if description:
                 attributes[ATTR_DESCRIPTION] = description
@@ -307,7 +336,6 @@ class TimeToNextDepartureSensor(DepartureSensorBase):
                 attributes["replacement_stops"] = notice["replacement_stops"]
             if notice and notice.get("url"):
                 attributes["source_url"] = notice["url"]
-
         return attributes
 
 
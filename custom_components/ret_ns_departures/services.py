@@ -0,0 +1,240 @@
+"""Services for RET & NS Departures."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+import cProfile
+from datetime import datetime, timedelta
+import logging
+import pstats
+from time import perf_counter
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DESTINATION,
+    ATTR_LINE,
+    ATTR_MAX_AGE,
+    ATTR_MAX_RESULTS,
+    ATTR_WITHIN_MINUTES,
+    DOMAIN,
+    ON_DEMAND_REFRESH_MIN_GAP,
+    SERVICE_GET_DEPARTURES,
+    SERVICE_PROFILE_REFRESH,
+    SERVICE_REFRESH,
+)
+from .coordinator import DeparturesCoordinator, prune_departed
+from .models import DepartureAttributes
+from .profiling import capture_sections, profile_summary
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_REFRESH_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+REFRESH_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_CONFIG_ENTRY_ID, ATTR_ENTITY_ID),
+)
+GET_DEPARTURES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_LINE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DESTINATION): cv.string,
+        vol.Optional(ATTR_WITHIN_MINUTES): cv.positive_int,
+        vol.Optional(ATTR_MAX_RESULTS): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+        vol.Optional(ATTR_MAX_AGE): cv.positive_int,
+    }
+)
+
+
+def _coordinator(hass: HomeAssistant, entry_id: str) -> DeparturesCoordinator:
+    """Return the coordinator of a loaded entry of this integration."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    coordinator = getattr(entry, "runtime_data", None)
+    if entry is None or entry.domain != DOMAIN or coordinator is None:
+        raise ServiceValidationError(f"{entry_id} is not a loaded {DOMAIN} entry")
+    return coordinator
+
+
+def _entry_ids(hass: HomeAssistant, call: ServiceCall) -> list[str]:
+    """Config entry ids named directly or through their entities, without duplicates."""
+    entry_ids = list(call.data.get(ATTR_CONFIG_ENTRY_ID, []))
+    registry = er.async_get(hass)
+    for entity_id in call.data.get(ATTR_ENTITY_ID, []):
+        registry_entry = registry.async_get(entity_id)
+        if registry_entry is None or registry_entry.platform != DOMAIN:
+            raise ServiceValidationError(f"{entity_id} is not a {DOMAIN} entity")
+        entry_ids.append(str(registry_entry.config_entry_id))
+    return list(dict.fromkeys(entry_ids))
+
+
+def _line_matches(line: str, wanted: set[str]) -> bool:
+    """Match "8" against both "8" and "Tram 8", ignoring case."""
+    line = line.strip().lower()
+    return line in wanted or (bool(line) and line.split()[-1] in wanted)
+
+
+def filter_departures(  # pylint: disable=too-many-arguments
+    departures: list[Mapping[str, Any]],
+    now: datetime,
+    *,
+    lines: list[str] | None = None,
+    destination: str | None = None,
+    within: timedelta | None = None,
+    max_results: int | None = None,
+) -> list[Mapping[str, Any]]:
+    """Departures still to come that pass the line, destination and time filters."""
+    wanted = {line.strip().lower() for line in lines} if lines else None
+    needle = destination.strip().lower() if destination else None
+    until = now + within if within is not None else None
+    matches: list[Mapping[str, Any]] = []
+    for departure in prune_departed(departures, now):
+        if wanted is not None and not _line_matches(str(departure.get("line") or ""), wanted):
+            continue
+        if needle and needle not in str(departure.get("destination") or "").lower():
+            continue
+        if until is not None:
+            when = departure.get("actual_time") or departure.get("scheduled_time")
+            if when is None or when > until:
+                continue
+        matches.append(departure)
+        if max_results is not None and len(matches) >= max_results:
+            break
+    return matches
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def _async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """
+        Profile one refresh and write the stats to the config dir.
+
+        Only the board's parse, decode, diff and render sections are
+        profiled; they run without awaiting, so whatever else the event loop
+        runs during the refresh (other boards, Home Assistant) is left out.
+        """
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        coordinator = _coordinator(hass, entry_id)
+        profiler = cProfile.Profile()
+        try:
+            # Fails when another profiler (e.g. the profiler integration)
+            # is running; also means the stats are never empty
+            profiler.enable()
+            profiler.disable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot start the profiler: {err}") from err
+        started = perf_counter()
+        with capture_sections(profiler):
+            await coordinator.async_refresh()
+        elapsed_ms = (perf_counter() - started) * 1000
+
+        stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = hass.config.path(f"{DOMAIN}_profile_{entry_id}_{stamp}.prof")
+        await hass.async_add_executor_job(profiler.dump_stats, path)
+        summary: dict[str, Any] = {
+            "path": path,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "success": coordinator.last_update_success,
+            # total_ms and the groups cover these sections, not elapsed_ms
+            "scope": "blocking_sections",
+            **profile_summary(pstats.Stats(profiler)),
+        }
+        _LOGGER.info(
+            "Profiled refresh of %s %s in %.1f ms (%.1f ms in blocking sections), "
+            "written to %s; own time by module: %s",
+            coordinator.operator,
+            coordinator.location_id,
+            elapsed_ms,
+            summary["total_ms"],
+            path,
+            ", ".join(
+                f"{name} {group['own_ms']:.1f} ms"
+                for name, group in summary["modules"].items()
+            ),
+        )
+        return summary
+
+    async def _async_get_departures(call: ServiceCall) -> ServiceResponse:
+        """Answer from the coordinator's board; refresh only when it is too old."""
+        coordinator = _coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        now = dt_util.utcnow()
+        refreshed = False
+        max_age = call.data.get(ATTR_MAX_AGE)
+        if max_age is not None:
+            max_age_delta = timedelta(seconds=max_age)
+            last_update = (coordinator.data or {}).get("last_update")
+            if last_update is None or now - last_update > max_age_delta:
+                # A max_age below the usual on-demand gap still gets its refresh
+                refreshed = await coordinator.async_refresh_on_demand(
+                    min(ON_DEMAND_REFRESH_MIN_GAP, max_age_delta)
+                )
+                now = dt_util.utcnow()
+
+        board = coordinator.data or {}
+        within = call.data.get(ATTR_WITHIN_MINUTES)
+        departures = filter_departures(
+            board.get("departures") or [],
+            now,
+            lines=call.data.get(ATTR_LINE),
+            destination=call.data.get(ATTR_DESTINATION),
+            within=timedelta(minutes=within) if within is not None else None,
+            max_results=call.data.get(ATTR_MAX_RESULTS),
+        )
+        last_update = board.get("last_update")
+        return {
+            "departures": [DepartureAttributes(dep).as_dict() for dep in departures],
+            "last_update": last_update.isoformat() if last_update else None,
+            "age_seconds": round((now - last_update).total_seconds(), 1) if last_update else None,
+            "stale": bool(board.get("stale")),
+            "refreshed": refreshed,
+        }
+
+    async def _async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Refresh each named board once, sharing refreshes already in flight."""
+        coordinators = {
+            entry_id: _coordinator(hass, entry_id) for entry_id in _entry_ids(hass, call)
+        }
+        results = await asyncio.gather(
+            *(coordinator.async_refresh_on_demand() for coordinator in coordinators.values())
+        )
+        refreshed = dict(zip(coordinators, results))
+        return {
+            "refreshed": [entry_id for entry_id, done in refreshed.items() if done],
+            "skipped": [entry_id for entry_id, done in refreshed.items() if not done],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DEPARTURES,
+        _async_get_departures,
+        schema=GET_DEPARTURES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        _async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
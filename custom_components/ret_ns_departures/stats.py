@@ -0,0 +1,229 @@
+"""Cheap refresh timing, event loop blocking detection and upstream request counters."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+import logging
+from time import perf_counter
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BLOCKING_THRESHOLD_MS,
+    STAGE_DECODE,
+    STATS_RECENT_SAMPLES,
+    STATS_SLOW_SECTIONS,
+)
+from .fast_json import json_loads
+from .profiling import profile_section
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+SIZE_BUCKETS_BYTES: tuple[float, ...] = (
+    1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+
+
+class Histogram:
+    """Bucket counts for the lifetime of the entry plus the last few samples."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "recent")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        """Start empty."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.recent: deque[float] = deque(maxlen=STATS_RECENT_SAMPLES)
+
+    def observe(self, value: float) -> None:
+        """Add one sample."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, samples at or below it) pairs, ending with +Inf."""
+        pairs: list[tuple[float, int]] = []
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def summary(self) -> dict[str, Any]:
+        """Count, mean and percentiles of the recent samples."""
+        recent = sorted(self.recent)
+        if not recent:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2),
+            "p50": round(recent[len(recent) // 2], 2),
+            "p95": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 2),
+            "max": round(recent[-1], 2),
+            "last": [round(value, 2) for value in list(self.recent)[-10:]],
+        }
+
+
+class StageStats:
+    """Per-stage duration histograms and a log of event loop blocking sections."""
+
+    def __init__(self, name: str) -> None:
+        """``name`` labels the debug log lines (a board or an upstream host)."""
+        self.name = name
+        self.stages: dict[str, Histogram] = {}
+        self.slow_sections: deque[dict[str, Any]] = deque(maxlen=STATS_SLOW_SECTIONS)
+
+    def observe(self, stage: str, milliseconds: float) -> None:
+        """Record one duration for ``stage``."""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        histogram.observe(milliseconds)
+
+    @contextmanager
+    def measure(self, stage: str, *, blocking: bool = True) -> Iterator[None]:
+        """
+        Time the block as ``stage``.
+
+        ``blocking`` sections run without awaiting, so anything longer than
+        BLOCKING_THRESHOLD_MS held up the event loop and is flagged. They are
+        also what a profile_refresh capture records.
+        """
+        section = profile_section() if blocking else nullcontext()
+        start = perf_counter()
+        try:
+            with section:
+                yield
+        finally:
+            milliseconds = (perf_counter() - start) * 1000
+            self.observe(stage, milliseconds)
+            if blocking and milliseconds >= BLOCKING_THRESHOLD_MS:
+                self.slow_sections.append(
+                    {
+                        "stage": stage,
+                        "ms": round(milliseconds, 1),
+                        "at": dt_util.utcnow().isoformat(),
+                    }
+                )
+                _LOGGER.debug(
+                    "%s %s blocked the event loop for %.1f ms",
+                    self.name,
+                    stage,
+                    milliseconds,
+                )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summaries for diagnostics."""
+        return {
+            "stages": {stage: hist.summary() for stage, hist in self.stages.items()},
+            "slow_sections": list(self.slow_sections),
+        }
+
+
+class RequestRecord:
+    """What a client learned about one upstream request."""
+
+    __slots__ = ("status",)
+
+    def __init__(self) -> None:
+        """No response yet."""
+        self.status: int | None = None
+
+
+class UpstreamStats(StageStats):
+    """Request counts, latency, payload sizes and stage timings of one API client."""
+
+    def __init__(self, host: str) -> None:
+        """Count requests to ``host``."""
+        super().__init__(host)
+        self.responses: Counter[tuple[str, str]] = Counter()
+        self.latency: dict[str, Histogram] = {}
+        self.payload_bytes: dict[str, Histogram] = {}
+        # Lookups in the client's own result cache, if it has one
+        self.cache_lookups: Counter[str] = Counter()
+
+    @contextmanager
+    def request(self, endpoint: str) -> Iterator[RequestRecord]:
+        """
+        Time one request to ``endpoint``.
+
+        Set ``status`` on the yielded record once the response arrives;
+        requests that raise before that (timeouts, connection errors) are
+        counted as ``error``.
+        """
+        record = RequestRecord()
+        start = perf_counter()
+        try:
+            yield record
+        finally:
+            milliseconds = (perf_counter() - start) * 1000
+            status = str(record.status) if record.status is not None else "error"
+            self.responses[(endpoint, status)] += 1
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram()
+            histogram.observe(milliseconds)
+
+    def observe_size(self, endpoint: str, size: int) -> None:
+        """Record the body size of one response."""
+        histogram = self.payload_bytes.get(endpoint)
+        if histogram is None:
+            histogram = self.payload_bytes[endpoint] = Histogram(SIZE_BUCKETS_BYTES)
+        histogram.observe(size)
+
+    def loads(self, endpoint: str) -> Callable[[str], Any]:
+        """Decoder for ``response.json`` that records payload size and decode time."""
+
+        def _loads(data: str) -> Any:
+            self.observe_size(endpoint, len(data))
+            with self.measure(STAGE_DECODE):
+                return json_loads(data)
+
+        return _loads
+
+    def cache_lookup(self, hit: bool) -> None:
+        """Count one lookup in the client's result cache."""
+        self.cache_lookups["hit" if hit else "miss"] += 1
+
+    def cache_info(self) -> dict[str, Any]:
+        """Hit/miss counters of the client's result cache."""
+        hits = self.cache_lookups["hit"]
+        misses = self.cache_lookups["miss"]
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else None,
+        }
+
+    def count(self, status: str) -> int:
+        """Responses with ``status`` across all endpoints."""
+        return sum(n for (_, code), n in self.responses.items() if code == status)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summaries for diagnostics."""
+        return {
+            "host": self.name,
+            "requests": sum(self.responses.values()),
+            "responses": {
+                f"{endpoint} {status}": count
+                for (endpoint, status), count in sorted(self.responses.items())
+            },
+            "rate_limited": self.count("429"),
+            "latency_ms": {name: hist.summary() for name, hist in self.latency.items()},
+            "payload_bytes": {
+                name: hist.summary() for name, hist in self.payload_bytes.items()
+            },
+            **super().as_dict(),
+        }
@@ -0,0 +1,45 @@
+"""Cached ISO timestamp parsing for the NS API clients."""
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .const import TIME_PARSE_CACHE_SIZE, TIMEZONE
+
+_TZ = ZoneInfo(TIMEZONE)
+
+
+def parse_ns_time(value: str) -> datetime:
+    """
+    Parse an NS timestamp into an aware Europe/Amsterdam datetime.
+
+    Raises ValueError for anything that is not an ISO 8601 string, like
+    datetime.fromisoformat does.
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    return _parse_cached(value)
+
+
+@lru_cache(maxsize=TIME_PARSE_CACHE_SIZE)
+def _parse_cached(value: str) -> datetime:
+    """Parse once per distinct string; boards repeat most times every poll."""
+    if value.endswith(("+0100", "+0200")):
+        # NS local times: fromisoformat reads the basic-format offset as is
+        return datetime.fromisoformat(value).astimezone(_TZ)
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(_TZ)
+
+
+def time_parse_cache_info() -> dict[str, Any]:
+    """Hit/miss counters for diagnostics."""
+    info = _parse_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_ratio": round(info.hits / lookups, 3) if lookups else None,
+    }
@@ -0,0 +1,262 @@
+"""HTTP endpoints: the full and display boards of one entry, and Prometheus metrics."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from email.utils import format_datetime
+from hashlib import blake2b
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from homeassistant.const import CONTENT_TYPE_JSON
+from homeassistant.helpers.http import KEY_HASS, HomeAssistantView
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .binary_sensor import format_disruption, storing_geojson
+from .const import (
+    ATTR_DELAY,
+    ATTR_DESTINATION,
+    ATTR_LINE,
+    ATTR_PLATFORM,
+    ATTR_TRAIN_TYPE,
+    BOARD_VIEW_URL,
+    DEFAULT_MAX_DEPARTURES,
+    DISPLAY_CACHE_SIZE,
+    DISPLAY_MAX_DEPARTURES,
+    DISPLAY_VIEW_URL,
+    DOMAIN,
+    METRICS_VIEW_URL,
+)
+from .hub import DATA_HUBS
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from .sensor import format_departure
+
+if TYPE_CHECKING:
+    from .coordinator import DeparturesCoordinator
+
+
+def _clock(value: datetime | None) -> str:
+    """Local HH:MM, the only time format a display needs."""
+    return dt_util.as_local(value).strftime("%H:%M") if value else ""
+
+
+# Departure fields a display can ask for. Times are absolute on purpose:
+# "minutes to go" would change between refreshes and defeat the cache.
+DISPLAY_FIELDS: dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "time": lambda dep: _clock(dep.get("actual_time") or dep.get("scheduled_time")),
+    "scheduled": lambda dep: _clock(dep.get("scheduled_time")),
+    ATTR_LINE: lambda dep: dep.get("line") or "",
+    ATTR_DESTINATION: lambda dep: dep.get("destination") or "",
+    ATTR_PLATFORM: lambda dep: dep.get("platform") or "",
+    ATTR_DELAY: lambda dep: dep.get("delay") or 0,
+    "cancelled": lambda dep: bool(dep.get("cancelled")),
+    ATTR_TRAIN_TYPE: lambda dep: dep.get("train_type") or "",
+}
+DEFAULT_DISPLAY_FIELDS = ("time", ATTR_LINE, ATTR_DESTINATION, ATTR_PLATFORM, ATTR_DELAY, "cancelled")
+
+
+def _coordinator(request: web.Request, entry_id: str) -> DeparturesCoordinator | None:
+    """Coordinator of a loaded entry of this integration, if any."""
+    hass = request.app[KEY_HASS]
+    entry = hass.config_entries.async_get_entry(entry_id)
+    coordinator = getattr(entry, "runtime_data", None)
+    if entry is None or entry.domain != DOMAIN:
+        return None
+    return coordinator
+
+
+def board_payload(coordinator: DeparturesCoordinator) -> dict[str, Any]:
+    """Everything the compact entity attributes leave out, in attribute format."""
+    data = coordinator.data or {}
+    disruptions = [format_disruption(item) for item in data.get("disruptions") or []]
+    return {
+        "operator": coordinator.operator,
+        "location_id": coordinator.location_id,
+        "version": data.get("version"),
+        "last_update": data.get("last_update"),
+        "stale": bool(data.get("stale")),
+        "departures": [format_departure(dep) for dep in data.get("departures") or []],
+        "disruptions": disruptions,
+        "geojson": storing_geojson(disruptions),
+    }
+
+
+class DeparturesBoardView(HomeAssistantView):
+    """Serve a board as JSON, serialized once per coordinator version."""
+
+    url = BOARD_VIEW_URL
+    name = f"api:{DOMAIN}:board"
+    requires_auth = True
+
+    def __init__(self) -> None:
+        """Initialize the per-entry body cache."""
+        self._cache: dict[str, tuple[int | None, bytes]] = {}
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the board for a loaded entry."""
+        coordinator = _coordinator(request, entry_id)
+        if coordinator is None:
+            return self.json_message("Board not found", HTTPStatus.NOT_FOUND)
+        return web.Response(
+            body=self.render(entry_id, coordinator), content_type=CONTENT_TYPE_JSON
+        )
+
+    def render(self, entry_id: str, coordinator: DeparturesCoordinator) -> bytes:
+        """Return the cached JSON body, rebuilding it when the board changed."""
+        version = (coordinator.data or {}).get("version")
+        cached = self._cache.get(entry_id)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+        body = json_bytes(board_payload(coordinator))
+        self._cache[entry_id] = (version, body)
+        return body
+
+
+def _etag_matches(request: web.Request, etag: str) -> bool:
+    """True when If-None-Match names ``etag`` (weak tags compare equal)."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+def display_board(
+    coordinator: DeparturesCoordinator, fields: tuple[str, ...], limit: int
+) -> dict[str, Any]:
+    """
+    The first ``limit`` departures with only ``fields``, plus a stale flag.
+
+    The refresh time is left out (it is sent as Last-Modified), so a
+    refresh that changed nothing on the display keeps the same body and
+    ETag and the device can skip a redraw.
+    """
+    data = coordinator.data or {}
+    return {
+        "stale": bool(data.get("stale")),
+        "disruptions": len(data.get("disruptions") or []),
+        "departures": [
+            {field: DISPLAY_FIELDS[field](dep) for field in fields}
+            for dep in (data.get("departures") or [])[:limit]
+        ],
+    }
+
+
+def display_text(board: dict[str, Any]) -> str:
+    """One line per departure in field order, after a "stale" line when the data is old."""
+    lines = ["stale"] if board["stale"] else []
+    for departure in board["departures"]:
+        cells: list[str] = []
+        for field, value in departure.items():
+            if field == ATTR_DELAY:
+                value = f"+{value}" if value else ""
+            elif field == "cancelled":
+                value = "cancelled" if value else ""
+            cells.append(str(value))
+        lines.append(" ".join(cell for cell in cells if cell))
+    return "\n".join(lines) + "\n"
+
+
+class DeparturesDisplayView(HomeAssistantView):
+    """
+    Serve a small board for e-ink displays, rendered once per board version.
+
+    ``?fields=time,line,destination`` picks departure fields, ``?limit=``
+    the number of departures and ``?format=text`` plain text instead of
+    JSON. Every response has an ETag; a poll with a matching
+    ``If-None-Match`` gets an empty 304.
+    """
+
+    url = DISPLAY_VIEW_URL
+    name = f"api:{DOMAIN}:display"
+    requires_auth = True
+
+    def __init__(self) -> None:
+        """Initialize the rendering cache."""
+        # (entry, format, fields, limit) -> (board version, body, etag)
+        self._cache: dict[tuple[str, str, tuple[str, ...], int], tuple[int, bytes, str]] = {}
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the display board, or 304 when the device already has it."""
+        coordinator = _coordinator(request, entry_id)
+        if coordinator is None:
+            return self.json_message("Board not found", HTTPStatus.NOT_FOUND)
+
+        query = request.query
+        output = query.get("format", "json")
+        fields = DEFAULT_DISPLAY_FIELDS
+        if "fields" in query:
+            fields = tuple(field.strip() for field in query["fields"].split(",") if field.strip())
+        unknown = [field for field in fields if field not in DISPLAY_FIELDS]
+        if output not in ("json", "text") or unknown or not fields:
+            return self.json_message(
+                f"Unknown format or fields; fields are {', '.join(DISPLAY_FIELDS)}",
+                HTTPStatus.BAD_REQUEST,
+            )
+        try:
+            limit = int(query.get("limit", DEFAULT_MAX_DEPARTURES))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= DISPLAY_MAX_DEPARTURES:
+            return self.json_message(
+                f"limit must be 1-{DISPLAY_MAX_DEPARTURES}", HTTPStatus.BAD_REQUEST
+            )
+
+        body, etag = self.render(entry_id, coordinator, output, fields, limit)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        last_update = (coordinator.data or {}).get("last_update")
+        if last_update is not None:
+            headers["Last-Modified"] = format_datetime(last_update, usegmt=True)
+        if _etag_matches(request, etag):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(
+            body=body,
+            content_type=CONTENT_TYPE_JSON if output == "json" else "text/plain",
+            charset="utf-8",
+            headers=headers,
+        )
+
+    def render(  # pylint: disable=too-many-arguments
+        self,
+        entry_id: str,
+        coordinator: DeparturesCoordinator,
+        output: str,
+        fields: tuple[str, ...],
+        limit: int,
+    ) -> tuple[bytes, str]:
+        """Return the cached body and ETag, rebuilding them when the board changed."""
+        version = (coordinator.data or {}).get("version")
+        key = (entry_id, output, fields, limit)
+        cached = self._cache.get(key)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1], cached[2]
+        board = display_board(coordinator, fields, limit)
+        body = json_bytes(board) if output == "json" else display_text(board).encode()
+        etag = f'"{blake2b(body, digest_size=8).hexdigest()}"'
+        if version is not None:
+            self._cache.pop(key, None)
+            while len(self._cache) >= DISPLAY_CACHE_SIZE:
+                # Oldest rendering first; dicts keep insertion order
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = (version, body, etag)
+        return body, etag
+
+
+class DeparturesMetricsView(HomeAssistantView):
+    """Serve request, cache and refresh statistics in Prometheus text format."""
+
+    url = METRICS_VIEW_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the counters the clients and coordinators already keep."""
+        hass = request.app[KEY_HASS]
+        hubs = hass.data.get(DOMAIN, {}).get(DATA_HUBS, {})
+        return web.Response(
+            body=render_metrics(list(hubs.values())).encode(),
+            headers={"Content-Type": METRICS_CONTENT_TYPE},
+        )
@@ -0,0 +1,198 @@
+"""Websocket subscription streaming a departure board as snapshot plus deltas."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .binary_sensor import format_disruption, storing_geojson
+from .board_diff import (
+    SLICE_DEPARTURES,
+    SLICE_DISRUPTIONS,
+    SLICE_FRESHNESS,
+    DepartureKey,
+    departure_key,
+)
+from .const import ATTR_CONFIG_ENTRY_ID, DOMAIN, WS_SUBSCRIBE_BOARD
+from .sensor import format_departure
+
+if TYPE_CHECKING:
+    from .coordinator import DeparturesCoordinator
+
+DATA_BOARD_SUBSCRIPTIONS = "board_subscriptions"
+
+# Slices a board card draws; train image and next-departure changes are
+# either served elsewhere or derivable from the departure list.
+_STREAMED_SLICES = frozenset({SLICE_DEPARTURES, SLICE_DISRUPTIONS, SLICE_FRESHNESS})
+
+
+def departure_id(key: DepartureKey) -> str:
+    """Stable string id of a departure_key, for clients to match deltas on."""
+    return "|".join(
+        value.isoformat() if isinstance(value, datetime) else str(value or "") for value in key
+    )
+
+
+def _departure(departure: dict[str, Any]) -> dict[str, Any]:
+    """Attribute format of a departure, plus its id."""
+    return {"id": departure_id(departure_key(departure)), **format_departure(departure)}
+
+
+def _disruptions(data: dict[str, Any]) -> dict[str, Any]:
+    disruptions = [format_disruption(item) for item in data.get("disruptions") or []]
+    return {"disruptions": disruptions, "geojson": storing_geojson(disruptions)}
+
+
+def _header(coordinator: DeparturesCoordinator) -> dict[str, Any]:
+    data = coordinator.data or {}
+    return {
+        "version": data.get("version"),
+        "last_update": data.get("last_update"),
+        "stale": bool(data.get("stale")),
+        "available": coordinator.last_update_success,
+    }
+
+
+def board_snapshot(coordinator: DeparturesCoordinator) -> dict[str, Any]:
+    """The whole board, sent first and whenever the client may have missed a delta."""
+    data = coordinator.data or {}
+    return {
+        "type": "snapshot",
+        "operator": coordinator.operator,
+        "location_id": coordinator.location_id,
+        **_header(coordinator),
+        "departures": [_departure(dep) for dep in data.get("departures") or []],
+        **_disruptions(data),
+    }
+
+
+def board_delta(coordinator: DeparturesCoordinator) -> dict[str, Any]:
+    """
+    What the last update changed, from the coordinator's board diff.
+
+    ``departures`` carries the added and changed departures in full, the
+    ids of removed ones and the new order; disruptions are few, so the
+    whole list is resent when any of them changed.
+    """
+    data = coordinator.data or {}
+    changes = coordinator.changes
+    delta: dict[str, Any] = {
+        "type": "delta",
+        **_header(coordinator),
+        "slices": sorted(changes.slices & _STREAMED_SLICES),
+    }
+    if SLICE_DEPARTURES in changes.slices:
+        current = {departure_key(dep): dep for dep in data.get("departures") or []}
+        delta["departures"] = {
+            "added": [_departure(current[key]) for key in changes.added if key in current],
+            "changed": [_departure(current[key]) for key in changes.changed if key in current],
+            "removed": [departure_id(key) for key in changes.removed],
+            "order": [departure_id(key) for key in current],
+        }
+    if SLICE_DISRUPTIONS in changes.slices:
+        delta.update(_disruptions(data))
+    return delta
+
+
+@callback
+def _live_subscriptions(hass: HomeAssistant, entry: ConfigEntry) -> set[CALLBACK_TYPE]:
+    """
+    Callbacks that end each open subscription to ``entry``'s board.
+
+    One unload hook per loaded entry ends them all; subscriptions remove
+    themselves when the client unsubscribes or disconnects.
+    """
+    by_entry: dict[str, set[CALLBACK_TYPE]] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_BOARD_SUBSCRIPTIONS, {}
+    )
+    live = by_entry.get(entry.entry_id)
+    if live is None:
+        live = by_entry[entry.entry_id] = set()
+
+        @callback
+        def _entry_unloaded() -> None:
+            for end in list(by_entry.pop(entry.entry_id, ())):
+                end()
+
+        entry.async_on_unload(_entry_unloaded)
+    return live
+
+
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_board)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE_BOARD,
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_subscribe_board(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """
+    Send the board once, then a delta after every coordinator update that changed it.
+
+    Unloading or reloading the entry ends the subscription with an error, so
+    clients know to subscribe again rather than wait on a retired coordinator.
+    """
+    entry = hass.config_entries.async_get_entry(msg[ATTR_CONFIG_ENTRY_ID])
+    coordinator: DeparturesCoordinator | None = getattr(entry, "runtime_data", None)
+    if entry is None or entry.domain != DOMAIN or coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Board not found")
+        return
+
+    sent: dict[str, Any] = {}
+
+    @callback
+    def _send(event: dict[str, Any]) -> None:
+        sent["version"] = event["version"]
+        sent["available"] = event["available"]
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    @callback
+    def _forward() -> None:
+        version = (coordinator.data or {}).get("version")
+        if version == sent["version"]:
+            # Failed refresh without a stale board: only availability can change
+            if coordinator.last_update_success != sent["available"]:
+                _send({**_header(coordinator), "type": "delta", "slices": []})
+            return
+        if version is None or sent["version"] is None or version != sent["version"] + 1:
+            # The diff is against a board this client never saw
+            _send(board_snapshot(coordinator))
+            return
+        delta = board_delta(coordinator)
+        if delta["slices"] or delta["available"] != sent["available"]:
+            _send(delta)
+        else:
+            # Nothing a card draws changed, but later deltas build on this version
+            sent["version"] = version
+
+    live = _live_subscriptions(hass, entry)
+    remove_listener = coordinator.async_add_listener(_forward)
+
+    @callback
+    def _unsubscribe() -> None:
+        remove_listener()
+        live.discard(_end)
+
+    @callback
+    def _end() -> None:
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _unsubscribe()
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Board unloaded")
+
+    live.add(_end)
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    _send(board_snapshot(coordinator))
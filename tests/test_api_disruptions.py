@@ -1,10 +1,13 @@
 """Tests for the NS disruptions API client."""
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aiohttp import ClientError, ClientResponseError
 
-from custom_components.ret_ns_departures.api_disruptions import NSDisruptionsAPIClient
+from custom_components.ret_ns_departures.api_disruptions import (
+    NSDisruptionsAPIClient,
+    project_disruption,
+)
 from custom_components.ret_ns_departures.const import NS_DISRUPTIONS_API_BASE_URL
 
 from tests.helpers import attach_get_with_response, mock_aiohttp_response
@@ -74,12 +77,102 @@ def test_parse_disruptions_minimal(disruptions_client):
     assert d["expected_duration"] == "~4h"
 
 
+def test_projection_keeps_what_the_parser_reads(disruptions_client):
+    raw = {
+        "id": "d1",
+        "type": "DISRUPTION",
+        "title": "Test storing",
+        "phase": {"label": "In progress", "id": "4"},
+        "impact": {"value": 3},
+        "publicationSections": [
+            {
+                "section": {
+                    "stations": [{"name": "Rotterdam Centraal", "uicCode": "8400530"}],
+                    "direction": "ONE_DIRECTION",
+                },
+                "consequence": {"description": "Geen treinen"},
+            }
+        ],
+        "timespans": [
+            {"cause": {"label": "Seinstoring"}, "advices": ["Reis via Gouda"]},
+            {"cause": {"label": "Later"}},
+        ],
+    }
+
+    projected = project_disruption(raw)
+
+    assert "consequence" not in projected["publicationSections"][0]
+    assert projected["timespans"] == [{"cause": {"label": "Seinstoring"}}]
+    assert disruptions_client._parse_disruptions(
+        [projected]
+    ) == disruptions_client._parse_disruptions([raw])
+
+
 def test_parse_disruptions_skips_without_type(disruptions_client):
     """Entries without type are skipped."""
     raw = [{"id": "x", "title": "No type"}]
     assert not disruptions_client._parse_disruptions(raw)
 
 
+def _storing(disruption_id, title="Storing"):
+    return {"id": disruption_id, "type": "DISRUPTION", "title": title, "isActive": True}
+
+
+def test_parse_disruptions_reuses_unchanged_objects(disruptions_client):
+    """Only new or changed objects go through the parser again."""
+    disruptions_client._parse_disruptions([_storing("d1"), _storing("d2")], scope="RTD")
+    with patch.object(
+        disruptions_client,
+        "_parse_disruption",
+        wraps=disruptions_client._parse_disruption,
+    ) as parse:
+        result = disruptions_client._parse_disruptions(
+            [_storing("d1"), _storing("d2", "Storing opgelost"), _storing("d3")],
+            scope="RTD",
+        )
+    assert [call.args[0]["id"] for call in parse.call_args_list] == ["d2", "d3"]
+    assert [item["title"] for item in result] == ["Storing", "Storing opgelost", "Storing"]
+
+    delta = disruptions_client.disruption_delta("RTD")
+    assert delta.added == {"d3"}
+    assert delta.changed == {"d2"}
+    assert not delta.removed
+
+
+def test_parse_disruptions_reports_removed_per_scope(disruptions_client):
+    """Removed ids are tracked per station and cached parses are pruned."""
+    disruptions_client._parse_disruptions([_storing("d1"), _storing("d2")], scope="RTD")
+    disruptions_client._parse_disruptions([_storing("d2")], scope="GVC")
+    disruptions_client._parse_disruptions([_storing("d2")], scope="RTD")
+
+    assert disruptions_client.disruption_delta("RTD").removed == {"d1"}
+    assert disruptions_client.disruption_delta("GVC").added == {"d2"}
+    assert disruptions_client.disruption_delta("UT").empty
+    assert set(disruptions_client._parsed) == {"d2"}
+
+
+def test_forget_scope_prunes_an_unloaded_board(disruptions_client):
+    """Boards on the same station keep their own deltas; unloading one forgets it."""
+    disruptions_client._parse_disruptions([_storing("d1")], scope="entry_a")
+    disruptions_client._parse_disruptions([_storing("d1")], scope="entry_b")
+    assert disruptions_client.disruption_delta("entry_b").added == {"d1"}
+
+    disruptions_client._parse_disruptions([_storing("d2")], scope="entry_b")
+    disruptions_client.forget_scope("entry_a")
+
+    assert disruptions_client.disruption_delta("entry_a").empty
+    assert set(disruptions_client._parsed) == {"d2"}
+
+
+def test_parse_disruptions_returns_copies(disruptions_client):
+    """Reused parses are copies, so attaching geo to one board leaves the cache alone."""
+    first = disruptions_client._parse_disruptions([_storing("d1")])
+    first[0]["geo"] = {"id": "d1"}
+    second = disruptions_client._parse_disruptions([_storing("d1")])
+    assert "geo" not in second[0]
+    assert disruptions_client.disruption_delta().empty
+
+
 @pytest.mark.asyncio
 async def test_async_get_disruptions_success(disruptions_client, mock_session):
     payload = [
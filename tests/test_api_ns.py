@@ -8,6 +8,7 @@ from custom_components.ret_ns_departures.api_ns import (
     NSAPIClient,
     annotate_station_distances,
     parse_ns_stations,
+    project_departures,
 )
 from custom_components.ret_ns_departures.const import NS_STATIONS_API_BASE_URL
 
@@ -498,3 +499,16 @@ async def test_validate_api_key_accepts_ok(ns_client, mock_session):
     mock_session.get.return_value = cm
 
     assert await ns_client.async_validate_api_key() is True
+
+
+def test_project_departures_keeps_parsed_fields_only(mock_ns_response):
+    departure = mock_ns_response["payload"]["departures"][0]
+    departure["messages"] = [{"message": "Let op", "style": "INFO"}]
+
+    projected = project_departures(mock_ns_response, max_results=5)
+
+    slim = projected["payload"]["departures"][0]
+    assert "messages" not in slim
+    # Without a direction, only the last route station is kept as fallback.
+    assert slim["routeStations"] == [{"mediumName": "Amsterdam Centraal"}]
+    assert slim["plannedDateTime"] == departure["plannedDateTime"]
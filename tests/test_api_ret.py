@@ -1,11 +1,12 @@
 """Tests for the RET website client (HTML parsing)."""
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
-from aiohttp import ClientError
+from aiohttp import ClientError, StreamReader
 from freezegun import freeze_time
 
-from custom_components.ret_ns_departures.api_ret import RETAPIClient
+from custom_components.ret_ns_departures.api_ret import RETAPIClient, _read_halt_page
 
 from tests.helpers import (
     attach_get_router,
@@ -300,3 +301,137 @@ async def test_validate_stop_accepts_alias_for_inactive_page(ret_client, mock_se
     )
 
     assert await ret_client.async_validate_stop("centraal-station") is True
+
+
+@pytest.mark.asyncio
+async def test_shared_client_keeps_halt_metadata_per_stop(ret_client, mock_session):
+    """One client serving several stops remembers each halt's title separately."""
+    beurs = (
+        '<html><body><h1 class="text--white">Beurs</h1>'
+        + _ret_departure_row("Metro A", "Schiedam", "12:00")
+        + "</body></html>"
+    )
+    blaak = (
+        '<html><body><h1 class="text--white">Blaak</h1>'
+        + _ret_departure_row("Tram 21", "Woudhoek", "12:00")
+        + "</body></html>"
+    )
+    attach_get_router(
+        mock_session,
+        [
+            ("/halte/beurs.html", mock_aiohttp_response(text=beurs)),
+            ("/halte/blaak.html", mock_aiohttp_response(text=blaak)),
+        ],
+    )
+
+    await ret_client.async_get_departures("beurs")
+    await ret_client.async_get_departures("blaak")
+
+    assert ret_client._last_halt["beurs"].name == "Beurs"
+    assert ret_client._last_halt["blaak"].name == "Blaak"
+
+
+@pytest.mark.asyncio
+async def test_service_notice_index_rebuilt_only_when_notices_change(ret_client, mock_session):
+    """Repeated lookups reuse the diversion index until the page changes."""
+    page = (
+        '<html><body><article class="article article--modal">'
+        "<h2>Door werkzaamheden Hofplein rijdt tram 8 een gewijzigde route.</h2>"
+        "<p>Vervallen haltes tram 8:</p><p>- Schiekade</p>"
+        "</article></body></html>"
+    )
+    attach_get_with_response(mock_session, mock_aiohttp_response(text=page))
+
+    notice = await ret_client.async_get_service_notice("schiekade", "Schiekade", ["8"])
+    index = ret_client._diversion_index
+    ret_client._diversions_cache = None
+    again = await ret_client.async_get_service_notice("schiekade", "Schiekade", ["8"])
+
+    assert notice["cancelled_stop"] is True
+    assert again == notice
+    assert ret_client._diversion_index is index
+    assert mock_session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_diversions_cache_expires_when_a_notice_starts(ret_client, mock_session):
+    """The omleidingen page is fetched again at the next Van/Tot boundary."""
+    page = (
+        '<html><body><article class="article article--modal">'
+        "<h2>Door werkzaamheden Beurs rijdt metro A een gewijzigde route.</h2>"
+        '<div class="-mgb--xsm">Van: 1 oktober 2026 12:05<br/>Tot: 2 oktober 2026 02:00</div>'
+        "</article></body></html>"
+    )
+    attach_get_with_response(mock_session, mock_aiohttp_response(text=page))
+
+    with freeze_time("2026-10-01T10:00:00Z"):
+        assert await ret_client.async_get_service_notice("beurs", "Beurs", ["A"]) is None
+    with freeze_time("2026-10-01T10:04:00Z"):
+        await ret_client.async_get_diversions()
+        assert mock_session.get.call_count == 1
+    with freeze_time("2026-10-01T10:05:00Z"):
+        notice = await ret_client.async_get_service_notice("beurs", "Beurs", ["A"])
+        assert mock_session.get.call_count == 2
+    assert notice["lines"] == ["A"]
+
+
+def _streamed_response(body: bytes, chunk: int) -> MagicMock:
+    """Response whose content is a real StreamReader fed in ``chunk``-byte pieces."""
+    reader = StreamReader(MagicMock(), 2**16, loop=asyncio.get_running_loop())
+    for start in range(0, len(body), chunk):
+        reader.feed_data(body[start : start + chunk])
+    reader.feed_eof()
+    response = MagicMock()
+    response.content = reader
+    response.charset = "utf-8"
+    return response
+
+
+@pytest.mark.asyncio
+async def test_halt_page_read_stops_at_footer():
+    """Only the part before the footer is decoded; the rest is drained."""
+    head = '<html><body><h1 class="text--white">Schiekade – Noord</h1>' + _ret_departure_row(
+        "Tram 8", "Spangen", "12:00"
+    )
+    body = (
+        head + '<footer class="footer">' + "<script>x</script>" * 2000 + "</footer></body></html>"
+    ).encode()
+    # Seven-byte chunks split the marker across chunk boundaries
+    response = _streamed_response(body, 7)
+
+    html = await _read_halt_page(response)
+
+    assert html == head
+    assert response.content.at_eof()
+
+
+@pytest.mark.asyncio
+async def test_halt_page_without_footer_is_read_in_full():
+    body = "<html><body><p>geen footer</p></body></html>".encode()
+    assert await _read_halt_page(_streamed_response(body, 4096)) == body.decode()
+
+
+@pytest.mark.asyncio
+async def test_halt_page_read_ignores_nested_footers():
+    """A card footer before the timetable does not end the read."""
+    head = (
+        '<html><body><h1 class="text--white">Schiekade</h1>'
+        '<div class="card"><footer class="card__footer">Reisinfo</footer></div>'
+        + _ret_departure_row("Tram 8", "Spangen", "12:00")
+    )
+    body = (head + '<footer class="footer"><p>ret.nl</p></footer></body></html>').encode()
+
+    html = await _read_halt_page(_streamed_response(body, 7))
+
+    assert html == head
+    assert "favorite__info" in html
+
+
+@pytest.mark.asyncio
+async def test_halt_page_without_timetable_before_footer_is_read_in_full():
+    body = (
+        '<html><body><footer class="footer"><p>menu</p></footer>'
+        + _ret_departure_row("Tram 8", "Spangen", "12:00")
+        + "</body></html>"
+    ).encode()
+    assert await _read_halt_page(_streamed_response(body, 7)) == body.decode()
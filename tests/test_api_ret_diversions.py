@@ -1,13 +1,23 @@
 """Tests for RET omleidingen parsing and halt matching."""
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from custom_components.ret_ns_departures import api_ret_diversions
 
 from custom_components.ret_ns_departures.api_ret_diversions import (
+    DiversionArticleParser,
+    DiversionIndex,
     extract_dienstregeling_urls,
     extract_halt_lines,
     extract_halt_name,
     match_stop_notice,
     parse_diversion_articles,
+    parse_dutch_datetime,
 )
 
+AMS = ZoneInfo("Europe/Amsterdam")
+
 HOFPLEIN_HTML = """
 <html><body>
 <article class="article article--modal">
@@ -90,3 +100,141 @@ def test_extract_halt_metadata():
     assert extract_halt_name(HALT_HTML) == "Schiekade"
     assert extract_halt_lines(HALT_HTML) == ["8"]
     assert extract_dienstregeling_urls(HALT_HTML)["8"].endswith("tram-8.html")
+
+
+METRO_ARTICLE = """
+<article class="article article--modal">
+  <h2>Door werkzaamheden Beurs rijden metrolijnen A, B en C een gewijzigde route.</h2>
+  <div class="-mgb--xsm">Van: 1 oktober 2026 20:00<br/>Tot: 2 oktober 2026 02:00</div>
+  <p>Door werkzaamheden Beurs rijden metrolijnen A, B en C een gewijzigde route.</p>
+</article>
+"""
+
+
+def test_parser_reuses_unchanged_articles_and_keeps_ids():
+    parser = DiversionArticleParser()
+    first = parser.parse(HOFPLEIN_HTML)
+    assert parser.parsed == 1
+
+    updated = HOFPLEIN_HTML.replace("<body>", "<body>" + METRO_ARTICLE)
+    second = parser.parse(updated)
+    assert parser.parsed == 2
+    assert parser.reused == 1
+    assert [notice["title"] for notice in second] == [
+        "Werkzaamheden Beurs",
+        "Werkzaamheden Hofplein",
+    ]
+    # Ids follow the article, not its position on the page
+    assert second[1] is first[0]
+    assert second[1]["id"] == first[0]["id"]
+
+
+def test_parser_short_circuits_identical_page():
+    parser = DiversionArticleParser()
+    first = parser.parse(HOFPLEIN_HTML)
+    assert parser.parse(HOFPLEIN_HTML) is first
+    assert parser.parsed == 1
+
+
+def test_edited_article_is_parsed_again_with_same_id():
+    parser = DiversionArticleParser()
+    first = parser.parse(HOFPLEIN_HTML)
+    edited = parser.parse(HOFPLEIN_HTML.replace("<p>- Weena</p>", ""))
+    assert parser.parsed == 2
+    assert edited[0]["id"] == first[0]["id"]
+    assert "Weena" not in edited[0]["cancelled_by_line"]["8"]
+
+
+def test_repeated_notice_ids_ignore_other_articles():
+    other_direction = METRO_ARTICLE.replace("<h2>", "<h3>Richting: De Akkers</h3><h2>", 1)
+    parser = DiversionArticleParser()
+    first = parser.parse(f"<html><body>{METRO_ARTICLE}{other_direction}</body></html>")
+    # A new article ahead of them must not renumber the repeat
+    second = parser.parse(
+        HOFPLEIN_HTML.replace("</body>", f"{METRO_ARTICLE}{other_direction}</body>")
+    )
+
+    assert first[1]["id"] == f"{first[0]['id']}-2"
+    assert [notice["id"] for notice in second[1:]] == [notice["id"] for notice in first]
+
+
+def test_index_checks_each_distinct_cancelled_stop_once():
+    notices = parse_diversion_articles(
+        HOFPLEIN_HTML.replace("<body>", "<body>" + METRO_ARTICLE)
+    )
+    index = DiversionIndex(notices)
+    with patch.object(
+        api_ret_diversions,
+        "_names_match",
+        wraps=api_ret_diversions._names_match,
+    ) as check:
+        assert index.cancelled_at("Schiekade", "schiekade") == (1,)
+        assert index.cancelled_at("Schiekade", "schiekade") == (1,)
+        assert not index.cancelled_at("Beurs", "beurs")
+    # Three Hofplein stops per halt; the repeat is memoised
+    assert check.call_count == 6
+    assert index.serving({"A"}) == {0}
+    assert index.serving({"8", "A"}) == {0, 1}
+
+
+def test_index_matches_stop_names_by_substring():
+    notices = parse_diversion_articles(
+        HOFPLEIN_HTML.replace("- Schiekade", "- Beursplein").replace(
+            "- Weena", "- Kruispl."
+        )
+    )
+    index = DiversionIndex(notices)
+    assert index.cancelled_at("Beurs", "beurs") == (0,)
+    assert index.cancelled_at("Kruisplein", "kruisplein") == (0,)
+    for stop_name, stop_slug in (("Beurs", "beurs"), ("Kruisplein", "kruisplein")):
+        matched = match_stop_notice(
+            notices, stop_name=stop_name, stop_slug=stop_slug, lines=["8"]
+        )
+        assert matched is not None
+        assert matched["cancelled_stop"] is True
+
+
+def test_match_accepts_prebuilt_index():
+    notices = parse_diversion_articles(
+        HOFPLEIN_HTML.replace("<body>", "<body>" + METRO_ARTICLE)
+    )
+    index = DiversionIndex(notices)
+    for source in (notices, index):
+        matched = match_stop_notice(
+            source, stop_name="Beurs", stop_slug="beurs", lines=["A"]
+        )
+        assert matched["title"] == "Werkzaamheden Beurs"
+        assert matched["cancelled_stop"] is False
+
+
+def test_parse_dutch_datetime():
+    assert parse_dutch_datetime("18 juli 2026 05:00") == datetime(2026, 7, 18, 5, 0, tzinfo=AMS)
+    assert parse_dutch_datetime("za 3 mrt. 2026 om 9.30") == datetime(2026, 3, 3, 9, 30, tzinfo=AMS)
+    assert parse_dutch_datetime("22 november 2026", end_of_day=True) == datetime(
+        2026, 11, 23, tzinfo=AMS
+    )
+    assert parse_dutch_datetime("tot nader bericht") is None
+    assert parse_dutch_datetime("31 februari 2026") is None
+
+
+def test_index_only_considers_active_notices():
+    notices = parse_diversion_articles(
+        HOFPLEIN_HTML.replace("<body>", "<body>" + METRO_ARTICLE)
+    )
+    index = DiversionIndex(notices)
+    before = datetime(2026, 7, 1, tzinfo=AMS)
+    during_both = datetime(2026, 10, 1, 22, 0, tzinfo=AMS)
+    after_metro = datetime(2026, 10, 2, 3, 0, tzinfo=AMS)
+
+    assert not index.active(before)
+    assert index.next_boundary(before) == datetime(2026, 7, 18, 5, 0, tzinfo=AMS)
+    assert index.active(during_both) == {0, 1}
+    assert index.next_boundary(during_both) == datetime(2026, 10, 2, 2, 0, tzinfo=AMS)
+    assert index.active(after_metro) == {1}
+
+    assert match_stop_notice(
+        index, stop_name="Beurs", stop_slug="beurs", lines=["A"], now=after_metro
+    ) is None
+    assert match_stop_notice(
+        index, stop_name="Schiekade", stop_slug="schiekade", lines=["8"], now=before
+    ) is None
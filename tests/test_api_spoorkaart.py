@@ -1,4 +1,5 @@
 """Tests for the NS Spoorkaart API client (getStoring)."""
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
@@ -166,5 +167,43 @@ async def test_async_get_storing_caches_result(spoorkaart_client, mock_session):
 
     assert first == second
     assert mock_session.get.call_count == 1
+    assert spoorkaart_client.cache_info() == {
+        "size": 1,
+        "disabled": False,
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+    assert spoorkaart_client.stats.responses[("storingen", "200")] == 1
     spoorkaart_client.prune_cache(set())
     assert spoorkaart_client._cache == {}
+
+
+@pytest.mark.asyncio
+async def test_async_get_storing_shared_between_stations(spoorkaart_client, mock_session):
+    """Concurrent stations share one request, and pruning keeps ids any station reports."""
+    attach_get_with_response(
+        mock_session,
+        mock_aiohttp_response(
+            json_data=_feature_collection(
+                {
+                    "id": "1",
+                    "geometry": {"type": "Point", "coordinates": [4.5, 52.1]},
+                    "properties": {},
+                }
+            )
+        ),
+    )
+
+    first, second = await asyncio.gather(
+        spoorkaart_client.async_get_storing("1"),
+        spoorkaart_client.async_get_storing("1"),
+    )
+
+    assert first == second
+    assert mock_session.get.call_count == 1
+    spoorkaart_client.prune_cache({"1"}, scope="RTD")
+    spoorkaart_client.prune_cache(set(), scope="UT")
+    assert "1" in spoorkaart_client._cache
+    spoorkaart_client.prune_cache(set(), scope="RTD")
+    assert spoorkaart_client._cache == {}
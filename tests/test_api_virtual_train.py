@@ -93,6 +93,8 @@ async def test_get_image_falls_back_after_404(vt_client, mock_session):
     assert mock_session.get.call_args[0][0] == (
         f"{NS_VIRTUAL_TRAIN_API_BASE_URL}/trein/image"
     )
+    assert vt_client.endpoint_state == {"trein/image/{rit}": 404, "trein/image": 200}
+    assert vt_client.stats.payload_bytes["trein/image"].summary()["max"] == 6
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,76 @@
+"""Tests for the board change-set diff."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.ret_ns_departures.board_diff import (
+    ALL_SLICES,
+    SLICE_DEPARTURES,
+    SLICE_DISRUPTIONS,
+    SLICE_FRESHNESS,
+    SLICE_NEXT_DEPARTURE,
+    SLICE_TRAIN_IMAGE,
+    departure_key,
+    diff_boards,
+)
+
+NOW = datetime(2024, 11, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _departure(minutes: int, line: str = "2", **fields):
+    scheduled = NOW + timedelta(minutes=minutes)
+    return {
+        "line": line,
+        "destination": "Beverwaard",
+        "scheduled_time": scheduled,
+        "actual_time": fields.pop("actual_time", scheduled),
+        "delay": 0,
+        **fields,
+    }
+
+
+def test_first_board_changes_everything():
+    changes = diff_boards(None, {"departures": [_departure(3)]})
+
+    assert changes.slices == ALL_SLICES
+    assert changes.added == (departure_key(_departure(3)),)
+
+
+def test_identical_board_is_empty_despite_second_jitter():
+    """RET actual times move by seconds between scrapes; that is not a change."""
+    previous = {"departures": [_departure(3), _departure(8)], "disruptions": []}
+    current = {
+        "departures": [
+            _departure(3, actual_time=NOW + timedelta(minutes=3, seconds=12)),
+            _departure(8),
+        ],
+        "disruptions": [],
+        "last_update": NOW,
+    }
+
+    assert diff_boards(previous, current).empty
+
+
+def test_delay_and_removed_departures_are_reported():
+    first, second = _departure(3), _departure(8)
+    delayed = _departure(8, delay=2, actual_time=NOW + timedelta(minutes=10))
+
+    changes = diff_boards({"departures": [first, second]}, {"departures": [delayed]})
+
+    assert changes.slices == {SLICE_DEPARTURES, SLICE_NEXT_DEPARTURE}
+    assert changes.removed == (departure_key(first),)
+    assert changes.changed == (departure_key(second),)
+    assert changes.touches(frozenset({SLICE_NEXT_DEPARTURE}))
+    assert not changes.touches(frozenset({SLICE_DISRUPTIONS}))
+
+
+def test_disruptions_image_and_stale_slices():
+    previous = {"departures": [], "disruptions": [], "train_image_url": None}
+    current = {
+        "departures": [],
+        "disruptions": [{"id": "a"}],
+        "train_image_url": "https://example/x.png",
+        "stale": True,
+    }
+
+    changes = diff_boards(previous, current)
+
+    assert changes.slices == {SLICE_DISRUPTIONS, SLICE_TRAIN_IMAGE, SLICE_FRESHNESS}
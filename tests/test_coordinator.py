@@ -1,9 +1,11 @@
 """Tests for DeparturesCoordinator update logic."""
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aiohttp import ClientError
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ret_ns_departures.const import (
@@ -12,14 +14,20 @@ from custom_components.ret_ns_departures.const import (
     CONF_MONITOR_DISRUPTIONS,
     CONF_NS_API_KEY,
     CONF_OPERATOR,
+    CONF_STALE_LIMIT,
     CONF_STATION_CODE,
     CONF_STOP_ID,
     CONF_STOP_NAME,
+    DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    RELAXED_SCAN_INTERVAL,
     STOP_TYPE_NS,
     STOP_TYPE_RET,
 )
-from custom_components.ret_ns_departures.coordinator import DeparturesCoordinator
+from custom_components.ret_ns_departures.coordinator import (
+    DeparturesCoordinator,
+    next_aligned_refresh,
+)
 
 pytestmark = pytest.mark.usefixtures("enable_custom_integrations")
 
@@ -195,6 +203,40 @@ async def test_coordinator_ns_includes_disruptions_when_enabled(hass, mock_sessi
     assert coord.spoorkaart_client is not None
 
 
+@pytest.mark.asyncio
+async def test_coordinator_disruption_deltas_are_per_board(hass, mock_session):
+    """Two boards on one station each see their own delta; unload forgets it."""
+    config = {
+        CONF_OPERATOR: STOP_TYPE_NS,
+        CONF_STATION_CODE: "Rtd",
+        CONF_NS_API_KEY: "secret",
+        CONF_MONITOR_DISRUPTIONS: True,
+    }
+    first = _make_coordinator(hass, mock_session, config)
+    second = _make_coordinator(hass, mock_session, config)
+    client = first.disruptions_client
+    assert client is second.disruptions_client
+    raw = [{"id": "d1", "type": "DISRUPTION", "title": "Storm", "isActive": True}]
+
+    with (
+        patch.object(first.api_client, "async_get_departures", new=AsyncMock(return_value=[])),
+        patch.object(client, "_async_get_json", new=AsyncMock(return_value=raw)),
+        patch.object(
+            first.spoorkaart_client, "async_get_storing", new=AsyncMock(return_value=None)
+        ),
+    ):
+        await first._async_update_data()
+        await second._async_update_data()
+
+    assert first.disruption_delta.added == {"d1"}
+    assert second.disruption_delta.added == {"d1"}
+
+    first.async_start()()
+    second.async_start()()
+    assert not client._fingerprints
+    assert not client._parsed
+
+
 @pytest.mark.asyncio
 async def test_coordinator_ns_attaches_virtual_train_image(hass, mock_session):
     coord = _make_coordinator(
@@ -239,6 +281,59 @@ async def test_coordinator_ns_attaches_virtual_train_image(hass, mock_session):
     assert data["train_composition"]["type"] == "VIRM"
 
 
+@pytest.mark.asyncio
+async def test_coordinator_disruptions_and_image_follow_own_cadence(hass, mock_session):
+    """Departures refresh every tick; disruptions every 120 s; images on trip change."""
+    coord = _make_coordinator(
+        hass,
+        mock_session,
+        {
+            CONF_OPERATOR: STOP_TYPE_NS,
+            CONF_STATION_CODE: "Rtd",
+            CONF_NS_API_KEY: "secret",
+            CONF_MONITOR_DISRUPTIONS: True,
+        },
+    )
+    deps = [{"line": "IC", "trip_number": "2834", "scheduled_time": None}]
+    dis = [{"id": "d1", "title": "Storm"}]
+    start = dt_util.utcnow()
+
+    with (
+        patch.object(
+            coord.api_client, "async_get_departures", new=AsyncMock(return_value=deps)
+        ) as mock_deps,
+        patch.object(
+            coord.disruptions_client,
+            "async_get_station_disruptions",
+            new=AsyncMock(return_value=dis),
+        ) as mock_dis,
+        patch.object(
+            coord.spoorkaart_client, "async_get_storing", new=AsyncMock(return_value=None)
+        ),
+        patch.object(
+            coord.virtual_train_client,
+            "async_get_image",
+            new=AsyncMock(return_value={"bytes": b"PNG", "content_type": "image/png"}),
+        ) as mock_image,
+    ):
+        for seconds in (0, 30, 60, 90, 120):
+            with patch(
+                "custom_components.ret_ns_departures.coordinator.dt_util.utcnow",
+                return_value=start + timedelta(seconds=seconds),
+            ):
+                data = await coord._async_update_data()
+
+    assert mock_deps.await_count == 5
+    assert mock_dis.await_count == 2
+    mock_image.assert_awaited_once()
+    assert data["disruptions"] == dis
+    assert data["train_image"] == b"PNG"
+    assert data["train_image_updated"] == start
+    assert data["stage_updated"]["departures"] == start + timedelta(seconds=120)
+    assert data["stage_updated"]["disruptions"] == start + timedelta(seconds=120)
+    assert data["stage_updated"]["image"] == start
+
+
 @pytest.mark.asyncio
 async def test_coordinator_ns_disruption_failure_returns_empty_list(hass, mock_session):
     coord = _make_coordinator(
@@ -370,7 +465,128 @@ async def test_coordinator_departures_failure_raises_update_failed(hass, mock_se
             await coord._async_update_data()
 
 
+@pytest.mark.asyncio
+async def test_coordinator_serves_stale_board_within_limit(hass, mock_session):
+    """A short outage keeps the last board, minus departures that have left."""
+    coord = _make_coordinator(
+        hass,
+        mock_session,
+        {
+            CONF_OPERATOR: STOP_TYPE_RET,
+            CONF_STOP_ID: "beurs",
+            CONF_STALE_LIMIT: 10,
+        },
+    )
+    now = dt_util.utcnow()
+    gone = {"line": "2", "actual_time": now - timedelta(minutes=1)}
+    coming = {"line": "2", "actual_time": now + timedelta(minutes=4)}
+    last_update = now - timedelta(minutes=2)
+    coord.data = {"departures": [gone, coming], "last_update": last_update}
+
+    with patch.object(
+        coord.api_client,
+        "async_get_departures",
+        new=AsyncMock(side_effect=ClientError("boom")),
+    ):
+        data = await coord._async_update_data()
+
+    assert data["stale"] is True
+    assert data["departures"] == [coming]
+    assert data["last_update"] == last_update
+
+
+@pytest.mark.asyncio
+async def test_coordinator_stale_board_expires_after_limit(hass, mock_session):
+    coord = _make_coordinator(
+        hass,
+        mock_session,
+        {
+            CONF_OPERATOR: STOP_TYPE_RET,
+            CONF_STOP_ID: "beurs",
+            CONF_STALE_LIMIT: 5,
+        },
+    )
+    coord.data = {
+        "departures": [],
+        "last_update": dt_util.utcnow() - timedelta(minutes=6),
+    }
+
+    with patch.object(
+        coord.api_client,
+        "async_get_departures",
+        new=AsyncMock(side_effect=ClientError("boom")),
+    ):
+        with pytest.raises(UpdateFailed):
+            await coord._async_update_data()
+
+
+def test_next_aligned_refresh_picks_lead_or_delayed_arrival():
+    now = dt_util.utcnow()
+    on_time = {"actual_time": now + timedelta(minutes=5), "delay": 0}
+    delayed = {"actual_time": now + timedelta(minutes=2), "delay": 3}
+    cancelled = {"actual_time": now + timedelta(minutes=3), "cancelled": True}
+
+    # Lead before the first running departure (delayed one leaves in 2 min,
+    # so its lead is already past) loses to the delayed train's arrival.
+    assert next_aligned_refresh([delayed, on_time], now) == delayed["actual_time"]
+    assert next_aligned_refresh([cancelled, on_time], now) == (
+        on_time["actual_time"] - timedelta(minutes=2)
+    )
+    # Nothing far enough ahead: no aligned refresh.
+    soon = {"actual_time": now + timedelta(seconds=10), "delay": 1}
+    assert next_aligned_refresh([soon], now) is None
+    assert next_aligned_refresh([], now) is None
+
+
+@pytest.mark.asyncio
+async def test_coordinator_schedules_aligned_refresh_once_started(hass, mock_session):
+    """After start a fresh board arms one aligned refresh and relaxes the cadence."""
+    coord = _make_coordinator(
+        hass,
+        mock_session,
+        {CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"},
+    )
+    now = dt_util.utcnow()
+    departure = {"line": "2", "actual_time": now + timedelta(minutes=6), "delay": 0}
+
+    with patch.object(
+        coord.api_client,
+        "async_get_departures",
+        new=AsyncMock(return_value=[departure]),
+    ):
+        first = await coord._async_update_data()
+        assert coord.aligned_refresh_at is None
+        assert coord.refresh_interval == DEFAULT_SCAN_INTERVAL
+
+        stop = coord.async_start()
+        second = await coord._async_update_data()
+        assert second["version"] == first["version"] + 1
+        assert coord.aligned_refresh_at == departure["actual_time"] - timedelta(minutes=2)
+        assert coord.refresh_interval == RELAXED_SCAN_INTERVAL
+        assert not coord.refresh_due(dt_util.utcnow() + timedelta(seconds=30))
+        assert coord.refresh_due(dt_util.utcnow() + RELAXED_SCAN_INTERVAL)
+
+        stop()
+    assert coord.aligned_refresh_at is None
+    assert coord.refresh_interval == DEFAULT_SCAN_INTERVAL
+
+
 @pytest.mark.asyncio
 async def test_coordinator_unknown_operator_raises(hass, mock_session):
     with pytest.raises(ValueError, match="Unknown operator"):
         _make_coordinator(hass, mock_session, {CONF_OPERATOR: "invalid"})
+
+
+@pytest.mark.asyncio
+async def test_refresh_records_stage_timings(hass, mock_session):
+    """Each refresh times the whole run, the departures fetch and the diff."""
+    coord = _make_coordinator(
+        hass, mock_session, {CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"}
+    )
+    with patch.object(
+        coord.api_client, "async_get_departures", new=AsyncMock(return_value=[{}])
+    ):
+        await coord._async_update_data()
+
+    assert {"refresh", "departures", "diff"} <= set(coord.stats.stages)
+    assert coord.stats.stages["refresh"].count == 1
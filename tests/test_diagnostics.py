@@ -0,0 +1,146 @@
+"""Tests for config entry diagnostics."""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ret_ns_departures.const import (
+    CONF_NS_API_KEY,
+    CONF_OPERATOR,
+    CONF_STATION_CODE,
+    CONF_STOP_ID,
+    DOMAIN,
+    STOP_TYPE_NS,
+    STOP_TYPE_RET,
+)
+from custom_components.ret_ns_departures.api_disruptions import NSDisruptionsAPIClient
+from custom_components.ret_ns_departures.api_ns import NSAPIClient
+from custom_components.ret_ns_departures.api_ret import RETAPIClient
+from custom_components.ret_ns_departures.api_spoorkaart import NSSpoorkaartClient
+from custom_components.ret_ns_departures.api_virtual_train import NSVirtualTrainClient
+from custom_components.ret_ns_departures.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.ret_ns_departures.stats import StageStats
+
+
+def _coordinator(data, operator=STOP_TYPE_NS):
+    """Mock coordinator with real timing stats and real (idle) API clients."""
+    session = MagicMock()
+    coordinator = MagicMock()
+    coordinator.data = data
+    coordinator.stats = StageStats(f"{operator} test")
+    if operator == STOP_TYPE_NS:
+        coordinator.api_client = NSAPIClient(session, "secret")
+        coordinator.disruptions_client = NSDisruptionsAPIClient(session, "secret")
+        coordinator.spoorkaart_client = NSSpoorkaartClient(session, "secret")
+        coordinator.virtual_train_client = NSVirtualTrainClient(session, "secret")
+    else:
+        coordinator.api_client = RETAPIClient(session)
+        coordinator.disruptions_client = None
+        coordinator.spoorkaart_client = None
+        coordinator.virtual_train_client = None
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_redacts_key_and_reports_parse_cache(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_OPERATOR: STOP_TYPE_NS,
+            CONF_STATION_CODE: "RTD",
+            CONF_NS_API_KEY: "secret",
+        },
+    )
+    entry.runtime_data = _coordinator({"version": 4, "departures": [{}, {}]})
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["entry"]["data"][CONF_NS_API_KEY] == "**REDACTED**"
+    assert result["board"]["version"] == 4
+    assert result["board"]["departures"] == 2
+    assert set(result["time_parse_cache"]) >= {"hits", "misses", "hit_ratio"}
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_reports_stage_timings(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_OPERATOR: STOP_TYPE_NS, CONF_STATION_CODE: "RTD"},
+    )
+    coordinator = _coordinator({"version": 1})
+    coordinator.stats.observe("refresh", 120.0)
+    coordinator.api_client.stats.observe("parse", 3.0)
+    entry.runtime_data = coordinator
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["timings"]["stages"]["refresh"]["count"] == 1
+    assert result["timings"]["slow_sections"] == []
+    assert set(result["upstream"]) == {
+        "departures",
+        "disruptions",
+        "spoorkaart",
+        "virtual_train",
+    }
+    assert result["upstream"]["departures"]["host"] == "gateway.apiportal.ns.nl"
+    assert result["upstream"]["departures"]["stages"]["parse"]["p50"] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_reports_requests_and_caches(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_OPERATOR: STOP_TYPE_NS, CONF_STATION_CODE: "RTD"},
+    )
+    coordinator = _coordinator({"version": 1})
+    stats = coordinator.api_client.stats
+    for status in (200, 200, 429):
+        with stats.request("departures") as call:
+            call.status = status
+    stats.loads("departures")('{"payload": {}}')
+    coordinator.spoorkaart_client.stats.cache_lookup(hit=True)
+    coordinator.spoorkaart_client.stats.cache_lookup(hit=False)
+    coordinator.virtual_train_client.endpoint_state["trein/image/{rit}"] = 404
+    entry.runtime_data = coordinator
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    departures = result["upstream"]["departures"]
+    assert departures["requests"] == 3
+    assert departures["rate_limited"] == 1
+    assert departures["responses"] == {"departures 200": 2, "departures 429": 1}
+    assert departures["payload_bytes"]["departures"]["max"] == 15
+    spoorkaart = result["upstream"]["spoorkaart"]["cache"]
+    assert spoorkaart["size"] == 0
+    assert spoorkaart["hit_ratio"] == 0.5
+    assert result["upstream"]["virtual_train"]["endpoint_state"] == {
+        "trein/image/{rit}": 404
+    }
+    assert "secret" not in repr(result)
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_reports_ret_slugs_and_diversions_cache(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"},
+    )
+    coordinator = _coordinator({"version": 1}, operator=STOP_TYPE_RET)
+    client = coordinator.api_client
+    client._resolved_slugs["beurs"] = "beurs-2"
+    now = time.time()
+    client._diversions_cache = (now - 60, now + 840, [{"id": "a"}])
+    entry.runtime_data = coordinator
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    departures = result["upstream"]["departures"]
+    assert departures["resolved_slugs"] == {"beurs": "beurs-2"}
+    cache = departures["diversions_cache"]
+    assert cache["cached"] is True
+    assert cache["notices"] == 1
+    assert 59 <= cache["age_seconds"] <= 70
+    assert list(result["upstream"]) == ["departures"]
@@ -6,6 +6,7 @@ from custom_components.ret_ns_departures.disruption_info import (
     primary_disruption,
     primary_display_attributes,
 )
+from custom_components.ret_ns_departures.models import Disruption, StoringGeo
 
 
 def test_primary_prefers_calamity_then_high_impact():
@@ -44,6 +45,34 @@ def test_disruption_message_uses_map_level_when_situation_missing():
     assert message == "Leiden - Den Haag. Werkzaamheden. Minder treinen."
 
 
+def test_disruption_message_reads_level_from_records():
+    disruption = Disruption(
+        id="1",
+        type="DISRUPTION",
+        title="Leiden - Den Haag",
+        is_active=True,
+        start=None,
+        end=None,
+        phase="",
+        impact=3,
+        stations=[],
+        cause="Werkzaamheden",
+        situation="",
+        additional_travel_time="",
+        description="",
+        period="",
+        geo=StoringGeo(
+            id="1",
+            station_codes=["LEDN", "GVC"],
+            level="MAJOR",
+            map_type="STORING",
+            geometry_type="LineString",
+            feature_count=1,
+        ),
+    )
+    assert disruption_message(disruption) == "Leiden - Den Haag. Werkzaamheden. Major."
+
+
 def test_disruption_name_includes_extra_count():
     name = disruption_name(
         [
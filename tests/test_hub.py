@@ -0,0 +1,109 @@
+"""Tests for the shared per-operator hub."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ret_ns_departures.const import (
+    CONF_MONITOR_DISRUPTIONS,
+    CONF_NS_API_KEY,
+    CONF_OPERATOR,
+    CONF_STATION_CODE,
+    CONF_STOP_ID,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    STOP_TYPE_NS,
+    STOP_TYPE_RET,
+)
+from custom_components.ret_ns_departures.coordinator import DeparturesCoordinator
+from custom_components.ret_ns_departures.hub import DATA_HUBS, hub_key
+
+pytestmark = pytest.mark.usefixtures("enable_custom_integrations")
+
+
+def _coordinator(hass, config):
+    entry = MockConfigEntry(domain=DOMAIN, data=config)
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.ret_ns_departures.coordinator.async_get_clientsession",
+        return_value=MagicMock(),
+    ):
+        return DeparturesCoordinator(hass, entry)
+
+
+def _ns(code, api_key="secret", **extra):
+    return {
+        CONF_OPERATOR: STOP_TYPE_NS,
+        CONF_STATION_CODE: code,
+        CONF_NS_API_KEY: api_key,
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_entries_with_same_api_key_share_hub_and_clients(hass):
+    rtd = _coordinator(hass, _ns("Rtd", **{CONF_MONITOR_DISRUPTIONS: True}))
+    ut = _coordinator(hass, _ns("Ut", **{CONF_MONITOR_DISRUPTIONS: True}))
+    other = _coordinator(hass, _ns("Asd", api_key="other"))
+
+    assert rtd.hub is ut.hub
+    assert rtd.api_client is ut.api_client
+    assert rtd.spoorkaart_client is ut.spoorkaart_client
+    assert other.hub is not rtd.hub
+    assert other.disruptions_client is None
+    assert "secret" not in hub_key(STOP_TYPE_NS, "secret")
+
+
+@pytest.mark.asyncio
+async def test_hub_tick_refreshes_every_subscriber(hass):
+    beurs = _coordinator(hass, {CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"})
+    blaak = _coordinator(hass, {CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "blaak"})
+    assert beurs.hub is blaak.hub
+    hub = beurs.hub
+
+    unsub_beurs = beurs.async_start()
+    unsub_blaak = blaak.async_start()
+    assert hub.subscribers == [beurs, blaak]
+
+    with (
+        patch.object(beurs, "async_refresh", new=AsyncMock()) as refresh_beurs,
+        patch.object(blaak, "async_refresh", new=AsyncMock()) as refresh_blaak,
+    ):
+        await hub._async_refresh_all(dt_util.utcnow())
+
+    refresh_beurs.assert_awaited_once()
+    refresh_blaak.assert_awaited_once()
+
+    unsub_beurs()
+    assert hass.data[DOMAIN][DATA_HUBS][hub.key] is hub
+    unsub_blaak()
+    assert hub.key not in hass.data[DOMAIN][DATA_HUBS]
+
+
+@pytest.mark.asyncio
+async def test_cadence_counts_from_the_tick_not_the_hub_slot(hass):
+    beurs = _coordinator(hass, {CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"})
+    hub = beurs.hub
+    # The board waited ten seconds for a free slot before it ran
+    tick = dt_util.utcnow() - timedelta(seconds=10)
+
+    with (
+        patch.object(beurs.api_client, "async_get_departures", new=AsyncMock(return_value=[])),
+        patch.object(beurs.api_client, "async_get_service_notice", new=AsyncMock(return_value=None)),
+    ):
+        await hub.async_refresh(beurs, tick)
+
+    assert beurs.refresh_due(tick + DEFAULT_SCAN_INTERVAL)
+
+
+@pytest.mark.asyncio
+async def test_aligned_refresh_takes_a_hub_slot(hass):
+    beurs = _coordinator(hass, {CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"})
+    now = dt_util.utcnow()
+
+    with patch.object(beurs.hub, "async_refresh", new=AsyncMock()) as refresh:
+        await beurs._async_handle_aligned_refresh(now)
+
+    refresh.assert_awaited_once_with(beurs, now)
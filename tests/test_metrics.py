@@ -0,0 +1,70 @@
+"""Tests for the Prometheus text exposition."""
+from unittest.mock import MagicMock
+
+from custom_components.ret_ns_departures.api_ret import RETAPIClient
+from custom_components.ret_ns_departures.metrics import render_metrics
+from custom_components.ret_ns_departures.stats import StageStats
+
+
+def _ret_hub():
+    hub = MagicMock()
+    hub.key = "RET"
+    hub.api_client = RETAPIClient(MagicMock())
+    hub.disruptions_client = None
+    hub.spoorkaart_client = None
+    hub.virtual_train_client = None
+    coordinator = MagicMock()
+    coordinator.operator = "RET"
+    coordinator.location_id = "beurs"
+    coordinator.stats = StageStats("RET beurs")
+    hub.subscribers = [coordinator]
+    return hub
+
+
+def _samples(text):
+    """Exposition lines without HELP/TYPE comments, as name{labels} -> value."""
+    return dict(
+        line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#")
+    )
+
+
+def test_requests_latency_and_cache_are_exported():
+    hub = _ret_hub()
+    stats = hub.api_client.stats
+    with stats.request("halte") as call:
+        call.status = 200
+    stats.latency["halte"].total = 40.0  # pin the timed latency to 40 ms
+    stats.observe_size("halte", 30000)
+    stats.cache_lookup(hit=True)
+
+    text = render_metrics([hub])
+    samples = _samples(text)
+
+    base = 'hub="RET",client="departures",host="www.ret.nl"'
+    assert samples[f'ret_ns_departures_upstream_requests_total{{{base},endpoint="halte",status="200"}}'] == "1"
+    assert samples[f'ret_ns_departures_upstream_latency_seconds_sum{{{base},endpoint="halte"}}'] == "0.04"
+    assert samples[f'ret_ns_departures_upstream_latency_seconds_bucket{{{base},endpoint="halte",le="+Inf"}}'] == "1"
+    assert samples[f'ret_ns_departures_upstream_payload_bytes_bucket{{{base},endpoint="halte",le="65536"}}'] == "1"
+    assert samples[f'ret_ns_departures_upstream_payload_bytes_bucket{{{base},endpoint="halte",le="16384"}}'] == "0"
+    assert samples['ret_ns_departures_cache_lookups_total{hub="RET",cache="omleidingen",result="hit"}'] == "1"
+    assert text.count("# TYPE ret_ns_departures_upstream_requests_total counter") == 1
+
+
+def test_refresh_stages_are_exported_per_board():
+    hub = _ret_hub()
+    hub.subscribers[0].stats.observe("refresh", 250.0)
+
+    samples = _samples(render_metrics([hub]))
+
+    labels = 'hub="RET",board="RET beurs",stage="refresh"'
+    assert samples[f'ret_ns_departures_refresh_stage_seconds_bucket{{{labels},le="0.25"}}'] == "1"
+    assert samples[f'ret_ns_departures_refresh_stage_seconds_bucket{{{labels},le="0.1"}}'] == "0"
+    assert samples[f'ret_ns_departures_refresh_stage_seconds_count{{{labels}}}'] == "1"
+
+
+def test_label_values_are_escaped():
+    hub = _ret_hub()
+    hub.subscribers[0].location_id = 'a"b'
+    hub.subscribers[0].stats.observe("diff", 1.0)
+
+    assert 'board="RET a\\"b"' in render_metrics([hub])
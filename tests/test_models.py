@@ -0,0 +1,158 @@
+"""Tests for the slotted departure and disruption records."""
+from datetime import datetime, timezone
+
+from homeassistant.helpers.json import json_bytes
+import pytest
+
+from custom_components.ret_ns_departures.binary_sensor import format_disruption
+from custom_components.ret_ns_departures.disruption_info import primary_display_attributes
+from custom_components.ret_ns_departures.models import (
+    Departure,
+    DepartureAttributes,
+    Disruption,
+    Record,
+    StoringGeo,
+)
+from custom_components.ret_ns_departures.sensor import format_departure
+
+NOW = datetime(2024, 11, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _departure(**fields):
+    return Departure(
+        line="2",
+        operator="RET",
+        destination="Beverwaard",
+        platform="",
+        delay=0,
+        scheduled_time=NOW,
+        actual_time=NOW,
+        **fields,
+    )
+
+
+def test_departure_behaves_like_the_old_dict():
+    departure = _departure(transport_type="tram", trip_number="")
+
+    assert not hasattr(departure, "__dict__")
+    assert departure["line"] == "2"
+    assert departure.get("transport_type") == "tram"
+    # Unset optional fields are absent, exactly like missing dict keys.
+    assert "train_type" not in departure
+    assert "cancelled" not in departure
+    assert departure.get("cancelled", "missing") == "missing"
+    with pytest.raises(KeyError):
+        departure["train_type"]  # pylint: disable=pointless-statement
+    assert departure == {
+        "line": "2",
+        "operator": "RET",
+        "destination": "Beverwaard",
+        "platform": "",
+        "delay": 0,
+        "scheduled_time": NOW,
+        "actual_time": NOW,
+        "trip_number": "",
+        "transport_type": "tram",
+    }
+
+
+def test_records_accept_known_fields_only():
+    geo = StoringGeo(
+        id="1",
+        station_codes=["RTD"],
+        level="MINDER_TREINEN",
+        map_type="STORING",
+        geometry_type="LineString",
+        feature_count=1,
+    )
+    disruption = Disruption(
+        id="1",
+        type="DISRUPTION",
+        title="Rotterdam - Dordrecht",
+        is_active=True,
+        start=None,
+        end=None,
+        phase="",
+        impact=3,
+        stations=[],
+        cause="",
+        situation="",
+        additional_travel_time="",
+        description="",
+        period="",
+    )
+
+    disruption["geo"] = geo
+    assert disruption["geo"] is geo
+    assert "latitude" not in geo
+    with pytest.raises(KeyError):
+        disruption["colour"] = "red"
+
+
+def test_departure_attributes_view():
+    departure = _departure(train_type="IC", trip_number="2834", cancelled=False)
+
+    view = DepartureAttributes(departure)
+
+    assert view["scheduled_time"] == NOW.isoformat()
+    assert view["train_type"] == "IC"
+    assert view.as_dict() == dict(view)
+    assert "transport_type" not in view
+    assert "cancelled" not in DepartureAttributes(_departure())
+
+
+def _records_in(value):
+    """Records anywhere inside a formatted payload."""
+    if isinstance(value, Record):
+        yield value
+    elif isinstance(value, DepartureAttributes):
+        yield from _records_in(value.as_dict())
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _records_in(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _records_in(item)
+
+
+def test_formatted_records_never_carry_raw_records():
+    geo = StoringGeo(
+        id="1",
+        station_codes=["RTD"],
+        level="MAJOR",
+        map_type="STORING",
+        geometry_type="LineString",
+        feature_count=1,
+        latitude=51.9,
+        longitude=4.5,
+    )
+    disruption = Disruption(
+        id="1",
+        type="DISRUPTION",
+        title="Rotterdam - Dordrecht",
+        is_active=True,
+        start=NOW,
+        end=None,
+        phase="",
+        impact=3,
+        stations=["Rotterdam Centraal"],
+        cause="Seinstoring",
+        situation="",
+        additional_travel_time="",
+        description="",
+        period="",
+        geo=geo,
+    )
+    departure = _departure(train_type="IC")
+    payload = {
+        "departures": [format_departure(departure)],
+        "disruptions": [format_disruption(disruption)],
+        "primary": primary_display_attributes([disruption]),
+    }
+
+    assert not list(_records_in(payload))
+    assert json_bytes(payload)
+    # orjson encodes the dataclass itself and trips over UNSET, so a raw
+    # record must never reach an encoder
+    with pytest.raises(TypeError):
+        json_bytes(departure)
@@ -1,11 +1,13 @@
 """Tests for the departure sensor entities."""
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock
 
 from freezegun import freeze_time
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.ret_ns_departures.board_diff import BoardChanges
 from custom_components.ret_ns_departures.const import (
+    CONF_COMPACT_ATTRIBUTES,
     CONF_OPERATOR,
     DOMAIN,
     STOP_TYPE_NS,
@@ -180,3 +182,80 @@ def test_next_departure_entity_picture_from_virtual_train():
     assert attrs["train_image"] == "https://example.test/train.png"
     assert attrs["rolling_stock"] == "VIRM"
     assert attrs["train_length"] == 6
+
+
+@freeze_time(NOW)
+def test_stale_board_reports_data_age():
+    next_sensor, time_sensor = _make_sensors([_departure(10)])
+    assert next_sensor.extra_state_attributes["stale"] is False
+    assert "data_age" not in next_sensor.extra_state_attributes
+
+    next_sensor.coordinator.data["stale"] = True
+    next_sensor.coordinator.data["last_update"] = NOW - timedelta(seconds=90)
+
+    assert next_sensor.extra_state_attributes["stale"] is True
+    assert next_sensor.extra_state_attributes["data_age"] == 90
+    assert time_sensor.extra_state_attributes["data_age"] == 90
+
+
+def test_unchanged_board_skips_state_write():
+    next_sensor, time_sensor = _make_sensors([_departure(10)])
+    for sensor in (next_sensor, time_sensor):
+        sensor.async_write_ha_state = MagicMock()
+    coordinator = next_sensor.coordinator
+    coordinator.last_update_success = True
+
+    with freeze_time(NOW):
+        coordinator.changes = BoardChanges()
+        next_sensor._handle_coordinator_update()
+        time_sensor._handle_coordinator_update()
+        coordinator.changes = BoardChanges(frozenset())
+        next_sensor._handle_coordinator_update()
+        time_sensor._handle_coordinator_update()
+    assert next_sensor.async_write_ha_state.call_count == 1
+    assert time_sensor.async_write_ha_state.call_count == 1
+
+    # Same board a minute later: only the countdown moves.
+    with freeze_time(NOW + timedelta(minutes=1)):
+        next_sensor._handle_coordinator_update()
+        time_sensor._handle_coordinator_update()
+    assert next_sensor.async_write_ha_state.call_count == 1
+    assert time_sensor.async_write_ha_state.call_count == 2
+
+    # Going unavailable is always written.
+    coordinator.last_update_success = False
+    next_sensor._handle_coordinator_update()
+    assert next_sensor.async_write_ha_state.call_count == 2
+
+
+def test_attributes_rendered_once_per_board_version():
+    next_sensor, _ = _make_sensors([_departure(10), _departure(20)])
+    coordinator = next_sensor.coordinator
+    coordinator.data["version"] = 1
+
+    with freeze_time(NOW):
+        first = next_sensor.extra_state_attributes
+        assert next_sensor.extra_state_attributes == first
+        assert next_sensor._cached_attributes() is next_sensor._cached_attributes()
+        cached = next_sensor._cached_attributes()
+
+        coordinator.data = {"departures": [_departure(20)], "version": 2}
+        assert next_sensor._cached_attributes() is not cached
+        assert len(next_sensor.extra_state_attributes["departures"]) == 1
+
+
+def test_compact_attributes_point_to_board_endpoint():
+    coordinator = MagicMock()
+    coordinator.data = {"departures": [_departure(10)]}
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_OPERATOR: STOP_TYPE_NS},
+        options={CONF_COMPACT_ATTRIBUTES: True},
+    )
+    sensor = NextDepartureSensor(coordinator, entry, "Rotterdam Centraal")
+
+    with freeze_time(NOW):
+        attributes = sensor.extra_state_attributes
+    assert "departures" not in attributes
+    assert attributes["board_url"] == f"/api/ret_ns_departures/board/{entry.entry_id}"
+    assert "departures" in NextDepartureSensor._unrecorded_attributes
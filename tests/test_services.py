@@ -0,0 +1,253 @@
+"""Tests for the integration's services."""
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+import pstats
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ret_ns_departures.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    CONF_OPERATOR,
+    CONF_STOP_ID,
+    DOMAIN,
+    SERVICE_GET_DEPARTURES,
+    SERVICE_PROFILE_REFRESH,
+    SERVICE_REFRESH,
+    STOP_TYPE_RET,
+)
+from custom_components.ret_ns_departures.coordinator import DeparturesCoordinator
+from custom_components.ret_ns_departures.profiling import module_group
+from custom_components.ret_ns_departures.services import (
+    async_setup_services,
+    filter_departures,
+)
+
+
+@pytest.fixture
+def ret_entry(hass):
+    """Loaded-looking RET entry whose departures come from a mock."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"}
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.ret_ns_departures.coordinator.async_get_clientsession",
+        return_value=MagicMock(),
+    ):
+        coordinator = DeparturesCoordinator(hass, entry)
+    coordinator.api_client.async_get_departures = AsyncMock(return_value=[])
+    coordinator.api_client.async_get_service_notice = AsyncMock(return_value=None)
+    entry.runtime_data = coordinator
+    async_setup_services(hass)
+    return entry
+
+
+def _unrelated_work() -> int:
+    """Stands in for whatever else runs on the event loop during a refresh."""
+    return sum(range(1000))
+
+
+@pytest.mark.asyncio
+async def test_profile_refresh_writes_stats_and_groups_by_module(hass, ret_entry):
+    async def _fetch(*_args, **_kwargs):
+        await asyncio.sleep(0)
+        _unrelated_work()
+        return []
+
+    ret_entry.runtime_data.api_client.async_get_departures.side_effect = _fetch
+    result = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        {ATTR_CONFIG_ENTRY_ID: ret_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+
+    path = Path(result["path"])
+    try:
+        assert path.is_file()
+        assert path.parent == Path(hass.config.config_dir)
+        profiled = {name for _, _, name in pstats.Stats(str(path)).stats}
+    finally:
+        path.unlink()
+    assert result["success"] is True
+    assert result["scope"] == "blocking_sections"
+    assert "board_diff" in result["modules"]
+    # Only the board's own blocking sections are profiled, not awaited work
+    assert "diff_boards" in profiled
+    assert "_unrelated_work" not in profiled
+    assert result["total_ms"] <= result["elapsed_ms"]
+    ret_entry.runtime_data.api_client.async_get_departures.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_profile_refresh_rejects_unknown_entry(hass, ret_entry):  # pylint: disable=unused-argument
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE_REFRESH,
+            {ATTR_CONFIG_ENTRY_ID: "missing"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+def test_module_group():
+    assert module_group("/config/custom_components/ret_ns_departures/api_ret.py") == "api_ret"
+    assert module_group("/usr/lib/python3.13/site-packages/bs4/element.py") == "bs4"
+    assert module_group("/usr/lib/python3.13/site-packages/aiohttp/client.py") == "aiohttp"
+    assert module_group("/usr/lib/python3.13/asyncio/events.py") == "asyncio"
+    assert module_group("~") == "builtins"
+
+
+def _departure(now, minutes, line, destination):
+    at = now + timedelta(minutes=minutes)
+    return {
+        "line": line,
+        "operator": "RET",
+        "destination": destination,
+        "platform": "",
+        "delay": 0,
+        "scheduled_time": at,
+        "actual_time": at,
+    }
+
+
+def test_filter_departures():
+    now = dt_util.utcnow()
+    departures = [
+        _departure(now, -1, "Tram 8", "Spangen"),
+        _departure(now, 2, "Tram 8", "Spangen"),
+        _departure(now, 4, "Tram 21", "De Esch"),
+        _departure(now, 9, "Tram 8", "Kleiweg"),
+        _departure(now, 30, "Tram 8", "Spangen"),
+    ]
+
+    assert [d["destination"] for d in filter_departures(departures, now, lines=["8"])] == [
+        "Spangen",
+        "Kleiweg",
+        "Spangen",
+    ]
+    assert len(filter_departures(departures, now, destination="spangen")) == 2
+    assert len(filter_departures(departures, now, within=timedelta(minutes=10))) == 3
+    assert len(filter_departures(departures, now, max_results=1)) == 1
+
+
+async def _get_departures(hass, entry, **data):
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_DEPARTURES,
+        {ATTR_CONFIG_ENTRY_ID: entry.entry_id, **data},
+        blocking=True,
+        return_response=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_departures_serves_the_cached_board(hass, ret_entry):
+    now = dt_util.utcnow()
+    coordinator = ret_entry.runtime_data
+    coordinator.data = {
+        "departures": [_departure(now, 3, "Tram 8", "Spangen"), _departure(now, 5, "Tram 21", "De Esch")],
+        "last_update": now - timedelta(seconds=20),
+    }
+
+    result = await _get_departures(hass, ret_entry, line="21", max_age=60)
+
+    assert [d["destination"] for d in result["departures"]] == ["De Esch"]
+    assert result["departures"][0]["scheduled_time"] == (now + timedelta(minutes=5)).isoformat()
+    assert result["refreshed"] is False
+    assert result["age_seconds"] >= 20
+    coordinator.api_client.async_get_departures.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_departures_refreshes_an_old_board(hass, ret_entry):
+    now = dt_util.utcnow()
+    coordinator = ret_entry.runtime_data
+    coordinator.data = {"departures": [], "last_update": now - timedelta(minutes=5)}
+    coordinator.api_client.async_get_departures.return_value = [
+        _departure(now, 3, "Tram 8", "Spangen")
+    ]
+
+    result = await _get_departures(hass, ret_entry, max_age=60)
+
+    assert result["refreshed"] is True
+    assert len(result["departures"]) == 1
+    coordinator.api_client.async_get_departures.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_departures_honours_a_short_max_age(hass, ret_entry):
+    now = dt_util.utcnow()
+    coordinator = ret_entry.runtime_data
+    coordinator.data = {"departures": [], "last_update": now - timedelta(seconds=10)}
+    # Refreshed ten seconds ago, inside the usual on-demand gap
+    coordinator._last_refresh = now - timedelta(seconds=10)
+
+    result = await _get_departures(hass, ret_entry, max_age=5)
+
+    assert result["refreshed"] is True
+    assert result["age_seconds"] < 5
+    coordinator.api_client.async_get_departures.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_coalesces_concurrent_callers(hass, ret_entry):
+    coordinator = ret_entry.runtime_data
+    release = asyncio.Event()
+
+    async def _slow_departures(*_args, **_kwargs):
+        await release.wait()
+        return []
+
+    coordinator.api_client.async_get_departures.side_effect = _slow_departures
+    calls = [
+        hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_REFRESH,
+                {ATTR_CONFIG_ENTRY_ID: [ret_entry.entry_id, ret_entry.entry_id]},
+                blocking=True,
+                return_response=True,
+            )
+        )
+        for _ in range(3)
+    ]
+    # Let every call reach the upstream request before it answers
+    for _ in range(5):
+        await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    assert all(result == {"refreshed": [ret_entry.entry_id], "skipped": []} for result in results)
+    coordinator.api_client.async_get_departures.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_a_board_refreshed_moments_ago(hass, ret_entry):
+    coordinator = ret_entry.runtime_data
+    await coordinator.async_refresh()
+
+    result = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_REFRESH,
+        {ATTR_CONFIG_ENTRY_ID: ret_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert result == {"refreshed": [], "skipped": [ret_entry.entry_id]}
+    coordinator.api_client.async_get_departures.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_needs_a_target(hass, ret_entry):  # pylint: disable=unused-argument
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
@@ -0,0 +1,85 @@
+"""Tests for refresh stage timing and blocking detection."""
+import asyncio
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ret_ns_departures import stats
+from custom_components.ret_ns_departures.stats import Histogram, StageStats, UpstreamStats
+
+
+def _clock(*readings):
+    """perf_counter stand-in returning the given seconds in order."""
+    return patch.object(stats, "perf_counter", side_effect=list(readings))
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((10, 100))
+    for value in (1, 10, 50, 500):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [(10, 2), (100, 3), (float("inf"), 4)]
+    summary = histogram.summary()
+    assert summary["count"] == 4
+    assert summary["max"] == 500
+    assert summary["last"] == [1, 10, 50, 500]
+
+
+def test_empty_histogram_summary_has_only_count():
+    assert Histogram().summary() == {"count": 0}
+
+
+def test_blocking_section_is_flagged_and_logged(caplog):
+    timings = StageStats("NS RTD")
+    caplog.set_level(logging.DEBUG, logger=stats.__name__)
+
+    with _clock(1.0, 1.040):
+        with timings.measure("diff"):
+            pass
+
+    assert timings.stages["diff"].count == 1
+    assert [section["stage"] for section in timings.slow_sections] == ["diff"]
+    assert timings.slow_sections[0]["ms"] == 40.0
+    assert "NS RTD diff blocked the event loop" in caplog.text
+
+
+def test_awaiting_sections_are_timed_but_not_flagged():
+    timings = StageStats("RET beurs")
+
+    with _clock(1.0, 1.5), timings.measure("refresh", blocking=False):
+        pass
+    with _clock(2.0, 2.001), timings.measure("diff"):
+        pass
+
+    assert timings.stages["refresh"].summary()["p50"] == 500.0
+    assert not timings.slow_sections
+
+
+def test_request_counts_statuses_and_errors():
+    upstream = UpstreamStats("gateway.apiportal.ns.nl")
+
+    for status in (200, 429):
+        with upstream.request("departures") as call:
+            call.status = status
+    with pytest.raises(asyncio.TimeoutError):
+        with upstream.request("departures"):
+            raise asyncio.TimeoutError
+
+    summary = upstream.as_dict()
+    assert summary["requests"] == 3
+    assert summary["rate_limited"] == 1
+    assert summary["responses"] == {
+        "departures 200": 1,
+        "departures 429": 1,
+        "departures error": 1,
+    }
+    assert summary["latency_ms"]["departures"]["count"] == 3
+
+
+def test_loads_records_payload_size_and_decode_time():
+    upstream = UpstreamStats("gateway.apiportal.ns.nl")
+
+    assert upstream.loads("stations")('{"payload": [1, 2]}') == {"payload": [1, 2]}
+    assert upstream.payload_bytes["stations"].summary()["max"] == 19
+    assert upstream.stages["decode"].count == 1
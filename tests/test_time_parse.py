@@ -0,0 +1,52 @@
+"""Tests for the cached NS timestamp parser."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.ret_ns_departures.time_parse import (
+    parse_ns_time,
+    time_parse_cache_info,
+)
+
+AMS = ZoneInfo("Europe/Amsterdam")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-11-16T10:30:00+0100",
+        "2024-07-16T10:30:00+0200",
+        "2024-11-16T09:30:00Z",
+        "2024-11-16T10:30:00+01:00",
+        # Both 02:30s on the autumn DST change
+        "2024-10-27T02:30:00+0200",
+        "2024-10-27T02:30:00+0100",
+    ],
+)
+def test_matches_fromisoformat_astimezone(value):
+    expected = datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(AMS)
+
+    parsed = parse_ns_time(value)
+
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+    assert parsed.tzinfo is AMS or parsed.tzinfo == AMS
+
+
+def test_repeated_strings_hit_the_cache():
+    before = time_parse_cache_info()
+    parse_ns_time("2030-01-01T08:00:00+0100")
+    parse_ns_time("2030-01-01T08:00:00+0100")
+    after = time_parse_cache_info()
+
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert 0 < after["hit_ratio"] <= 1
+
+
+def test_invalid_values_raise_value_error():
+    with pytest.raises(ValueError):
+        parse_ns_time("not a time")
+    with pytest.raises(ValueError):
+        parse_ns_time({"unexpected": "object"})
@@ -0,0 +1,69 @@
+"""Round trips through real aiohttp against the local upstream stand-in."""
+from aiohttp import ClientResponseError, ClientSession
+import pytest
+
+from custom_components.ret_ns_departures import api_disruptions
+from custom_components.ret_ns_departures.api_disruptions import NSDisruptionsAPIClient
+from custom_components.ret_ns_departures.api_ns import NSAPIClient
+from custom_components.ret_ns_departures.api_ret import RETAPIClient
+
+from tests.upstream_server import UpstreamBehaviour, UpstreamServer
+
+
+@pytest.fixture
+async def upstream(socket_enabled):  # pylint: disable=unused-argument
+    """Stand-in server on 127.0.0.1 (needs real sockets)."""
+    async with UpstreamServer() as server:
+        yield server
+
+
+async def test_ret_halt_page_round_trip(upstream):
+    """The RET client streams and parses a replayed halt page."""
+    async with ClientSession() as session:
+        client = RETAPIClient(session)
+        client._base_url = f"{upstream.origin}/home/reizen/halte"
+        departures = await client.async_get_departures("blaak", max_results=5)
+
+    assert len(departures) == 5
+    assert client._last_halt["blaak"].name == "Blaak"
+    assert upstream.statuses[200] == 1
+
+
+async def test_ns_departures_round_trip(upstream):
+    async with ClientSession() as session:
+        client = NSAPIClient(session, "key")
+        client._base_url = f"{upstream.origin}/reisinformatie-api/api/v2"
+        departures = await client.async_get_departures("RTD", max_results=10)
+
+    assert len(departures) == 10
+    assert departures[0]["operator"] == "NS"
+
+
+async def test_rate_limited_upstream_raises_429(upstream):
+    upstream.behaviour = UpstreamBehaviour(rate_limit_every=1)
+    async with ClientSession() as session:
+        client = NSAPIClient(session, "key")
+        client._base_url = f"{upstream.origin}/reisinformatie-api/api/v2"
+        with pytest.raises(ClientResponseError) as err:
+            await client.async_get_departures("RTD")
+
+    assert err.value.status == 429
+    assert upstream.statuses[429] == 1
+
+
+async def test_disruption_drift_shows_in_delta(upstream, monkeypatch):
+    """Drift replaces one disruption per poll, which the client reports."""
+    upstream.behaviour = UpstreamBehaviour(drift=True, seed=3)
+    monkeypatch.setattr(
+        api_disruptions, "NS_DISRUPTIONS_API_BASE_URL", f"{upstream.origin}/disruptions/v3"
+    )
+    async with ClientSession() as session:
+        client = NSDisruptionsAPIClient(session, "key")
+        first = await client.async_get_station_disruptions("RTD")
+        await client.async_get_station_disruptions("RTD")
+
+    delta = client.disruption_delta("RTD")
+    assert len(first) == 15
+    assert "drift-2" in delta.added
+    assert "drift-1" in delta.removed
+    assert not delta.changed
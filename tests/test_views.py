@@ -0,0 +1,153 @@
+"""Tests for the board HTTP endpoint."""
+from datetime import datetime, timezone
+from http import HTTPStatus
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.helpers.http import KEY_HASS
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ret_ns_departures.const import CONF_OPERATOR, DOMAIN, STOP_TYPE_NS
+from custom_components.ret_ns_departures.hub import async_get_hub
+from custom_components.ret_ns_departures.views import (
+    DeparturesBoardView,
+    DeparturesDisplayView,
+    DeparturesMetricsView,
+)
+
+NOW = datetime(2024, 11, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _coordinator(version):
+    coordinator = MagicMock()
+    coordinator.operator = STOP_TYPE_NS
+    coordinator.location_id = "RTD"
+    coordinator.data = {
+        "version": version,
+        "last_update": NOW,
+        "departures": [
+            {"line": "IC", "destination": "Utrecht", "actual_time": NOW, "scheduled_time": NOW}
+        ],
+        "disruptions": [
+            {"id": "1", "title": "Werkzaamheden", "geo": {"latitude": 52.0, "longitude": 4.4}}
+        ],
+    }
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_board_view_serves_cached_board(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_OPERATOR: STOP_TYPE_NS})
+    entry.add_to_hass(hass)
+    entry.runtime_data = _coordinator(version=3)
+    request = MagicMock()
+    request.app = {KEY_HASS: hass}
+    view = DeparturesBoardView()
+
+    response = await view.get(request, entry.entry_id)
+
+    assert response.status == HTTPStatus.OK
+    payload = json.loads(response.body)
+    assert payload["version"] == 3
+    assert payload["departures"][0]["destination"] == "Utrecht"
+    assert payload["geojson"]["features"][0]["geometry"]["coordinates"] == [4.4, 52.0]
+    # Same version: same bytes object, no re-serialization.
+    assert view.render(entry.entry_id, entry.runtime_data) is response.body
+
+    missing = await view.get(request, "nope")
+    assert missing.status == HTTPStatus.NOT_FOUND
+
+
+def _display_request(hass, query=None, headers=None):
+    request = MagicMock()
+    request.app = {KEY_HASS: hass}
+    request.query = query or {}
+    request.headers = headers or {}
+    return request
+
+
+@pytest.mark.asyncio
+async def test_display_view_revalidates_with_etag(hass):
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_OPERATOR: STOP_TYPE_NS})
+    entry.add_to_hass(hass)
+    entry.runtime_data = _coordinator(version=3)
+    view = DeparturesDisplayView()
+
+    response = await view.get(_display_request(hass), entry.entry_id)
+
+    assert response.status == HTTPStatus.OK
+    payload = json.loads(response.body)
+    assert payload["disruptions"] == 1
+    assert payload["departures"] == [
+        {
+            "time": "13:00",
+            "line": "IC",
+            "destination": "Utrecht",
+            "platform": "",
+            "delay": 0,
+            "cancelled": False,
+        }
+    ]
+    assert response.headers["Last-Modified"] == "Sat, 16 Nov 2024 12:00:00 GMT"
+    etag = response.headers["ETag"]
+
+    unchanged = await view.get(
+        _display_request(hass, headers={"If-None-Match": etag}), entry.entry_id
+    )
+    assert unchanged.status == HTTPStatus.NOT_MODIFIED
+    assert unchanged.body is None
+
+    # A new board version with the same content keeps the ETag
+    entry.runtime_data.data["version"] = 4
+    again = await view.get(_display_request(hass, headers={"If-None-Match": etag}), entry.entry_id)
+    assert again.status == HTTPStatus.NOT_MODIFIED
+
+    entry.runtime_data.data["departures"][0]["delay"] = 3
+    entry.runtime_data.data["version"] = 5
+    changed = await view.get(_display_request(hass, headers={"If-None-Match": etag}), entry.entry_id)
+    assert changed.status == HTTPStatus.OK
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_display_view_text_and_field_selection(hass):
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_OPERATOR: STOP_TYPE_NS})
+    entry.add_to_hass(hass)
+    entry.runtime_data = _coordinator(version=3)
+    entry.runtime_data.data["departures"][0]["delay"] = 2
+    view = DeparturesDisplayView()
+
+    response = await view.get(
+        _display_request(hass, {"format": "text", "fields": "time,destination,delay"}),
+        entry.entry_id,
+    )
+
+    assert response.status == HTTPStatus.OK
+    assert response.content_type == "text/plain"
+    assert response.body.decode() == "13:00 Utrecht +2\n"
+
+    for query in ({"fields": "time,color"}, {"limit": "0"}, {"format": "xml"}):
+        bad = await view.get(_display_request(hass, query), entry.entry_id)
+        assert bad.status == HTTPStatus.BAD_REQUEST
+    missing = await view.get(_display_request(hass), "nope")
+    assert missing.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_metrics_view_exports_hub_counters(hass):
+    hub = async_get_hub(hass, STOP_TYPE_NS, "secret", MagicMock())
+    with hub.api_client.stats.request("departures") as call:
+        call.status = 429
+    request = MagicMock()
+    request.app = {KEY_HASS: hass}
+
+    response = await DeparturesMetricsView().get(request)
+
+    assert response.status == HTTPStatus.OK
+    assert response.content_type == "text/plain"
+    body = response.body.decode()
+    assert 'endpoint="departures",status="429"} 1' in body
+    assert "secret" not in body
@@ -0,0 +1,171 @@
+"""Tests for the board subscription websocket command."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ret_ns_departures.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    CONF_OPERATOR,
+    CONF_STOP_ID,
+    DOMAIN,
+    STOP_TYPE_RET,
+    WS_SUBSCRIBE_BOARD,
+)
+from custom_components.ret_ns_departures.api_ret import RETAPIClient
+from custom_components.ret_ns_departures.coordinator import DeparturesCoordinator
+from custom_components.ret_ns_departures.websocket_api import (
+    DATA_BOARD_SUBSCRIPTIONS,
+    async_setup_websocket,
+)
+
+pytestmark = pytest.mark.usefixtures("enable_custom_integrations")
+
+
+def _departure(now, minutes, line, destination, delay=0):
+    at = now + timedelta(minutes=minutes)
+    return {
+        "line": line,
+        "operator": "RET",
+        "destination": destination,
+        "platform": "",
+        "delay": delay,
+        "scheduled_time": at,
+        "actual_time": at + timedelta(minutes=delay),
+    }
+
+
+@pytest.fixture
+def ret_entry(hass):
+    """Loaded-looking RET entry whose departures come from a mock."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"}
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.ret_ns_departures.coordinator.async_get_clientsession",
+        return_value=MagicMock(),
+    ):
+        coordinator = DeparturesCoordinator(hass, entry)
+    coordinator.api_client.async_get_departures = AsyncMock(return_value=[])
+    coordinator.api_client.async_get_service_notice = AsyncMock(return_value=None)
+    entry.runtime_data = coordinator
+    async_setup_websocket(hass)
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_subscribe_board_sends_snapshot_then_deltas(hass, hass_ws_client, ret_entry):
+    now = dt_util.utcnow().replace(second=0, microsecond=0)
+    coordinator = ret_entry.runtime_data
+    tram_8 = _departure(now, 3, "Tram 8", "Spangen")
+    tram_21 = _departure(now, 5, "Tram 21", "De Esch")
+    coordinator.api_client.async_get_departures.return_value = [tram_8]
+    await coordinator.async_refresh()
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": WS_SUBSCRIBE_BOARD, ATTR_CONFIG_ENTRY_ID: ret_entry.entry_id}
+    )
+    result = await client.receive_json()
+    assert result["success"] is True
+    snapshot = (await client.receive_json())["event"]
+    assert snapshot["type"] == "snapshot"
+    assert [dep["destination"] for dep in snapshot["departures"]] == ["Spangen"]
+    tram_8_id = snapshot["departures"][0]["id"]
+
+    # A new departure: only that one is sent, plus the order
+    coordinator.api_client.async_get_departures.return_value = [tram_8, tram_21]
+    await coordinator.async_refresh()
+    delta = (await client.receive_json())["event"]
+    assert delta["type"] == "delta"
+    assert delta["version"] == snapshot["version"] + 1
+    assert delta["slices"] == ["departures"]
+    assert [dep["destination"] for dep in delta["departures"]["added"]] == ["De Esch"]
+    assert delta["departures"]["changed"] == []
+    assert delta["departures"]["order"][0] == tram_8_id
+    assert "disruptions" not in delta
+
+    # An unchanged board sends nothing; the next change still arrives as a delta
+    await coordinator.async_refresh()
+    coordinator.api_client.async_get_departures.return_value = [
+        _departure(now, 3, "Tram 8", "Spangen", delay=2),
+    ]
+    await coordinator.async_refresh()
+    delta = (await client.receive_json())["event"]
+    assert delta["type"] == "delta"
+    assert [dep["id"] for dep in delta["departures"]["changed"]] == [tram_8_id]
+    assert len(delta["departures"]["removed"]) == 1
+    assert delta["departures"]["order"] == [tram_8_id]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_board_unknown_entry(hass, hass_ws_client, ret_entry):  # pylint: disable=unused-argument
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": WS_SUBSCRIBE_BOARD, ATTR_CONFIG_ENTRY_ID: "missing"})
+    result = await client.receive_json()
+
+    assert result["success"] is False
+    assert result["error"]["code"] == "not_found"
+
+
+@pytest.mark.asyncio
+async def test_subscribe_board_ends_when_entry_reloads(hass, hass_ws_client):
+    now = dt_util.utcnow().replace(second=0, microsecond=0)
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_OPERATOR: STOP_TYPE_RET, CONF_STOP_ID: "beurs"}
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch.object(
+            RETAPIClient,
+            "async_get_departures",
+            AsyncMock(return_value=[_departure(now, 3, "Tram 8", "Spangen")]),
+        ),
+        patch.object(RETAPIClient, "async_get_service_notice", AsyncMock(return_value=None)),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        client = await hass_ws_client(hass)
+        live = hass.data[DOMAIN][DATA_BOARD_SUBSCRIPTIONS]
+
+        # Unsubscribing forgets the subscription right away
+        await client.send_json_auto_id(
+            {"type": WS_SUBSCRIBE_BOARD, ATTR_CONFIG_ENTRY_ID: entry.entry_id}
+        )
+        first = await client.receive_json()
+        await client.receive_json()
+        await client.send_json_auto_id(
+            {"type": "unsubscribe_events", "subscription": first["id"]}
+        )
+        assert (await client.receive_json())["success"] is True
+        assert not live[entry.entry_id]
+
+        await client.send_json_auto_id(
+            {"type": WS_SUBSCRIBE_BOARD, ATTR_CONFIG_ENTRY_ID: entry.entry_id}
+        )
+        subscription = await client.receive_json()
+        assert (await client.receive_json())["event"]["type"] == "snapshot"
+
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        ended = await client.receive_json()
+        assert ended["id"] == subscription["id"]
+        assert ended["success"] is False
+        assert ended["error"]["code"] == "not_found"
+
+        # The reloaded board can be subscribed to again
+        await client.send_json_auto_id(
+            {"type": WS_SUBSCRIBE_BOARD, ATTR_CONFIG_ENTRY_ID: entry.entry_id}
+        )
+        assert (await client.receive_json())["success"] is True
+        snapshot = (await client.receive_json())["event"]
+        assert [dep["destination"] for dep in snapshot["departures"]] == ["Spangen"]
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    assert entry.entry_id not in live
@@ -0,0 +1,184 @@
+"""
+Local stand-in for ret.nl and the NS API gateway, for load and soak tests.
+
+The server replays the payloads in tests/fixtures/upstream on the same
+paths as the live services, so the real clients can be pointed at it with
+the RET_NS_DEPARTURES_RET_ORIGIN / RET_NS_DEPARTURES_NS_ORIGIN environment
+variables (read by const.py at import) or by setting a client's base URL.
+Departure times are moved to "now" on every request so boards stay
+populated, and latency, errors, 429s and payload drift are configurable.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import cache
+import json
+from pathlib import Path
+import random
+import re
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "upstream"
+_TZ = ZoneInfo("Europe/Amsterdam")
+_RET_TIME_RE = re.compile(r'(<span class="favorite__time__amount">)(\d{2}:\d{2})(<)')
+_NS_TIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+0[12]00")
+
+
+@dataclass
+class UpstreamBehaviour:
+    """How the stand-in misbehaves; change it while the server runs."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_every: int = 0
+    drift: bool = False
+    seed: int = 0
+
+
+@cache
+def fixture(name: str) -> str:
+    """Text of one synthesized upstream payload."""
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+class UpstreamServer:
+    """Replay server for RET halt pages, omleidingen and NS JSON endpoints."""
+
+    def __init__(self, behaviour: UpstreamBehaviour | None = None) -> None:
+        """Set up the routes; call start() to listen on 127.0.0.1."""
+        self.behaviour = behaviour or UpstreamBehaviour()
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self._random = random.Random(self.behaviour.seed)
+        self._server: TestServer | None = None
+
+        app = web.Application(middlewares=[self._misbehave])
+        app.router.add_get("/home/reizen/halte/{slug}.html", self._ret_halt)
+        app.router.add_get("/home/reizen/omleidingen-verstoringen.html", self._ret_omleidingen)
+        app.router.add_get("/reisinformatie-api/api/v2/departures", self._ns_departures)
+        app.router.add_get("/disruptions/v3", self._ns_disruptions)
+        app.router.add_get("/reisinformatie-api/api/v3/disruptions", self._ns_disruptions)
+        app.router.add_get("/Spoorkaart-API/api/v1/storingen/{storing_id}", self._storing_geo)
+        app.router.add_get("/nsapp-stations/v2", self._ns_stations)
+        app.router.add_get("/nsapp-stations/v2/nearest", self._ns_stations)
+        self.app = app
+
+    @property
+    def origin(self) -> str:
+        """Base URL to use for both RET and NS origins."""
+        assert self._server is not None, "server not started"
+        return str(self._server.make_url("")).rstrip("/")
+
+    @property
+    def total_requests(self) -> int:
+        """Requests served so far, across all paths."""
+        return sum(self.requests.values())
+
+    async def start(self) -> None:
+        """Listen on a free local port."""
+        self._server = TestServer(self.app, host="127.0.0.1")
+        await self._server.start_server()
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            await self._server.close()
+
+    async def __aenter__(self) -> UpstreamServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @web.middleware
+    async def _misbehave(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Apply latency, 429s and errors before the replayed response."""
+        behaviour = self.behaviour
+        route = request.match_info.route.resource
+        self.requests[route.canonical if route else request.path] += 1
+        delay = behaviour.latency + self._random.uniform(0, behaviour.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if behaviour.rate_limit_every and self.total_requests % behaviour.rate_limit_every == 0:
+            response: web.StreamResponse = web.json_response(
+                {"message": "Rate limit is exceeded"},
+                status=429,
+                headers={"Retry-After": "1"},
+            )
+        elif behaviour.error_rate and self._random.random() < behaviour.error_rate:
+            response = web.Response(status=503, text="Service Unavailable")
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as err:
+                # Unknown paths (e.g. the Virtual Train API) answer 404
+                self.statuses[err.status] += 1
+                raise
+        self.statuses[response.status] += 1
+        return response
+
+    def _drift(self) -> int:
+        """Minutes to nudge times by when drift is on."""
+        return self._random.randint(0, 3) if self.behaviour.drift else 0
+
+    async def _ret_halt(self, request: web.Request) -> web.Response:
+        slug = request.match_info["slug"]
+        now = datetime.now(_TZ)
+        counter = iter(range(1000))
+
+        def shift(match: re.Match[str]) -> str:
+            at = now + timedelta(minutes=2 + 3 * next(counter) + self._drift())
+            return f"{match.group(1)}{at:%H:%M}{match.group(3)}"
+
+        title = slug.replace("-", " ").title()
+        html = _RET_TIME_RE.sub(shift, fixture("ret_halt_schiekade.html")).replace(
+            '<h1 class="text--white">Schiekade</h1>', f'<h1 class="text--white">{title}</h1>'
+        )
+        return web.Response(text=html, content_type="text/html")
+
+    async def _ret_omleidingen(self, _request: web.Request) -> web.Response:
+        html = fixture("ret_omleidingen.html")
+        if self.behaviour.drift and self._random.random() < 0.5:
+            # An edited article, as when RET updates a notice during the day
+            html = html.replace("Houd rekening met extra reistijd.", "Reis met extra tijd.", 1)
+        return web.Response(text=html, content_type="text/html")
+
+    async def _ns_departures(self, _request: web.Request) -> web.Response:
+        now = datetime.now(_TZ).replace(second=0, microsecond=0)
+        departures = fixture("ns_departures_rtd.json")
+        first = _NS_TIME_RE.search(departures)
+        assert first is not None
+        offset = now - datetime.strptime(first.group(0), "%Y-%m-%dT%H:%M:%S%z")
+        drift = timedelta(minutes=self._drift())
+
+        def shift(match: re.Match[str]) -> str:
+            at = datetime.strptime(match.group(0), "%Y-%m-%dT%H:%M:%S%z") + offset + drift
+            return at.astimezone(_TZ).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+        return web.Response(
+            text=_NS_TIME_RE.sub(shift, departures), content_type="application/json"
+        )
+
+    async def _ns_disruptions(self, _request: web.Request) -> web.Response:
+        items = original = json.loads(fixture("ns_disruptions.json"))
+        if self.behaviour.drift:
+            # One disruption resolved, one new one reported
+            dropped = self._random.randrange(len(items))
+            items = [item for index, item in enumerate(items) if index != dropped]
+            items.append({**original[dropped], "id": f"drift-{self.total_requests}"})
+        return web.json_response(items)
+
+    async def _storing_geo(self, _request: web.Request) -> web.Response:
+        return web.Response(text=fixture("spoorkaart_storing.json"), content_type="application/json")
+
+    async def _ns_stations(self, _request: web.Request) -> web.Response:
+        return web.Response(text=fixture("ns_stations_nearest.json"), content_type="application/json")